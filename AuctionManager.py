@@ -1,9 +1,30 @@
+import heapq
 import os
+import pickle
 
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from Bids import Bids
+from Bids import Bids, SealedAuction
+from Events import BID_PLACED, BID_REMOVED, BID_SEALED, EXPIRED, LISTED, OUTBID, SETTLED, UNDONE, UNLISTED, EventLog
+from Ledger import EXTERNAL, Ledger
+from RenderCache import RenderCache
+from Valuation import Valuation
 
+PROXY_INCREMENT = 100_000  # how much a proxy bid outbids the next best ceiling by
+LISTING_TYPES = ("Regular", "Free Loan", "Dev Loan", "Paid Loan")
+MAX_BULK_ITEMS = 25  # per bulk list/bid call, keeps the summary inside one discord message
+PLAYER_STATE_COLUMNS = ("is_listed", "starting_bid", "Type", "past_bidders")  # owned by the auction, not the data files
+TEAM_LEDGER_COLUMNS = ("budget", "wage")  # owned by the ledger once the auction runs
+WHATIF_MAX_ITEMS = 10  # bids + sales in one what-if, every one of the 2**n combinations is checked
+# per club, counting open bids as if they were won. None switches a limit off, any listing
+# type can get its own cap
+ROSTER_LIMITS = {"squad": 35, "loans": 8, "Dev Loan": 4}
+EXPIRY_BATCH = 500  # bids finalized per expire_due call, keeps one maintenance pass short
+# open ascending bids, or sealed offers opened at the deadline where the winner pays his own
+# offer (first) or the next best one (second), set per listing type with set_auction_mode
+AUCTION_MODES = ("open", "first", "second")
+WATCH_LIMIT = 25  # /watch subscribers per player, clubs that bid are always told on top of these
 
 
 class AuctionManager:
@@ -11,8 +32,253 @@ class AuctionManager:
         # Load data once here
         self.teams_df = team_df
         self.players_df = players_df
+        # all money moves go through the ledger, teams_df budget/wage only mirror it
+        self.ledger = Ledger.from_teams(team_df)
+        self._team_rows = dict(zip(team_df["club_id"], team_df.index))
+        self._build_identity()
+        # per-club numbers for /info, kept up to date by the list/bid/settle paths
+        listed_counts = players_df.loc[players_df["is_listed"] == True, "club_id"].value_counts()
+        self.team_summary = {}
+        for club_id, club_name in zip(team_df["club_id"], team_df["club_name"]):
+            budget, wage = self.ledger.available(club_id)
+            self.team_summary[club_id] = {"club_id": club_id, "club_name": club_name, "budget": budget,
+                                          "wage": wage, "bids_placed": 0, "bids_received": 0,
+                                          "players_listed": int(listed_counts.get(club_id, 0))}
+        self.roster_limits = dict(ROSTER_LIMITS)
+        self.roster = {}  # club_id -> squad counters, see _build_roster
+        self._build_roster()
         self.bids = []  # store all bids here
+        self.deadlines = []  # heap of (ending timestamp, seq, bid), outbid/removed bids are skipped when popped
+        self._deadline_seq = 0
+        self.proxy_bids = {}  # player_id -> {club_id: {"max": ceiling, "wage": wage}}
+        # player_id -> {club_id: "bid" or "watch"}, who hears about new bids until the auction settles
+        self.watchers = {}
+        self.auction_modes = {}  # listing type -> "first"/"second" if it's auctioned sealed, open otherwise
+        self.sealed = {}  # player_id -> SealedAuction of players listed in a sealed mode
+        self.sealed_held = {}  # club_id -> [budget, wage] its standing sealed offers hold
+        # player_id -> (buyer, seller, type) of settled transfers the data files don't show yet,
+        # the player stays at the seller in players_df so he can't be listed or bought again till then
+        self.sold = {}
+        self.archive_dir = "expired_bids"  # where cleanup_expired writes finished auctions
+        self.version = 0  # bumped on every change, tells savers/caches that something moved
+        self.data_version = 0  # bumped when the player/team data is reloaded
+        self.render = RenderCache(self)  # display text for messages and listing pages
+        self.live_board = None  # (channel_id, message_id) of the league's live board message
+        self.valuation = Valuation()  # suggested fee/wage per player, refit in the background
+        self.events = EventLog()  # change feed for subscribers outside the auction
         print(f"AuctionManager initialized at {datetime.now()}")
+
+    def _touch(self):
+        self.version += 1
+
+    def _build_identity(self):
+        # discord user id -> club they manage (and back), from teams_df.discord_id
+        self.club_of_user = {}
+        self.user_of_club = {}
+        for club_id, discord_id in zip(self.teams_df["club_id"], self.teams_df["discord_id"]):
+            if pd.isna(discord_id):
+                continue
+            self.club_of_user[int(discord_id)] = club_id
+            self.user_of_club[club_id] = int(discord_id)
+
+    def club_for(self, discord_user_id):
+        """The club the discord user manages, None if they don't manage one ~int"""
+        return self.club_of_user.get(int(discord_user_id))
+
+    def save(self, path):
+        """Writes the whole auction state (tables, bids, ledger) to path, atomically."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a state written by save(), open bids keep their deadlines for expire_due ~AuctionManager"""
+        with open(path, "rb") as f:
+            manager = pickle.load(f)
+        if not hasattr(manager, "club_of_user"):  # saved before the identity map existed
+            manager._build_identity()
+        if not hasattr(manager, "roster"):  # saved before the roster index existed
+            manager.roster_limits = dict(ROSTER_LIMITS)
+            manager.roster = {}
+            manager._build_roster()
+            for b in manager.bids:
+                manager._roster(b.bidding_team)["open"][b.player_id] = b
+        if not hasattr(manager, "valuation"):
+            manager.valuation = Valuation()
+        if not hasattr(manager, "events"):
+            manager.events = EventLog()
+        if not hasattr(manager, "watchers"):  # saved when every bid appended to past_bidders
+            manager.watchers = {}
+            for past_bidders in manager.players_df["past_bidders"]:
+                if isinstance(past_bidders, list):
+                    past_bidders[:] = list(dict.fromkeys(past_bidders))
+            for b in manager.bids:
+                manager.watchers.setdefault(b.player_id, {})[b.bidding_team] = "bid"
+        if not hasattr(manager, "sealed"):
+            manager.auction_modes, manager.sealed, manager.sealed_held = {}, {}, {}
+        if not hasattr(manager, "sold"):
+            manager.sold = {}
+        if not hasattr(manager, "deadlines"):  # saved before bids were tracked by deadline
+            manager.deadlines, manager._deadline_seq = [], 0
+            for b in manager.bids:
+                manager._track(b)
+        print(f"AuctionManager loaded from {path} at {datetime.now()}")
+        return manager
+
+    def _track(self, bid):
+        # every bid goes into self.bids through here so the maintenance worker finds its deadline
+        self.bids.append(bid)
+        self._deadline_seq += 1
+        heapq.heappush(self.deadlines, (bid.ending_time.timestamp(), self._deadline_seq, bid))
+
+    def _sync_teams(self, *club_ids):
+        # write the ledger balances back into teams_df for the clubs that just changed
+        self._touch()
+        for club_id in club_ids:
+            row = self._team_rows.get(club_id)
+            if row is None:
+                continue
+            budget, wage = self.ledger.available(club_id)
+            self.teams_df.at[row, "budget"] = budget
+            self.teams_df.at[row, "wage"] = wage
+            self.team_summary[club_id].update(budget=budget, wage=wage)
+
+    def _count(self, club_id, field, delta):
+        summary = self.team_summary.get(club_id)
+        if summary is not None:
+            summary[field] += delta
+
+    def _bid_event(self, kind, bid):
+        return self.events.emit(kind, player_id=bid.player_id, club_id=bid.bidding_team, seller=bid.outgoing_team,
+                                bid=bid.bid, wage=bid.wage, type=bid.typeo, tx_id=bid.tx_id,
+                                ending_time=bid.ending_time)
+
+    def _bid_opened(self, bid):
+        self._count(bid.bidding_team, "bids_placed", 1)
+        self._count(bid.outgoing_team, "bids_received", 1)
+        self._roster(bid.bidding_team)["open"][bid.player_id] = bid
+        self._bid_event(BID_PLACED, bid)
+
+    def _bid_closed(self, bid):
+        self._count(bid.bidding_team, "bids_placed", -1)
+        self._count(bid.outgoing_team, "bids_received", -1)
+        open_bids = self._roster(bid.bidding_team)["open"]
+        if open_bids.get(bid.player_id) is bid:  # a raise by the same club already took the slot over
+            del open_bids[bid.player_id]
+
+    def _build_roster(self):
+        # base: players the data files put at the club. in/out/loans: transfers settled by the
+        # auction since (the files don't know about them yet). open: the club's bids still running
+        base = self.players_df["club_id"].value_counts()
+        for club_id in self.teams_df["club_id"]:
+            self._roster(club_id)["base"] = int(base.get(club_id, 0))
+
+    def _roster(self, club_id):
+        return self.roster.setdefault(club_id, {"base": 0, "in": 0, "out": 0, "loans": {}, "open": {}})
+
+    def _roster_settled(self, bid):
+        self._roster_transfer(bid.bidding_team, bid.outgoing_team, bid.typeo, 1)
+
+    def _roster_transfer(self, buyer_id, seller_id, typeo, step):
+        # step 1 records a settled transfer, -1 takes one back
+        buyer = self._roster(buyer_id)
+        buyer["in"] += step
+        if typeo != "Regular":
+            buyer["loans"][typeo] = buyer["loans"].get(typeo, 0) + step
+        if seller_id is not None:
+            self._roster(seller_id)["out"] += step
+
+    def get_roster(self, club_id):
+        """
+        Squad counters of a club, open bids counted as won.
+
+        :returns roster: squad, loans and one count per loan type ~dict
+        """
+        r = self._roster(club_id)
+        counts = dict(r["loans"])
+        for b in r["open"].values():  # at most a squad's worth of bids
+            if b.typeo != "Regular":
+                counts[b.typeo] = counts.get(b.typeo, 0) + 1
+        return {"squad": r["base"] + r["in"] - r["out"] + len(r["open"]), "loans": sum(counts.values()), **counts}
+
+    def roster_check(self, club_id, typeo, player_ids):
+        """
+        Would bids of this type on player_ids break the club's roster limits? A bid on a
+        player the club already leads for replaces that bid, so it doesn't count twice.
+
+        :returns reason: ~str, None if the bids fit
+        """
+        open_bids = self._roster(club_id)["open"]
+        new = sum(1 for pid in player_ids if pid not in open_bids)
+        if not new:
+            return None
+        roster = self.get_roster(club_id)
+        limits = self.roster_limits
+        if limits.get("squad") is not None and roster["squad"] + new > limits["squad"]:
+            return f"Squad full: {roster['squad']} players incl. open bids (max {limits['squad']})."
+        if typeo != "Regular":
+            if limits.get("loans") is not None and roster["loans"] + new > limits["loans"]:
+                return f"Loan quota reached: {roster['loans']} loans incl. open bids (max {limits['loans']})."
+            if limits.get(typeo) is not None and roster.get(typeo, 0) + new > limits[typeo]:
+                return f"Too many {typeo}s: {roster.get(typeo, 0)} incl. open bids (max {limits[typeo]})."
+        return None
+
+    def _bidder_joined(self, player_id, club_id, past_bidders):
+        # past_bidders says which clubs bid in this auction (once each), the bidder starts watching
+        if club_id not in past_bidders:
+            past_bidders.append(club_id)
+        self.watchers.setdefault(player_id, {})[club_id] = "bid"
+        return self.watchers_to_notify(player_id, club_id)
+
+    def watchers_to_notify(self, player_id, exclude=None):
+        """Clubs to tell about a new bid on the player, one entry per club ~list"""
+        return [club_id for club_id in self.watchers.get(player_id, ()) if club_id != exclude]
+
+    def watch(self, player_id, club_id, stop=False):
+        """
+        Subscribes a club to new bids on a player (or stops it), until the player's auction settles.
+
+        :returns (ok, msg): ~(bool, str)
+        """
+        if player_id not in self.players_df["player_id"].values:
+            return False, f"Player {player_id} not found."
+        if club_id not in self._team_rows:
+            return False, f"Team '{club_id}' not found."
+        watchers = self.watchers.get(player_id, {})
+        if stop:
+            if watchers.get(club_id) != "watch":
+                return False, f"You're not watching player {player_id}."
+            del watchers[club_id]
+            return True, f"Stopped watching player {player_id}."
+        if club_id in watchers:
+            return True, f"You already hear about every bid on player {player_id}."
+        if sum(1 for kind in watchers.values() if kind == "watch") >= WATCH_LIMIT:
+            return False, f"Player {player_id} already has {WATCH_LIMIT} watchers."
+        self.watchers.setdefault(player_id, {})[club_id] = "watch"
+        return True, f"Watching player {player_id}, you'll get a DM for every new bid until the auction ends."
+
+    def _release(self, player_id):
+        # the auction is over: nobody is told about this player anymore and he can be listed again
+        self.watchers.pop(player_id, None)
+        self.players_df.loc[self.players_df["player_id"] == player_id, "past_bidders"].item().clear()
+
+    def _set_listed(self, player_id, listed):
+        # flips is_listed and keeps the owning club's listed count right
+        self._touch()
+        mask = self.players_df["player_id"] == player_id
+        row = self.players_df.loc[mask].iloc[0]
+        if bool(row["is_listed"] == True) != listed:
+            self._count(row["club_id"], "players_listed", 1 if listed else -1)
+        self.players_df.loc[mask, "is_listed"] = listed
+
+    def _biddable(self, player):
+        # listed, a rotw player, or in an auction already (the first bid takes the listing down)
+        return (player["is_listed"] == True or (player["club_name"] == "rotw" and player["player_id"] not in self.sold)
+                or any(b.player_id == player["player_id"] and b.is_active() for b in self.bids))
+
     def can_bid_be_placed(self,player_id, bid_amount, bidding_team, wage):
 
         #check if player can be bided on
@@ -20,21 +286,24 @@ class AuctionManager:
         if player_row.empty:
             return False, f"Player {player_id} not found."
         player = player_row.iloc[0]
-        if not (player["is_listed"] or player["club_name"] == "rotw"):
-            for b in self.bids:
-                if b.player_id == player_id:
-                    if not b.is_active:
-                        return False, f"Player {player_id} not listed."
+        if not self._biddable(player):
+            return False, f"Player {player_id} not listed."
         if player["Type"] != "Regular":
             return False,f"Wrong Type,Ban Pc!"
         #check team funds and wage
-        team_row = self.teams_df.loc[self.teams_df["club_id"] == bidding_team]
-        team = team_row.iloc[0]
-        if team["budget"]< bid_amount:
+        if not self.ledger.has_account(bidding_team):
+            return False, f"Team '{bidding_team}' not found."
+        if player["club_id"] == bidding_team:
+            return False, f"Player {player_id} is already in your team."
+        reason = self.roster_check(bidding_team, "Regular", [player_id])
+        if reason:
+            return False, reason
+        budget, wage_left = self.ledger.available(bidding_team)
+        if budget < bid_amount:
             return False, f"Player {player_id} not enough budget."
-        if team["wage"] < wage:
+        if wage_left < wage:
             return False, f"Player {player_id} not enough wage."
-        if bid_amount < int(player["starting_bid"]):
+        if pd.notna(player["starting_bid"]) and bid_amount < int(player["starting_bid"]):
             return False, f"Player {player_id} not enough starting bid."
         return True, None
 
@@ -43,29 +312,26 @@ class AuctionManager:
         if player_id not in self.players_df["player_id"].values:
             print(f"Player ID {player_id} not found.")
             return None, f"Player {player_id} not found.",None
-        if bidding_team not in self.teams_df["club_id"].values:
+        if bidding_team not in self._team_rows:
             print(f"Team '{bidding_team}' not found.")
             return None, f"Team '{bidding_team}' not found.",None
         is_valid,message = self.can_bid_be_placed(player_id, bid_amount, bidding_team, wage)
         if is_valid == False:
             return None, message,None
 
+        if player_id in self.sealed:
+            return None, self._seal(player_id, bid_amount, wage, bidding_team)[1], None
+
         new_bid = Bids(player_id, bid_amount, wage ,bidding_team,
                        teams_df=self.teams_df, players_df=self.players_df,typeo="Regular")
 
-        self.bids.append(new_bid)
-        current_team = self.players_df.loc[ self.players_df["player_id"] == player_id, 'club_name'].iloc[0]
-        #print(self.teams_df.loc[self.teams_df["club_id"]==241])
-        self.teams_df.loc[self.teams_df["club_id"]==bidding_team, 'budget'] -= bid_amount
-        self.teams_df.loc[self.teams_df["club_id"] == bidding_team, 'wage'] -= wage
-        #print(self.teams_df.loc[self.teams_df["club_id"] == 241])
-
-
-        selling_team_mask = self.teams_df["club_name"] == current_team
-        print(self.teams_df.loc[selling_team_mask, 'budget'])
-        self.teams_df.loc[selling_team_mask, 'budget'] += bid_amount
-        print(self.teams_df.loc[selling_team_mask, 'budget'])
-        self.teams_df.loc[selling_team_mask, 'wage'] += self.players_df.loc[ self.players_df["player_id"] == player_id, 'wage'].iloc[0]
+        self._track(new_bid)
+        # the fee goes to the selling club, refunds later reverse exactly this transaction
+        new_bid.tx_id = self.ledger.post_bid(bidding_team, new_bid.outgoing_team, bid_amount, wage,
+                                             self.players_df.loc[self.players_df["player_id"] == player_id, 'wage'].iloc[0],
+                                             memo=f"{new_bid.typeo} bid on {player_id}")
+        self._sync_teams(bidding_team, new_bid.outgoing_team)
+        self._bid_opened(new_bid)
         self.players_df.loc[self.players_df["player_id"] == player_id, "starting_bid"] = bid_amount
         print(f" Created bid for player {player_id} by {bidding_team}.")
         past_bidders_list = self.players_df.loc[self.players_df["player_id"] == player_id, 'past_bidders'].item()
@@ -74,37 +340,376 @@ class AuctionManager:
             for b in self.bids:
                 if b.player_id == player_id and b.time_remaining == 0:
                     return None, f"Player {player_id} too late (ban pc).",None
-            self.remove_bid(player_id,"Regular")
+            self.remove_bid(player_id,"Regular",keep=new_bid)
         #else:
            # self.teams_df.loc[selling_team_mask, 'wage'] += self.players_df.loc[self.players_df["player_id"] == player_id, 'wage']
-        self.players_df.loc[self.players_df["player_id"] == player_id]["past_bidders"].item().append(bidding_team)
-        self.players_df.loc[self.players_df["player_id"] == player_id, "is_listed"] = False
-        return new_bid, f'Created bid for {self.players_df.loc[self.players_df["player_id"] == player_id, "name"].item()} by {self.teams_df.loc[self.teams_df["club_id"] == bidding_team, "club_name"].item()}.',past_bidders_list
+        notify = self._bidder_joined(player_id, bidding_team, past_bidders_list)
+        self._set_listed(player_id, False)
+        return new_bid, self.render.bid_message(player_id, bidding_team),notify
+
+    def get_leading_bid(self, player_id):
+        """Returns the active bid currently winning the auction for player_id (or None)."""
+        for b in reversed(self.bids):
+            if b.player_id == player_id and b.is_active():
+                return b
+        return None
+
+    def place_proxy_bid(self, player_id, max_amount, wage, bidding_team, increment=PROXY_INCREMENT):
+        """
+        Registers a proxy (max) bid: the engine bids for the team, only as much as needed to
+        stay on top, up to max_amount. Competing proxies are settled in a single create_bid.
+
+        :returns (bid, msg, notify): the leading bid after resolution (None if the proxy
+        isn't leading), a message and the clubs to tell (see resolve_proxy_bids)
+        """
+        if player_id not in self.players_df["player_id"].values:
+            return None, f"Player {player_id} not found.", []
+        if bidding_team not in self._team_rows:
+            return None, f"Team '{bidding_team}' not found.", []
+        if player_id in self.sealed:
+            return None, f"Player {player_id} is a sealed auction, there's nothing to outbid. Use /bid.", []
+        player = self.players_df.loc[self.players_df["player_id"] == player_id].iloc[0]
+        leader = self.get_leading_bid(player_id)
+        if leader is None:  # no price (unlisted, or a rotw player nobody priced) = no floor, can_bid_be_placed decides
+            floor = int(player["starting_bid"]) if pd.notna(player["starting_bid"]) else 0
+        else:
+            floor = leader.bid + increment
+        if leader is not None and leader.bidding_team == bidding_team:
+            floor = leader.bid
+        is_valid, message = self.can_bid_be_placed(player_id, min(max_amount, floor), bidding_team, wage)
+        if not is_valid:
+            return None, message, []
+        if max_amount < floor:
+            return None, f"Player {player_id} max bid is below the current price ({floor:,}).", []
+
+        self.proxy_bids.setdefault(player_id, {})[bidding_team] = {"max": max_amount, "wage": wage}
+        self._touch()
+        bid, msg, notify = self.resolve_proxy_bids(player_id, increment)
+        leader = self.get_leading_bid(player_id)
+        if leader is not None and leader.bidding_team == bidding_team:
+            return leader, f"Proxy bid registered for player {player_id} (max {max_amount:,}), leading at {leader.bid:,}.", notify
+        return None, f"Proxy bid for player {player_id} was outbid straight away. {msg}", notify
+
+    def cancel_proxy_bid(self, player_id, bidding_team):
+        proxies = self.proxy_bids.get(player_id, {})
+        if proxies.pop(bidding_team, None) is None:
+            return False, f"No proxy bid on player {player_id} for team {bidding_team}."
+        self._touch()
+        if not proxies:
+            self.proxy_bids.pop(player_id, None)
+        return True, f"Proxy bid on player {player_id} cancelled (the current bid stays)."
+
+    def resolve_proxy_bids(self, player_id, increment=PROXY_INCREMENT):
+        """
+        Settles all proxies on player_id against the standing bid in one step: the highest
+        ceiling wins at the second-highest ceiling plus increment (never above its own ceiling).
+        Proxies that can no longer compete are dropped.
+
+        :returns (bid, msg, notify): the new bid if the price/leader changed, else None, and the
+        clubs to tell: the teams that lost the lead and the player's watchers, once each
+        """
+        proxies = self.proxy_bids.get(player_id)
+        if not proxies:
+            return None, "No proxy bids to resolve.", []
+        leader = self.get_leading_bid(player_id)
+
+        # (ceiling, is_leader, team, wage) - the standing bid counts with its own amount
+        # unless its team also has a proxy behind it
+        contenders = []
+        for team, proxy in proxies.items():
+            is_leader = leader is not None and leader.bidding_team == team
+            ceiling = min(proxy["max"], self.ledger.available(team)[0])
+            contenders.append((max(ceiling, leader.bid) if is_leader else ceiling, is_leader, team, proxy["wage"]))
+        if leader is not None and leader.bidding_team not in proxies:
+            contenders.append((leader.bid, True, leader.bidding_team, leader.wage))
+        # highest ceiling first, the standing leader keeps ties
+        contenders.sort(key=lambda c: (c[0], c[1]), reverse=True)
+        top_ceiling, top_is_leader, top_team, top_wage = contenders[0]
+
+        if leader is None:
+            starting_bid = self.players_df.loc[self.players_df["player_id"] == player_id, "starting_bid"].iloc[0]
+            price = int(starting_bid) if pd.notna(starting_bid) else 0
+        else:
+            price = leader.bid if top_is_leader else leader.bid + increment
+        if len(contenders) > 1:
+            price = max(price, contenders[1][0] + increment)
+        price = min(price, top_ceiling)
+
+        outbid_teams = []
+        for ceiling, is_leader, team, _ in contenders[1:]:
+            if ceiling < price + increment:
+                proxies.pop(team, None)
+                outbid_teams.append(team)
+        if top_team in proxies and proxies[top_team]["max"] <= price:
+            del proxies[top_team]  # ceiling reached, from here on it is a plain bid
+        if not proxies:
+            self.proxy_bids.pop(player_id, None)
+
+        if leader is not None and (price <= leader.bid if top_is_leader else price < leader.bid + increment):
+            return None, f"Player {player_id} standing bid holds at {leader.bid:,}.", outbid_teams
+
+        bid, msg, watchers = self.create_bid(player_id, price, top_wage, top_team)
+        if bid is None:
+            # the winning proxy can't actually pay - drop it and let the rest compete
+            print(f"Proxy for team {top_team} on player {player_id} failed: {msg}")
+            if top_team in self.proxy_bids.get(player_id, {}):
+                del self.proxy_bids[player_id][top_team]
+                bid, msg, notify = self.resolve_proxy_bids(player_id, increment)
+                leader = self.get_leading_bid(player_id)
+                return bid, msg, list(dict.fromkeys(t for t in outbid_teams + notify
+                                                    if leader is None or t != leader.bidding_team))
+            return None, msg, []
+        return bid, msg, list(dict.fromkeys(t for t in outbid_teams + watchers if t != top_team))
+
+    def set_auction_mode(self, typeo, mode):
+        """
+        How new listings of a type are auctioned: "open" ascending bids, or sealed offers opened
+        at the deadline with the winner paying his own offer ("first") or the next best ("second").
+        Players already listed keep the mode they were listed with.
+
+        :returns (ok, msg): ~(bool, str)
+        """
+        if typeo not in LISTING_TYPES:
+            return False, f"Unknown type '{typeo}', pick one of {', '.join(LISTING_TYPES)}."
+        if mode not in AUCTION_MODES:
+            return False, f"Unknown mode '{mode}', pick one of {', '.join(AUCTION_MODES)}."
+        if mode == "open":
+            self.auction_modes.pop(typeo, None)
+            self._touch()
+            return True, f"New {typeo} listings are open auctions."
+        self.auction_modes[typeo] = mode
+        self._touch()
+        return True, f"New {typeo} listings are sealed auctions, the winner pays the {mode} price."
+
+    def _hold(self, club_id, budget, wage):
+        held = self.sealed_held.setdefault(club_id, [0, 0])
+        held[0] += budget
+        held[1] += wage
+        if held == [0, 0]:
+            del self.sealed_held[club_id]
+
+    def _drop_sealed(self, player_id):
+        # the auction is gone (resolved or unlisted), its offers don't hold any money anymore
+        auction = self.sealed.pop(player_id, None)
+        if auction is not None:
+            for club_id, offer in auction.offers.items():
+                self._hold(club_id, -offer["bid"], -offer["wage"])
+        return auction
+
+    def _seal(self, player_id, bid_amount, wage, bidding_team):
+        # a sealed offer moves no money, it only holds it against the club's other sealed offers
+        auction = self.sealed[player_id]
+        if auction.is_over():
+            return False, f"Player {player_id} too late, the offers are being opened."
+        previous = auction.offers.get(bidding_team, {"bid": 0, "wage": 0})
+        held_budget, held_wage = self.sealed_held.get(bidding_team, (0, 0))
+        held_budget, held_wage = held_budget - previous["bid"], held_wage - previous["wage"]
+        budget, wage_left = self.ledger.available(bidding_team)
+        if budget - held_budget < bid_amount:
+            return False, f"Player {player_id} not enough budget ({held_budget:,} is held by your other sealed bids)."
+        if wage_left - held_wage < wage:
+            return False, f"Player {player_id} not enough wage ({held_wage:,} is held by your other sealed bids)."
+        self._hold(bidding_team, bid_amount - previous["bid"], wage - previous["wage"])
+        auction.offers[bidding_team] = {"bid": bid_amount, "wage": wage, "time": datetime.now()}
+        if auction.ending_time is None:
+            auction.start()
+            self._deadline_seq += 1
+            heapq.heappush(self.deadlines, (auction.ending_time.timestamp(), self._deadline_seq, auction))
+        self._touch()
+        self.events.emit(BID_SEALED, player_id=player_id, club_id=bidding_team, type=auction.typeo,
+                         ending_time=auction.ending_time)
+        return True, (f"Sealed bid for {self.render.player_name(player_id)} by {self.render.club_name(bidding_team)}, "
+                      f"the offers are opened at {auction.ending_time:%H:%M:%S} ({auction.rule} price).")
+
+    def _resolve_sealed(self, auctions):
+        """
+        Opens the offers of sealed auctions that are over, all in one batch. The best offer whose
+        club can still pay and fit the player wins at its auction's price, with a single ledger
+        posting; losing offers never moved any money, so there is nothing to refund.
+
+        :returns records: archive rows of the won auctions ~list of dicts
+        """
+        won = []
+        for auction in auctions:
+            if self.sealed.get(auction.player_id) is not auction:
+                continue  # unlisted (or already resolved) meanwhile
+            self._drop_sealed(auction.player_id)
+            player_id = auction.player_id
+            mask = self.players_df["player_id"] == player_id
+            ranked = auction.ranked()
+            for i, (club_id, offer) in enumerate(ranked):
+                price = auction.price(ranked, i)
+                budget, wage_left = self.ledger.available(club_id)
+                if (price > budget or offer["wage"] > wage_left
+                        or self.roster_check(club_id, auction.typeo, [player_id])):
+                    continue  # spent the money (or the squad place) elsewhere since, next best offer
+                bid = Bids(player_id, price, offer["wage"], club_id,
+                           teams_df=self.teams_df, players_df=self.players_df, typeo=auction.typeo)
+                bid.starting_time, bid.ending_time = auction.starting_time, auction.ending_time
+                seller_wage = self.players_df.loc[mask, "wage"].iloc[0] if auction.typeo == "Regular" else offer["wage"]
+                bid.tx_id = self.ledger.post_bid(club_id, bid.outgoing_team, price, offer["wage"], seller_wage,
+                                                 memo=f"sealed {auction.typeo} bid on {player_id}")
+                self._bid_opened(bid)
+                won.append(bid)
+                break
+            else:
+                # nobody left who can pay, the player stays at his club
+                self.players_df.loc[mask, "starting_bid"] = None
+                self.events.emit(UNLISTED, player_id=player_id, club_id=self.players_df.loc[mask, "club_id"].iloc[0],
+                                 reason="no sealed offer could be paid")
+            self._set_listed(player_id, False)
+        return self._finalize(won) if won else []
+
     def get_active_bids(self):
         return [b for b in self.bids if b.is_active()]
 
-    def remove_bid(self,player_id,type):
-        for b in self.bids:
-            if b.player_id == player_id:
+    def remove_bid(self,player_id,type,keep=None):
+        if keep is None:
+            # an admin took the auction down, nobody is bidding on the player anymore
+            self.proxy_bids.pop(player_id, None)
+            self._release(player_id)
+            if player_id in self.sealed:
+                # the offers go and stop holding money, the player stays listed as a new sealed auction
+                auction = self._drop_sealed(player_id)
+                self.sealed[player_id] = SealedAuction(player_id, auction.typeo, auction.rule, auction.starting_bid)
+                self._touch()
+        for b in list(self.bids):
+            if b.player_id == player_id and b is not keep:
                 self.bids.remove(b)
                 b.deactivate_bid()
                 print(b.outgoing_team)
-                self.teams_df.loc[self.teams_df["club_id"] == b.bidding_team, "budget"] += b.bid
-                self.teams_df.loc[self.teams_df["club_id"] == b.outgoing_team, "budget"] -= b.bid if type == "Regular" or type == "Regular Loan" else 0
-                self.teams_df.loc[self.teams_df["club_id"] == b.bidding_team, "wage"] += b.wage
-                self.teams_df.loc[self.teams_df["club_id"] == b.outgoing_team, "wage"] -= self.players_df.loc[self.players_df["player_id"] == player_id, 'wage'].iloc[0]
+                # refund exactly what the bid was charged, whatever its type
+                self.ledger.reverse(b.tx_id, memo=f"{type} bid on {player_id} removed")
+                self._sync_teams(b.bidding_team, b.outgoing_team)
+                self._bid_closed(b)
+                self._bid_event(BID_REMOVED if keep is None else OUTBID, b)
 
 
 
 
-    def cleanup_expired(self): #also can be used to get the expired bids
-        expired_bids = [b for b in self.bids if not b.is_active()]
-        self.bids = [b for b in self.bids if b.is_active()]
+    def undo(self, event_id):
+        """
+        Takes back one event by its id: a running bid, an admin's bid removal or a settlement.
+        Only that player and the clubs involved are touched, and what depended on the event is
+        replayed: undoing a running bid brings back the bid it outbid (or lists the player
+        again), undoing a removal reopens the removed bid.
 
-        if not expired_bids:
-            print("No expired bids to clean up.")
-            return
-        df = pd.DataFrame([{
+        :returns (ok, msg): ~(bool, str)
+        """
+        event = self.events.get(event_id)
+        if event is None:
+            return False, f"Event {event_id} not found (or too old to undo)."
+        state = self.ledger.transactions.get(event.data.get("tx_id"), {}).get("state")
+        if event.kind == BID_PLACED and state == "open":
+            return self._undo_open_bid(event)
+        if event.kind in (BID_PLACED, EXPIRED, SETTLED) and state == "settled":
+            return self._undo_settlement(event)
+        if event.kind == BID_REMOVED and state == "reversed":
+            return self._undo_removal(event)
+        if event.kind in (BID_PLACED, BID_REMOVED, EXPIRED, SETTLED):
+            return False, f"Event {event_id} ({event.kind}) was already refunded or undone, nothing to undo."
+        return False, f"Event {event_id} is {event.kind}, only bids, bid removals and settlements can be undone."
+
+    def _undo_open_bid(self, event):
+        player_id = event.player_id
+        bid = next((b for b in self.bids if b.tx_id == event.data["tx_id"]), None)
+        if bid is None:
+            return False, f"Bid of event {event.id} isn't running anymore."
+        self.bids.remove(bid)
+        bid.deactivate_bid()
+        self.ledger.reverse(bid.tx_id, memo=f"undo of event {event.id}")
+        self._sync_teams(bid.bidding_team, bid.outgoing_team)
+        self._bid_closed(bid)
+        past_bidders = self.players_df.loc[self.players_df["player_id"] == player_id, "past_bidders"].item()
+        if bid.bidding_team in past_bidders:
+            past_bidders.remove(bid.bidding_team)
+        self.events.emit(UNDONE, player_id=player_id, club_id=bid.bidding_team, undoes=event.id, tx_id=bid.tx_id)
+
+        # replay: the bids this one outbid, newest first, until one can still be placed
+        for outbid in reversed([e for e in self.events.for_player(player_id, after=event.id) if e.kind == OUTBID]):
+            restored = self._restore_bid(outbid)
+            if restored is not None:
+                return True, (f"Bid on player {player_id} undone, {self.render.club_name(restored.bidding_team)} "
+                              f"leads again at {restored.bid:,}.")
+        listing = next((e for e in reversed(self.events.for_player(player_id)) if e.kind == LISTED), None)
+        mask = self.players_df["player_id"] == player_id
+        if listing is not None:
+            self.players_df.loc[mask, "starting_bid"] = listing.data["starting_bid"]
+        self._set_listed(player_id, True)
+        self.events.emit(LISTED, player_id=player_id, club_id=bid.outgoing_team,
+                         starting_bid=self.players_df.loc[mask, "starting_bid"].iloc[0],
+                         type=self.players_df.loc[mask, "Type"].iloc[0])
+        return True, f"Bid on player {player_id} undone, the player is listed again."
+
+    def _restore_bid(self, event):
+        # places a refunded bid again exactly as it was (money, wage, deadline), None if the club can't anymore
+        club_id, tx_id = event.club_id, event.data["tx_id"]
+        charged = {"budget": 0, "wage": 0}
+        for i in self.ledger.transactions[tx_id]["postings"]:
+            _, src, _, field, amount = self.ledger.postings[i]
+            if src == club_id:
+                charged[field] += amount
+        budget, wage_left = self.ledger.available(club_id)
+        if charged["budget"] > budget or charged["wage"] > wage_left:
+            return None
+        if self.roster_check(club_id, event.data["type"], [event.player_id]):
+            return None
+        bid = Bids(event.player_id, event.data["bid"], event.data["wage"], club_id,
+                   teams_df=self.teams_df, players_df=self.players_df, typeo=event.data["type"])
+        bid.ending_time = event.data["ending_time"]
+        bid.tx_id = self.ledger.repost(tx_id, memo=f"{bid.typeo} bid on {bid.player_id} restored by undo")
+        self._track(bid)
+        self._sync_teams(club_id, bid.outgoing_team)
+        self._bid_opened(bid)
+        self.players_df.loc[self.players_df["player_id"] == bid.player_id, "starting_bid"] = bid.bid
+        self._bidder_joined(bid.player_id, club_id,
+                            self.players_df.loc[self.players_df["player_id"] == bid.player_id, "past_bidders"].item())
+        return bid
+
+    def _undo_settlement(self, event):
+        player_id, tx_id = event.player_id, event.data["tx_id"]
+        settled = next(e for e in self.events.for_player(player_id, after=event.id - 1)
+                       if e.kind == SETTLED and e.data["tx_id"] == tx_id)
+        newer = [e.id for e in self.events.for_player(player_id, after=settled.id)]
+        if newer:
+            return False, f"Player {player_id} has newer events ({', '.join(map(str, newer))}), undo those first."
+        self.ledger.reverse(tx_id, memo=f"undo of event {event.id}", settled=True)
+        self._sync_teams(settled.club_id, settled.data["seller"])
+        self._roster_transfer(settled.club_id, settled.data["seller"], settled.data["type"], -1)
+        self.sold.pop(player_id, None)
+        self.events.emit(UNDONE, player_id=player_id, club_id=settled.club_id, undoes=event.id, tx_id=tx_id)
+        return True, (f"Transfer of player {player_id} to {self.render.club_name(settled.club_id)} undone, "
+                      f"{settled.data['bid']:,} refunded.")
+
+    def _undo_removal(self, event):
+        player_id = event.player_id
+        if self.get_leading_bid(player_id) is not None or any(
+                e.kind == BID_PLACED for e in self.events.for_player(player_id, after=event.id)):
+            return False, f"Player {player_id} got new bids since, undo those first."
+        restored = self._restore_bid(event)
+        if restored is None:
+            return False, f"{self.render.club_name(event.club_id)} can't afford the bid (or fit the player) anymore."
+        self._set_listed(player_id, False)
+        self.events.emit(UNDONE, player_id=player_id, club_id=event.club_id, undoes=event.id,
+                         tx_id=event.data["tx_id"])
+        return True, f"Removal undone, {self.render.club_name(event.club_id)}'s bid on player {player_id} is back."
+
+    def _finalize(self, expired_bids):
+        # settles bids that are over: the reserved money becomes committed
+        for b in expired_bids:
+            b.active = False
+            self.ledger.settle(b.tx_id)
+            self._sync_teams(b.bidding_team, b.outgoing_team)
+            self._bid_closed(b)
+            self._roster_settled(b)
+            self.sold[b.player_id] = (b.bidding_team, b.outgoing_team, b.typeo)
+            self._bid_event(EXPIRED, b)
+            self._bid_event(SETTLED, b)
+            if self.get_leading_bid(b.player_id) is None:
+                self.proxy_bids.pop(b.player_id, None)
+                self._release(b.player_id)
+        now = datetime.now()
+        return [{
             "player_id": b.player_id,
             "bidding_team": b.bidding_team,
             "outgoing_team": b.outgoing_team,
@@ -112,53 +717,354 @@ class AuctionManager:
             "wage": b.wage,
             "start_time": b.starting_time,
             "end_time": b.ending_time,
-            "expired_at": datetime.now(),
+            "expired_at": now,
             "type":b.typeo
-        } for b in expired_bids])
+        } for b in expired_bids]
+
+    def archive(self, records):
+        """
+        Writes finished auctions to a new CSV in archive_dir. Only touches the records and the
+        file system, so it can run in a worker thread.
+
+        :param records: rows returned by expire_due/_finalize ~list of dicts
+        :returns filename: ~str (None if there was nothing to write)
+        """
+        if not records:
+            return None
+        os.makedirs(self.archive_dir, exist_ok=True)
+        filename = os.path.join(self.archive_dir, f"expired_bids_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.csv")
+        pd.DataFrame(records).to_csv(filename, index=False)
+        return filename
+
+    def expire_due(self, now=None, limit=EXPIRY_BATCH):
+        """
+        Finalizes up to `limit` bids whose ending time has passed, oldest first, without
+        looking at the bids that are still running. Used by the maintenance worker.
 
-        os.makedirs("expired_bids", exist_ok=True)
-        filename = f"expired_bids/expired_bids_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        df.to_csv(filename, index=False)
+        :returns records: archive rows of the finalized bids (pass them to archive()) ~list of dicts
+        """
+        now = (now or datetime.now()).timestamp()
+        due, sealed = set(), []
+        while self.deadlines and self.deadlines[0][0] <= now and len(due) + len(sealed) < limit:
+            item = heapq.heappop(self.deadlines)[2]
+            if isinstance(item, SealedAuction):
+                sealed.append(item)
+            else:
+                due.add(id(item))
+        if not due and not sealed:
+            return []
+        records = self._resolve_sealed(sealed)
+        # one pass splits the list, bids that were outbid/removed meanwhile are simply not found
+        expired_bids = [b for b in self.bids if id(b) in due]
+        self.bids = [b for b in self.bids if id(b) not in due]
+        return records + self._finalize(expired_bids)
 
-        print(f" Saved {len(expired_bids)} expired bids to '{filename}' and cleaned up memory.")
+    def expiry_backlog(self, now=None):
+        """How many tracked deadlines have passed without being finalized yet ~int"""
+        now = (now or datetime.now()).timestamp()
+        return sum(1 for deadline, _, _ in self.deadlines if deadline <= now)
+
+    def cleanup_expired(self): #also can be used to get the expired bids
+        # full pass, also catches bids deactivated by hand before their deadline
+        records = self._resolve_sealed([a for a in list(self.sealed.values()) if a.is_over()])
+        active, expired_bids = [], []
+        for b in self.bids:
+            (active if b.is_active() else expired_bids).append(b)
+        self.bids = active
+        if not expired_bids and not records:
+            print("No expired bids to clean up.")
+            return
+        records += self._finalize(expired_bids)
+        filename = self.archive(records)
+        print(f" Saved {len(records)} expired bids to '{filename}' and cleaned up memory.")
+
+    def settle_all(self):
+        """
+        End of season: finalizes every open bid whether its deadline passed or not.
+
+        :returns records: archive rows of the finalized bids (pass them to archive()) ~list of dicts
+        """
+        open_bids, self.bids = self.bids, []
+        self.deadlines, self._deadline_seq = [], 0
+        records = self._resolve_sealed([a for a in list(self.sealed.values()) if a.offers])
+        records += self._finalize(open_bids)
+        self._touch()
+        return records
 
     def list_player(self,player_id,team_id,bid,typeo):
         if player_id not in self.players_df["player_id"].values:
             return False, f"Player {player_id} not found."
-        if team_id not in self.teams_df["club_id"].values:
+        if team_id not in self._team_rows:
             return False, f"Team '{team_id}' not found."
         past_bidders_list = self.players_df.loc[self.players_df["player_id"] == player_id, 'past_bidders'].item()
-        if past_bidders_list:
+        if past_bidders_list or (player_id in self.sealed and self.sealed[player_id].offers):
             return False, f"Player {player_id} already getting bid on (ban pc)."
+        if player_id in self.sold:
+            return False, f"Player {player_id} was sold, he can be listed again once the data files show his new club."
         player_row = self.players_df.loc[self.players_df["player_id"] == player_id]
         player = player_row.iloc[0]
         if player["club_id"] != team_id:
             return False, f"Player {player_id} is not in your team."
-        self.players_df.loc[self.players_df["player_id"] == player_id,'is_listed'] = True
-        self.players_df.loc[self.players_df["player_id"] == player_id, 'starting_bid'] = bid
-        if typeo != "Regular" and typeo != "Free Loan" and typeo != "Dev Loan" and typeo != "Paid Loan":
+        if typeo not in LISTING_TYPES:
             return False, "unrecognized type (ban pc)"
-        else:
-            self.players_df.loc[self.players_df["player_id"] == player_id, 'Type'] = typeo
+        if bid < 0:
+            return False, f"Player {player_id} starting bid can't be negative."
+        self._set_listed(player_id, True)
+        self.players_df.loc[self.players_df["player_id"] == player_id, 'starting_bid'] = bid
+        self.players_df.loc[self.players_df["player_id"] == player_id, 'Type'] = typeo
+        self._listed(player_id, team_id, bid, typeo)
         return True, f"Player {player_id} is now listed."
 
 
     def unlist_player(self,player_id,team_id):
         if player_id not in self.players_df["player_id"].values:
             return False, f"Player {player_id} not found."
-        if team_id not in self.teams_df["club_id"].values:
+        if team_id not in self._team_rows:
             return False, f"Team '{team_id}' not found."
         player_row = self.players_df.loc[self.players_df["player_id"] == player_id]
         player = player_row.iloc[0]
         if player["club_id"] != team_id:
             return False, f"Player {player_id} is not in your team."
-        self.players_df.loc[self.players_df["player_id"] == player_id,'is_listed'] = False
+        if player["past_bidders"] or (player_id in self.sealed and self.sealed[player_id].offers):
+            return False, f"Player {player_id} already getting bid on (ban pc)."
+        self._set_listed(player_id, False)
         self.players_df.loc[self.players_df["player_id"] == player_id, 'starting_bid'] = None
+        self.watchers.pop(player_id, None)
+        self._drop_sealed(player_id)
+        self.events.emit(UNLISTED, player_id=player_id, club_id=team_id)
         return True, f"Player {player_id} is now unlisted."
 
+    def _listed(self, player_id, club_id, starting_bid, typeo):
+        # a type auctioned sealed collects offers from here on instead of taking open bids
+        mode = self.auction_modes.get(typeo)
+        self._drop_sealed(player_id)
+        if mode is not None:
+            self.sealed[player_id] = SealedAuction(player_id, typeo, mode, starting_bid)
+        self.events.emit(LISTED, player_id=player_id, club_id=club_id, starting_bid=starting_bid, type=typeo,
+                         mode=mode or "open")
+
     def get_listed_players(self):
         return self.players_df.loc[self.players_df["is_listed"] == True]
 
+    def _bulk_results(self, req, reasons):
+        return [{"player_id": int(pid), "ok": reason is None, "message": reason or "ok"}
+                for pid, reason in zip(req["player_id"], reasons)]
+
+    def list_players_bulk(self, items, all_or_nothing=True):
+        """
+        Lists many players at once. All items are checked against players_df/teams_df in one
+        vectorized pass, then applied with a single write.
+
+        :param items: (player_id, team_id, starting_bid, typeo) tuples ~list
+        :param all_or_nothing: if any item fails nothing is listed ~bool
+        :returns (ok, results): results is one {"player_id", "ok", "message"} dict per item
+        """
+        if len(items) > MAX_BULK_ITEMS:
+            return False, [{"player_id": None, "ok": False, "message": f"Too many players (max {MAX_BULK_ITEMS})."}]
+        req = pd.DataFrame(items, columns=["player_id", "team_id", "starting_bid", "typeo"])
+        players = self.players_df.set_index("player_id")
+        found = req["player_id"].isin(players.index)
+        owner = req["player_id"].map(players["club_id"])
+        being_bid_on = req["player_id"].map(players["past_bidders"]).map(lambda pb: bool(pb) if isinstance(pb, list) else False)
+        being_bid_on |= req["player_id"].isin([pid for pid, a in self.sealed.items() if a.offers])
+
+        # first failing check wins, same order as list_player
+        checks = [
+            (~found, "Player {} not found."),
+            (~req["team_id"].isin(list(self._team_rows)), "Team not found."),
+            (req["player_id"].duplicated(), "Player {} appears twice."),
+            (being_bid_on, "Player {} already getting bid on (ban pc)."),
+            (req["player_id"].isin(list(self.sold)), "Player {} was sold, he can be listed again once the data files show his new club."),
+            (owner != req["team_id"], "Player {} is not in your team."),
+            (~req["typeo"].isin(LISTING_TYPES), "unrecognized type (ban pc)"),
+            (req["starting_bid"] < 0, "Player {} starting bid can't be negative."),
+        ]
+        reasons = [None] * len(req)
+        for mask, template in checks:
+            for i in mask[mask].index:
+                if reasons[i] is None:
+                    reasons[i] = template.format(req.at[i, "player_id"])
+        results = self._bulk_results(req, reasons)
+        failed = any(r is not None for r in reasons)
+        if failed and all_or_nothing:
+            for r in results:
+                if r["ok"]:
+                    r.update(ok=False, message="not applied, another item failed")
+            return False, results
+
+        ok = req[[r is None for r in reasons]]
+        mask = self.players_df["player_id"].isin(ok["player_id"])
+        by_id = ok.set_index("player_id")
+        self._touch()
+        newly_listed = self.players_df.loc[mask & (self.players_df["is_listed"] != True), "club_id"].value_counts()
+        for club_id, n in newly_listed.items():
+            self._count(club_id, "players_listed", int(n))
+        self.players_df.loc[mask, "is_listed"] = True
+        self.players_df.loc[mask, "starting_bid"] = self.players_df.loc[mask, "player_id"].map(by_id["starting_bid"])
+        self.players_df.loc[mask, "Type"] = self.players_df.loc[mask, "player_id"].map(by_id["typeo"])
+        for r in results:
+            if r["ok"]:
+                r["message"] = f"Player {r['player_id']} is now listed."
+        for row in ok.itertuples(index=False):
+            self._listed(int(row.player_id), row.team_id, row.starting_bid, row.typeo)
+        return not failed, results
+
+    def create_bids_bulk(self, bidding_team, items):
+        """
+        Places a package of regular bids for one team. Every item and the package totals
+        (budget and wage) are validated up front in one vectorized pass, so either every bid
+        is placed or none is. A bid that still fails when it is placed takes back the ones
+        placed before it.
+
+        :param bidding_team: the ID of the team placing the bids ~int
+        :param items: (player_id, bid_amount, wage) tuples ~list
+        :returns (ok, results): results is one {"player_id", "ok", "message", "watchers"} dict
+            per item, watchers are the clubs to tell about that bid
+        """
+        if len(items) > MAX_BULK_ITEMS:
+            return False, [{"player_id": None, "ok": False, "message": f"Too many bids (max {MAX_BULK_ITEMS})."}]
+        req = pd.DataFrame(items, columns=["player_id", "bid_amount", "wage"])
+        if not self.ledger.has_account(bidding_team):
+            return False, self._bulk_results(req, [f"Team '{bidding_team}' not found."] * len(req))
+        budget, wage_left = self.ledger.available(bidding_team)
+        reasons = self._bid_item_reasons(bidding_team, req)
+        # the package as a whole has to fit, not just every bid on its own
+        if all(r is None for r in reasons):
+            squad_reason = self.roster_check(bidding_team, "Regular", req["player_id"].tolist())
+            if squad_reason:
+                reasons = [squad_reason] * len(req)
+            elif req["bid_amount"].sum() > budget:
+                reasons = [f"Package total {int(req['bid_amount'].sum()):,} is over your budget."] * len(req)
+            elif req["wage"].sum() > wage_left:
+                reasons = [f"Package wages {int(req['wage'].sum()):,} are over your wage budget."] * len(req)
+        results = self._bulk_results(req, reasons)
+        if any(r is not None for r in reasons):
+            for r in results:
+                if r["ok"]:
+                    r.update(ok=False, message="not placed, another bid in the package failed")
+            return False, results
+
+        first_event = self.events.next_id
+        for r, row in zip(results, req.itertuples(index=False)):
+            bid, msg, watchers = self.create_bid(int(row.player_id), int(row.bid_amount), int(row.wage), bidding_team)
+            r.update(ok=bid is not None, message=msg, watchers=watchers or [])
+            if bid is None:
+                self._take_back_bids(first_event, bidding_team)
+                for other in results:
+                    if other is not r:
+                        other.update(ok=False, message="not placed, another bid in the package failed")
+                    other["watchers"] = []
+                return False, results
+        return True, results
+
+    def _take_back_bids(self, first_event, club_id):
+        # undoes the club's bids placed since first_event, newest first, like /undo would
+        placed = [e for e in self.events.since(first_event - 1, kinds=(BID_PLACED,)) if e.club_id == club_id]
+        for event in reversed(placed):
+            if self.ledger.transactions.get(event.data["tx_id"], {}).get("state") == "open":
+                self._undo_open_bid(event)
+
+    def _bid_item_reasons(self, bidding_team, req):
+        # can_bid_be_placed's player rules for a frame of (player_id, bid_amount) rows at once,
+        # one reason per row (None = fine), the money is checked by the caller
+        players = self.players_df.set_index("player_id")
+        found = req["player_id"].isin(players.index)
+        active_players = {b.player_id for b in self.bids if b.is_active()}
+        biddable = (req["player_id"].map(players["is_listed"]).fillna(False).astype(bool)
+                    | ((req["player_id"].map(players["club_name"]) == "rotw") & ~req["player_id"].isin(list(self.sold)))
+                    | req["player_id"].isin(active_players))
+        starting_bid = pd.to_numeric(req["player_id"].map(players["starting_bid"]), errors="coerce")
+
+        checks = [
+            (~found, "Player {} not found."),
+            (req["player_id"].duplicated(), "Player {} appears twice."),
+            (~biddable, "Player {} not listed."),
+            (req["player_id"].map(players["Type"]) != "Regular", "Wrong Type,Ban Pc!"),
+            (req["player_id"].isin(list(self.sealed)), "Player {} is a sealed auction, bid on it with /bid."),
+            (req["player_id"].map(players["club_id"]) == bidding_team, "Player {} is already in your team."),
+            (starting_bid.notna() & (req["bid_amount"] < starting_bid), "Player {} not enough starting bid."),
+        ]
+        reasons = [None] * len(req)
+        for mask, template in checks:
+            for i in mask[mask].index:
+                if reasons[i] is None:
+                    reasons[i] = template.format(req.at[i, "player_id"])
+        return reasons
+
+    def what_if(self, club_id, bids=(), sales=()):
+        """
+        Projects a club's budget and wage headroom for a basket of hypothetical bids and sales,
+        for every combination of them at once (one row per subset, numpy arithmetic against
+        the ledger's available money). Nothing is placed or reserved.
+
+        Bids follow can_bid_be_placed's rules, the roster limits included: each bid on its own
+        and every basket's bids together have to fit the squad. A sale frees the player's wage
+        and brings in the fee (the listing's starting bid if no fee is given), but not his squad
+        slot, that only frees up once the sale is settled.
+
+        :param club_id: the club asking ~int
+        :param bids: (player_id, bid_amount, wage) tuples ~list
+        :param sales: (player_id, fee) tuples, fee may be None ~list
+        :returns (ok, report): report has "budget"/"wage" (now), "items" (one dict per bid/sale
+                 with its checks and deltas), "all" (projection with every valid item),
+                 "feasible" (count of feasible combinations) and "best" (the largest feasible
+                 baskets, as lists of item indexes, most bid money first) ~bool, dict
+        """
+        if len(bids) + len(sales) > WHATIF_MAX_ITEMS:
+            return False, f"Too many items (max {WHATIF_MAX_ITEMS} bids and sales together)."
+        if not self.ledger.has_account(club_id):
+            return False, f"Team '{club_id}' not found."
+        budget, wage_left = self.ledger.available(club_id)
+        players = self.players_df.set_index("player_id")
+
+        items = []
+        bid_req = pd.DataFrame(list(bids), columns=["player_id", "bid_amount", "wage"])
+        for row, reason in zip(bid_req.itertuples(index=False), self._bid_item_reasons(club_id, bid_req)):
+            reason = reason or self.roster_check(club_id, "Regular", [int(row.player_id)])
+            items.append({"kind": "bid", "player_id": int(row.player_id), "ok": reason is None, "message": reason,
+                          "budget": -int(row.bid_amount), "wage": -int(row.wage)})
+        for player_id, fee in sales:
+            item = {"kind": "sale", "player_id": int(player_id), "ok": False, "budget": 0, "wage": 0}
+            if player_id not in players.index:
+                item["message"] = f"Player {player_id} not found."
+            elif players.at[player_id, "club_id"] != club_id:
+                item["message"] = f"Player {player_id} is not in your team."
+            else:
+                if fee is None:
+                    fee = pd.to_numeric(players.at[player_id, "starting_bid"], errors="coerce")
+                    fee = 0 if pd.isna(fee) else fee
+                item.update(ok=True, message=None, budget=int(fee), wage=int(players.at[player_id, "wage"]))
+            items.append(item)
+
+        n = len(items)
+        valid = np.array([i["ok"] for i in items], dtype=bool)
+        budget_delta = np.array([i["budget"] for i in items], dtype=np.int64)
+        wage_delta = np.array([i["wage"] for i in items], dtype=np.int64)
+        # row k of `chosen` is the subset whose bits are set in k
+        chosen = (np.arange(2 ** n)[:, None] >> np.arange(n)) & 1
+        projected_budget = budget + chosen @ budget_delta
+        projected_wage = wage_left + chosen @ wage_delta
+        feasible = (projected_budget >= 0) & (projected_wage >= 0) & ~(chosen[:, ~valid].any(axis=1))
+        if self.roster_limits.get("squad") is not None:
+            # a bid on a player the club already leads for replaces that bid, it takes no new slot
+            open_bids = self._roster(club_id)["open"]
+            new_slot = np.array([i["kind"] == "bid" and i["player_id"] not in open_bids for i in items], dtype=np.int64)
+            feasible &= self.get_roster(club_id)["squad"] + chosen @ new_slot <= self.roster_limits["squad"]
+
+        # the baskets worth showing: feasible and not contained in a bigger feasible one
+        masks = np.flatnonzero(feasible)
+        contained = ((masks[:, None] & masks[None, :]) == masks[:, None]) & (masks[:, None] != masks[None, :])
+        maximal = masks[~contained.any(axis=1)]
+        bid_money = -(chosen[maximal] @ np.minimum(budget_delta, 0))
+        best = [[i for i in range(n) if mask >> i & 1] for mask in maximal[np.argsort(-bid_money, kind="stable")]]
+
+        everything = int((1 << np.flatnonzero(valid)).sum())  # the subset of all valid items
+        report = {"budget": budget, "wage": wage_left, "items": items,
+                  "all": {"budget": int(projected_budget[everything]), "wage": int(projected_wage[everything]),
+                          "feasible": bool(feasible[everything])},
+                  "feasible": int(feasible.sum()), "best": best}
+        return True, report
+
     def dev_loan_bid(self, player_id, bid_amount,wage, bidding_team):
         player_row = self.players_df.loc[self.players_df["player_id"] == player_id]
         past_bidders_list = self.players_df.loc[self.players_df["player_id"] == player_id, 'past_bidders'].item()
@@ -173,32 +1079,33 @@ class AuctionManager:
         if player["is_listed"] != True:
             return False, f"Player {player_id} not listed."
         #check team funds and wage
-        team_row = self.teams_df.loc[self.teams_df["club_id"] == bidding_team]
-        team = team_row.iloc[0]
-        if team["wage"] < wage:
+        budget, wage_left = self.ledger.available(bidding_team)
+        if budget < bid_amount:
+            return False, f"Player {player_id} not enough budget."
+        if wage_left < wage:
             return False, f"Player {player_id} not enough wage."
         if player_id not in self.players_df["player_id"].values:
             print(f"Player ID {player_id} not found.")
             return None, f"Player {player_id} not found."
-        if bidding_team not in self.teams_df["club_id"].values:
+        if bidding_team not in self._team_rows:
             print(f"Team '{bidding_team}' not found.")
             return None, f"Team '{bidding_team}' not found."
+        reason = self.roster_check(bidding_team, "Dev Loan", [player_id])
+        if reason:
+            return None, reason
+
+        if player_id in self.sealed:
+            return None, self._seal(player_id, bid_amount, wage, bidding_team)[1]
 
         new_bid = Bids(player_id, 0, wage, bidding_team,
                        teams_df=self.teams_df, players_df=self.players_df, typeo="Dev Loan")
 
-        self.bids.append(new_bid)
-        current_team = self.players_df.loc[self.players_df["player_id"] == player_id, 'club_name'].iloc[0]
-        # print(self.teams_df.loc[self.teams_df["club_id"]==241])
-        self.teams_df.loc[self.teams_df["club_id"] == bidding_team, 'budget'] -= bid_amount
-        self.teams_df.loc[self.teams_df["club_id"] == bidding_team, 'wage'] -= wage
-        # print(self.teams_df.loc[self.teams_df["club_id"] == 241])
-
-        selling_team_mask = self.teams_df["club_name"] == current_team
-        print(self.teams_df.loc[selling_team_mask, 'budget'])
-        self.teams_df.loc[selling_team_mask, 'budget'] += bid_amount
-        print(self.teams_df.loc[selling_team_mask, 'budget'])
-        self.teams_df.loc[selling_team_mask, 'wage'] += wage
+        self._track(new_bid)
+        # dev loans carry no fee, the ledger moves what the bid stores
+        new_bid.tx_id = self.ledger.post_bid(bidding_team, new_bid.outgoing_team, new_bid.bid, wage, wage,
+                                             memo=f"{new_bid.typeo} bid on {player_id}")
+        self._sync_teams(bidding_team, new_bid.outgoing_team)
+        self._bid_opened(new_bid)
         self.players_df.loc[self.players_df["player_id"] == player_id, "starting_bid"] = bid_amount
         print(f" Created bid for player {player_id} by {bidding_team}.")
         print(past_bidders_list)
@@ -206,12 +1113,12 @@ class AuctionManager:
             for b in self.bids:
                 if b.player_id == player_id and b.time_remaining == 0:
                     return None, f"Player {player_id} too late (ban pc)."
-            self.remove_bid(player_id,"Dev Loan")
+            self.remove_bid(player_id,"Dev Loan",keep=new_bid)
         # else:
         # self.teams_df.loc[selling_team_mask, 'wage'] += self.players_df.loc[self.players_df["player_id"] == player_id, 'wage']
-        self.players_df.loc[self.players_df["player_id"] == player_id]["past_bidders"].item().append(bidding_team)
-        self.players_df.loc[self.players_df["player_id"] == player_id, "is_listed"] = False
-        return new_bid, f'Created bid for {self.players_df.loc[self.players_df["player_id"] == player_id, "name"].item()} by {self.teams_df.loc[self.teams_df["club_id"] == bidding_team, "club_name"].item()}.'
+        self._bidder_joined(player_id, bidding_team, past_bidders_list)
+        self._set_listed(player_id, False)
+        return new_bid, self.render.bid_message(player_id, bidding_team)
 
 
     def create_free_loan_bid(self, player_id, bid_amount,wage, bidding_team):
@@ -219,46 +1126,41 @@ class AuctionManager:
         if player_row.empty:
             return False, f"Player {player_id} not found.",None
         player = player_row.iloc[0]
-        if not (player["is_listed"]):
-            for b in self.bids:
-                if b.player_id == player_id:
-                    if not b.is_active:
-                        return False, f"Player {player_id} not listed.",None
+        if not self._biddable(player):
+            return False, f"Player {player_id} not listed.",None
         if player["Type"] != "Free Loan":
             return False,f"Wrong Type,Ban Pc!",None
         #check team funds and wage
-        team_row = self.teams_df.loc[self.teams_df["club_id"] == bidding_team]
-        team = team_row.iloc[0]
-        if team["budget"]< bid_amount:
+        budget, wage_left = self.ledger.available(bidding_team)
+        if budget < bid_amount:
             return False, f"Player {player_id} not enough budget.",None
-        if team["wage"] < wage:
+        if wage_left < wage:
             return False, f"Player {player_id} not enough wage.",None
-        if bid_amount < int(player["starting_bid"]):
+        if pd.notna(player["starting_bid"]) and bid_amount < int(player["starting_bid"]):
             return False, f"Player {player_id} not enough starting bid.",None
         # Validate that player and team exist
         if player_id not in self.players_df["player_id"].values:
             print(f"Player ID {player_id} not found.")
             return None, f"Player {player_id} not found.",None
-        if bidding_team not in self.teams_df["club_id"].values:
+        if bidding_team not in self._team_rows:
             print(f"Team '{bidding_team}' not found.")
             return None, f"Team '{bidding_team}' not found.",None
+        reason = self.roster_check(bidding_team, "Free Loan", [player_id])
+        if reason:
+            return None, reason,None
+
+        if player_id in self.sealed:
+            return None, self._seal(player_id, bid_amount, wage, bidding_team)[1], None
 
         new_bid = Bids(player_id, bid_amount, wage ,bidding_team,
                        teams_df=self.teams_df, players_df=self.players_df,typeo="Free Loan")
 
-        self.bids.append(new_bid)
-        current_team = self.players_df.loc[ self.players_df["player_id"] == player_id, 'club_name'].iloc[0]
-        #print(self.teams_df.loc[self.teams_df["club_id"]==241])
-        self.teams_df.loc[self.teams_df["club_id"]==bidding_team, 'budget'] -= bid_amount
-        self.teams_df.loc[self.teams_df["club_id"] == bidding_team, 'wage'] -= wage
-        #print(self.teams_df.loc[self.teams_df["club_id"] == 241])
-
-
-        selling_team_mask = self.teams_df["club_name"] == current_team
-        print(self.teams_df.loc[selling_team_mask, 'budget'])
-        self.teams_df.loc[selling_team_mask, 'budget'] += 0
-        print(self.teams_df.loc[selling_team_mask, 'budget'])
-        self.teams_df.loc[selling_team_mask, 'wage'] += wage
+        self._track(new_bid)
+        # the bidder pays the fee but the lending club doesn't get it, refunds reverse exactly this transaction
+        new_bid.tx_id = self.ledger.post_bid(bidding_team, new_bid.outgoing_team, bid_amount, wage, wage,
+                                             memo=f"{new_bid.typeo} bid on {player_id}", payee=EXTERNAL)
+        self._sync_teams(bidding_team, new_bid.outgoing_team)
+        self._bid_opened(new_bid)
         self.players_df.loc[self.players_df["player_id"] == player_id, "starting_bid"] = bid_amount
         print(f" Created bid for player {player_id} by {bidding_team}.")
         past_bidders_list = self.players_df.loc[self.players_df["player_id"] == player_id, 'past_bidders'].item()
@@ -267,59 +1169,53 @@ class AuctionManager:
             for b in self.bids:
                 if b.player_id == player_id and b.time_remaining == 0:
                     return None, f"Player {player_id} too late (ban pc).",None
-            self.remove_bid(player_id,"Free Loan")
+            self.remove_bid(player_id,"Free Loan",keep=new_bid)
         #else:
            # self.teams_df.loc[selling_team_mask, 'wage'] += self.players_df.loc[self.players_df["player_id"] == player_id, 'wage']
-        self.players_df.loc[self.players_df["player_id"] == player_id]["past_bidders"].item().append(bidding_team)
-        self.players_df.loc[self.players_df["player_id"] == player_id, "is_listed"] = False
-        return new_bid, f'Created bid for {self.players_df.loc[self.players_df["player_id"] == player_id, "name"].item()} by {self.teams_df.loc[self.teams_df["club_id"] == bidding_team, "club_name"].item()}.',past_bidders_list
+        notify = self._bidder_joined(player_id, bidding_team, past_bidders_list)
+        self._set_listed(player_id, False)
+        return new_bid, self.render.bid_message(player_id, bidding_team),notify
 
     def create_reg_loan_bid(self, player_id, bid_amount,wage, bidding_team):
         player_row = self.players_df.loc[self.players_df["player_id"] == player_id]
         if player_row.empty:
             return False, f"Player {player_id} not found.",None
         player = player_row.iloc[0]
-        if not (player["is_listed"]):
-            for b in self.bids:
-                if b.player_id == player_id:
-                    if not b.is_active:
-                        return False, f"Player {player_id} not listed.",None
+        if not self._biddable(player):
+            return False, f"Player {player_id} not listed.",None
         if player["Type"] != "Regular Loan":
             return False,f"Wrong Type,Ban Pc!",None
         #check team funds and wage
-        team_row = self.teams_df.loc[self.teams_df["club_id"] == bidding_team]
-        team = team_row.iloc[0]
-        if team["budget"]< bid_amount:
+        budget, wage_left = self.ledger.available(bidding_team)
+        if budget < bid_amount:
             return False, f"Player {player_id} not enough budget.",None
-        if team["wage"] < wage:
+        if wage_left < wage:
             return False, f"Player {player_id} not enough wage.",None
-        if bid_amount < int(player["starting_bid"]):
+        if pd.notna(player["starting_bid"]) and bid_amount < int(player["starting_bid"]):
             return False, f"Player {player_id} not enough starting bid.",None
         # Validate that player and team exist
         if player_id not in self.players_df["player_id"].values:
             print(f"Player ID {player_id} not found.")
             return None, f"Player {player_id} not found.",None
-        if bidding_team not in self.teams_df["club_id"].values:
+        if bidding_team not in self._team_rows:
             print(f"Team '{bidding_team}' not found.")
             return None, f"Team '{bidding_team}' not found.",None
+        reason = self.roster_check(bidding_team, "Regular Loan", [player_id])
+        if reason:
+            return None, reason,None
 
+        if player_id in self.sealed:
+            return None, self._seal(player_id, bid_amount, wage, bidding_team)[1], None
 
         new_bid = Bids(player_id, bid_amount, wage ,bidding_team,
-                       teams_df=self.teams_df, players_df=self.players_df,typeo="Free Loan")
-
-        self.bids.append(new_bid)
-        current_team = self.players_df.loc[ self.players_df["player_id"] == player_id, 'club_name'].iloc[0]
-        #print(self.teams_df.loc[self.teams_df["club_id"]==241])
-        self.teams_df.loc[self.teams_df["club_id"]==bidding_team, 'budget'] -= bid_amount
-        self.teams_df.loc[self.teams_df["club_id"] == bidding_team, 'wage'] -= wage
-        #print(self.teams_df.loc[self.teams_df["club_id"] == 241])
+                       teams_df=self.teams_df, players_df=self.players_df,typeo="Regular Loan")
 
-
-        selling_team_mask = self.teams_df["club_name"] == current_team
-        print(self.teams_df.loc[selling_team_mask, 'budget'])
-        self.teams_df.loc[selling_team_mask, 'budget'] += bid_amount
-        print(self.teams_df.loc[selling_team_mask, 'budget'])
-        self.teams_df.loc[selling_team_mask, 'wage'] += wage
+        self._track(new_bid)
+        # the fee goes to the selling club, refunds later reverse exactly this transaction
+        new_bid.tx_id = self.ledger.post_bid(bidding_team, new_bid.outgoing_team, bid_amount, wage, wage,
+                                             memo=f"{new_bid.typeo} bid on {player_id}")
+        self._sync_teams(bidding_team, new_bid.outgoing_team)
+        self._bid_opened(new_bid)
         self.players_df.loc[self.players_df["player_id"] == player_id, "starting_bid"] = bid_amount
         print(f" Created bid for player {player_id} by {bidding_team}.")
         past_bidders_list = self.players_df.loc[self.players_df["player_id"] == player_id, 'past_bidders'].item()
@@ -328,16 +1224,134 @@ class AuctionManager:
             for b in self.bids:
                 if b.player_id == player_id and b.time_remaining == 0:
                     return None, f"Player {player_id} too late (ban pc).",None
-            self.remove_bid(player_id,"Free Loan")
+            self.remove_bid(player_id,"Regular Loan",keep=new_bid)
         #else:
            # self.teams_df.loc[selling_team_mask, 'wage'] += self.players_df.loc[self.players_df["player_id"] == player_id, 'wage']
-        self.players_df.loc[self.players_df["player_id"] == player_id]["past_bidders"].item().append(bidding_team)
-        self.players_df.loc[self.players_df["player_id"] == player_id, "is_listed"] = False
+        notify = self._bidder_joined(player_id, bidding_team, past_bidders_list)
+        self._set_listed(player_id, False)
+
+        return new_bid, self.render.bid_message(player_id, bidding_team),notify
+
+
+    def _diff_table(self, current, new, key, keep_columns, protected_ids):
+        """
+        Merges a fresh data file into a current table by key: changed values are copied over
+        (except keep_columns), new rows are added, rows missing from the file are dropped
+        unless they're in protected_ids. Never touches the current table.
+
+        :returns (table, stats): ~DataFrame, dict
+        """
+        cur = current.set_index(key, drop=False)
+        new = new.drop_duplicates(key, keep="last").set_index(key, drop=False)
+        data_cols = [c for c in new.columns if c != key and c not in keep_columns]
+        shared_cols = [c for c in data_cols if c in cur.columns]
+
+        common = cur.index.intersection(new.index)
+        before, after = cur.loc[common, shared_cols], new.loc[common, shared_cols]
+        changed = ((before != after) & ~(before.isna() & after.isna())).any(axis=1)
+        changed_ids = changed[changed].index
+
+        table = cur.copy()
+        for col in data_cols:
+            if col not in table.columns:
+                table[col] = None
+        if len(changed_ids):
+            table.loc[changed_ids, data_cols] = new.loc[changed_ids, data_cols]
+
+        removed = cur.index.difference(new.index)
+        dropped = removed.difference(pd.Index(list(protected_ids)))
+        table = table.drop(index=dropped)
+
+        added = new.loc[new.index.difference(cur.index)]
+        table = pd.concat([table, added.reindex(columns=table.columns)]) if len(added) else table
+        table = table.reset_index(drop=True)
+        stats = {"changed": len(changed_ids), "added": len(added), "removed": len(dropped),
+                 "kept": len(removed) - len(dropped)}
+        return table, stats
 
-        return new_bid, f'Created bid for {self.players_df.loc[self.players_df["player_id"] == player_id, "name"].item()} by {self.teams_df.loc[self.teams_df["club_id"] == bidding_team, "club_name"].item()}.',past_bidders_list
+    def prepare_reload(self, players_df, teams_df):
+        """
+        Diffs freshly loaded player/team data against the running auction without changing
+        anything, so it can run off the event loop. Auction state (listings, Type, past
+        bidders) and ledger money are kept; only the data columns of changed rows are copied.
+        Players/clubs that vanished from the files but still have auction state are kept.
 
+        :returns plan: pass it to apply_reload ~dict
+        """
+        busy_players = {b.player_id for b in self.bids if b.is_active()} | set(self.proxy_bids)
+        busy_players |= set(self.players_df.loc[self.players_df["is_listed"] == True, "player_id"])
+        players, player_stats = self._diff_table(self.players_df, players_df, "player_id",
+                                                 PLAYER_STATE_COLUMNS, busy_players)
+        added = ~players["player_id"].isin(self.players_df["player_id"])
+        if "is_listed" in players.columns:
+            players.loc[added, "is_listed"] = False
+        if "past_bidders" in players.columns:
+            players.loc[added, "past_bidders"] = pd.Series([[] for _ in range(int(added.sum()))],
+                                                           index=players.index[added], dtype=object)
+
+        teams, team_stats = self._diff_table(self.teams_df, teams_df, "club_id", TEAM_LEDGER_COLUMNS,
+                                             [club for club in self.team_summary if self.ledger.has_account(club)])
+        return {"version": self.version, "players_df": players, "teams_df": teams,
+                "players": player_stats, "teams": team_stats}
+
+    def apply_reload(self, plan):
+        """
+        Swaps in the tables built by prepare_reload in one step. Refused if the auction
+        changed since the plan was made (prepare again in that case).
+
+        :returns (ok, msg): ~bool, str
+        """
+        if plan["version"] != self.version:
+            return False, "The auction changed while reloading, try again."
+        players, teams = plan["players_df"], plan["teams_df"]
+        for club_id, budget, wage in zip(teams["club_id"], teams["budget"], teams["wage"]):
+            if not self.ledger.has_account(club_id):
+                self.ledger.open_account(club_id, budget, wage)
+
+        # the swap itself - commands either see the old tables or the new ones
+        self.players_df, self.teams_df = players, teams
+
+        self._team_rows = dict(zip(teams["club_id"], teams.index))
+        self._build_identity()
+        self._build_roster()
+        # a transfer the files show now (the player is at the buyer, or gone) is theirs from here on:
+        # base counts it, so in/out stop counting it. loans stay, the files don't say who's on loan
+        owner = dict(zip(players["player_id"], players["club_id"]))
+        for pid, (buyer, seller, _) in list(self.sold.items()):
+            if pid in owner and owner[pid] != buyer:
+                continue
+            del self.sold[pid]
+            if pid in owner:
+                self._roster(buyer)["in"] -= 1
+            if seller is not None:
+                self._roster(seller)["out"] -= 1
+        listed_counts = players.loc[players["is_listed"] == True, "club_id"].value_counts()
+        for club_id, club_name in zip(teams["club_id"], teams["club_name"]):
+            summary = self.team_summary.setdefault(club_id, {"club_id": club_id, "bids_placed": 0, "bids_received": 0})
+            budget, wage = self.ledger.available(club_id)
+            summary.update(club_name=club_name, budget=budget, wage=wage,
+                           players_listed=int(listed_counts.get(club_id, 0)))
+        self.data_version += 1
+        self._touch()
+        p, t = plan["players"], plan["teams"]
+        msg = f"Players: {p['changed']} updated, {p['added']} added, {p['removed']} removed"
+        if p["kept"]:
+            msg += f", {p['kept']} kept (still in the auction)"
+        return True, msg + f". Clubs: {t['changed']} updated, {t['added']} added, {t['removed']} removed."
+
+    def reload_data(self, players_df, teams_df):
+        """prepare_reload + apply_reload in one go ~(bool, str)"""
+        return self.apply_reload(self.prepare_reload(players_df, teams_df))
 
     def get_info(self,team_id):
-        budget = self.teams_df.loc[team_id, "budget"]
-        wage = self.teams_df.loc[team_id, "wage"]
-        return budget, wage
\ No newline at end of file
+        return self.ledger.available(team_id)
+
+    def get_team_summary(self, team_id):
+        """
+        Constant-time snapshot for /info: budget, wage headroom, open bids placed/received and
+        players listed. Bids count as open until they're outbid, removed or settled by cleanup.
+
+        :returns summary: ~dict (None if the club doesn't exist)
+        """
+        summary = self.team_summary.get(team_id)
+        return dict(summary) if summary is not None else None
\ No newline at end of file
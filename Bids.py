@@ -1,7 +1,8 @@
 
 
 from datetime import datetime, timedelta
-import threading
+
+TIMER_SECONDS = 60  # 12 hours is 12*3600
 
 class Bids:
     def __init__(self, player_id, bid,wage, bidding_team, teams_df, players_df, typeo):
@@ -11,7 +12,9 @@ class Bids:
         self.bid = bid
         self.wage = wage
         self.starting_time = datetime.now()
-        self.ending_time = self.starting_time + timedelta(hours=12)
+        # no timer thread per bid anymore, the bid is over once ending_time passes and the
+        # manager's maintenance worker finalizes it
+        self.ending_time = self.starting_time + timedelta(seconds=TIMER_SECONDS)
         self.active = True
         self.players_df = players_df
         self.teams_df = teams_df
@@ -19,10 +22,13 @@ class Bids:
         self.player_name = self.player_name_row['name'].iloc[
             0] if not self.player_name_row.empty else f"ID {self.player_id} (Name Unknown)"
         self.typeo = typeo
-        # Schedule auto-expiration
-        self._timer = threading.Timer(60, self.expire_bid) #12 hours is 12*3600
-        self._timer.daemon = True
-        self._timer.start()
+        self.tx_id = None  # ledger transaction holding this bid's money, set by AuctionManager
+
+    def __setstate__(self, state):
+        # bids saved while they still had a timer thread ended after TIMER_SECONDS, not at ending_time
+        state.pop("_timer", None)
+        self.__dict__.update(state)
+        self.ending_time = min(self.ending_time, self.starting_time + timedelta(seconds=TIMER_SECONDS))
 
 
 
@@ -56,9 +62,50 @@ class Bids:
     def deactivate_bid(self):
         if self.active:
             self.active = False
-            self._timer.cancel()
             print(f"Bid for player {self.player_id} manually deactivated at {datetime.now()}.")
             return True
         else:
             print(f"Bid for player {self.player_id} is already inactive/expired.")
-            return False
\ No newline at end of file
+            return False
+
+
+class SealedAuction:
+    """
+    A blind auction on one listed player. Offers stay hidden and move no money while it runs,
+    at ending_time the manager resolves them all at once (see AuctionManager.expire_due).
+    """
+
+    def __init__(self, player_id, typeo, rule, starting_bid):
+        """
+        :param rule: "first" (the winner pays his offer) or "second" (the next best offer) ~str
+        """
+        self.player_id = player_id
+        self.typeo = typeo
+        self.rule = rule
+        self.starting_bid = starting_bid
+        self.offers = {}  # club_id -> {"bid", "wage", "time"}, a new offer replaces the club's last one
+        # the clock starts with the first offer, same as an open auction's first bid
+        self.starting_time = None
+        self.ending_time = None
+
+    def start(self):
+        self.starting_time = datetime.now()
+        self.ending_time = self.starting_time + timedelta(seconds=TIMER_SECONDS)
+
+    def is_over(self):
+        return self.ending_time is not None and datetime.now() >= self.ending_time
+
+    def ranked(self):
+        """Offers best first, the earlier offer wins a tie ~list of (club_id, offer)"""
+        return sorted(self.offers.items(), key=lambda item: (-item[1]["bid"], item[1]["time"]))
+
+    def price(self, ranked, i):
+        """What the i-th ranked offer pays when it wins (the ones above it couldn't pay) ~int"""
+        own = ranked[i][1]["bid"]
+        if self.rule == "first":
+            return own
+        runner_up = ranked[i + 1][1]["bid"] if i + 1 < len(ranked) else self.starting_bid
+        return min(own, max(runner_up, self.starting_bid))
+
+    def __repr__(self):
+        return f"<SealedAuction player={self.player_id}, {self.rule} price, {len(self.offers)} offers>"
\ No newline at end of file
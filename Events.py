@@ -0,0 +1,264 @@
+"""
+The league's change feed. AuctionManager emits an Event for everything that changes an
+auction (listed, unlisted, bid placed, sealed bid, outbid, bid removed, expired, settled,
+undone) into its EventLog, which keeps the recent history and hands every event to its
+subscribers.
+
+Subscribers get a bounded queue. The auction never waits for them: a subscriber whose
+queue is full is cut off (lagged) and resumes from the history with the last id it saw,
+so a slow consumer can't hold up bids or silently miss events. serve_events() streams
+the feed as NDJSON over a local TCP port or unix socket for tools outside the bot.
+"""
+import asyncio
+import functools
+import json
+from collections import deque
+from datetime import datetime
+from urllib.parse import parse_qs, urlsplit
+
+LISTED = "listed"
+UNLISTED = "unlisted"
+BID_PLACED = "bid_placed"
+BID_SEALED = "bid_sealed"  # an offer in a sealed auction, the amount stays hidden until it's resolved
+OUTBID = "outbid"  # a higher bid replaced this one, its money was refunded
+BID_REMOVED = "bid_removed"  # taken back by an admin, refunded
+EXPIRED = "expired"  # the auction is over, this bid won it
+SETTLED = "settled"  # the winning bid's money is committed
+UNDONE = "undone"  # an admin took back the event in data["undoes"]
+EVENT_KINDS = (LISTED, UNLISTED, BID_PLACED, BID_SEALED, OUTBID, BID_REMOVED, EXPIRED, SETTLED, UNDONE)
+
+HISTORY_SIZE = 10_000  # events kept for resuming subscribers
+QUEUE_SIZE = 1_000  # events a subscriber may fall behind before it's cut off
+HEARTBEAT = 15.0  # seconds between keep-alive lines on an idle stream
+
+
+def _plain(value):
+    # numpy/pandas scalars and timestamps as json values
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class Event:
+    __slots__ = ("id", "kind", "time", "player_id", "club_id", "data")
+
+    def __init__(self, event_id, kind, player_id=None, club_id=None, data=None):
+        self.id = event_id
+        self.kind = kind
+        self.time = datetime.now()
+        self.player_id = player_id
+        self.club_id = club_id
+        self.data = data or {}
+
+    def to_dict(self):
+        return {"id": self.id, "kind": self.kind, "time": self.time.isoformat(), "player_id": self.player_id,
+                "club_id": self.club_id, **self.data}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), default=_plain)
+
+    def __repr__(self):
+        return f"Event({self.id}, {self.kind}, player={self.player_id}, club={self.club_id})"
+
+
+class SubscriberLagged(Exception):
+    """The subscriber fell more than its queue size behind, resume with log.subscribe(since=last_id)."""
+
+    def __init__(self, last_id):
+        super().__init__(f"subscriber fell behind after event {last_id}")
+        self.last_id = last_id
+
+
+class Subscription:
+    """One consumer's bounded queue of events, iterate it with `async for`."""
+
+    def __init__(self, log, kinds=None, maxsize=QUEUE_SIZE):
+        self.log = log
+        self.kinds = set(kinds) if kinds else None
+        self.queue = asyncio.Queue(maxsize)
+        self.lagged = False
+        self.last_id = 0
+
+    def offer(self, event):
+        # called by the log, never blocks
+        if self.lagged or (self.kinds is not None and event.kind not in self.kinds):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+            self.log.unsubscribe(self)
+
+    async def get(self):
+        """
+        The next event, waits for one if needed.
+
+        :raises SubscriberLagged: once the queued events are used up after falling behind
+        """
+        if self.lagged and self.queue.empty():
+            raise SubscriberLagged(self.last_id)
+        event = await self.queue.get()
+        self.last_id = event.id
+        return event
+
+    def close(self):
+        self.log.unsubscribe(self)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+
+class EventLog:
+    """
+    Numbered events of one league. Ids keep counting across saves, so a consumer can
+    resume from its last id after a restart as long as the history still has it.
+    """
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        """
+        :param history_size: events kept for since()/resuming ~int
+        """
+        self.history = deque(maxlen=history_size)
+        self.next_id = 1
+        self.subscribers = []
+        self.by_player = {}  # player_id -> ids of its events, oldest first
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["subscribers"] = []  # live queues belong to this process only
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if "by_player" not in state:  # saved before the per player index existed
+            self._index()
+
+    def _index(self):
+        self.by_player = {}
+        for e in self.history:
+            if e.player_id is not None:
+                self.by_player.setdefault(e.player_id, []).append(e.id)
+
+    def emit(self, kind, player_id=None, club_id=None, **data):
+        """Records an event and offers it to every subscriber ~Event"""
+        event = Event(self.next_id, kind, player_id, club_id, data)
+        self.next_id += 1
+        self.history.append(event)
+        if player_id is not None:
+            self.by_player.setdefault(player_id, []).append(event.id)
+        if event.id % self.history.maxlen == 0:
+            self._index()  # once per history length drops the ids that fell out, amortized O(1) per event
+        for sub in list(self.subscribers):
+            sub.offer(event)
+        return event
+
+    def get(self, event_id):
+        """The event with that id, None if it's not (or no longer) in the history ~Event"""
+        if not self.history:
+            return None
+        i = event_id - self.history[0].id  # ids are consecutive
+        return self.history[i] if 0 <= i < len(self.history) else None
+
+    def for_player(self, player_id, after=0):
+        """The player's events after the id `after` still in the history, oldest first ~list"""
+        events = (self.get(i) for i in self.by_player.get(player_id, ()) if i > after)
+        return [e for e in events if e is not None]
+
+    def since(self, event_id=0, kinds=None):
+        """
+        Events after event_id, oldest first.
+
+        :raises SubscriberLagged: if the history doesn't go back that far anymore
+        """
+        if self.history and event_id + 1 < self.history[0].id:
+            raise SubscriberLagged(event_id)
+        start = max(0, event_id + 1 - self.history[0].id) if self.history else 0
+        return [e for e in list(self.history)[start:] if kinds is None or e.kind in kinds]
+
+    def subscribe(self, kinds=None, since=None, maxsize=QUEUE_SIZE):
+        """
+        New subscription to the live feed, with the history after `since` queued first.
+
+        :param kinds: only these event kinds, None = all ~iterable
+        :param since: replay the events after this id ~int
+        :param maxsize: events the subscriber may fall behind ~int
+        :returns subscription: ~Subscription
+        """
+        sub = Subscription(self, kinds, maxsize)
+        if since is not None:
+            sub.last_id = since
+            for event in self.since(since):
+                sub.offer(event)
+        if not sub.lagged:
+            self.subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        if sub in self.subscribers:
+            self.subscribers.remove(sub)
+
+
+async def _stream(registry, reader, writer):
+    # GET /events/<guild_id>?since=<id>&kinds=bid_placed,outbid -> one json event per line
+    try:
+        request = (await reader.readline()).decode("latin-1").split()
+        while (await reader.readline()).strip():
+            pass  # headers, nothing in them matters
+        url = urlsplit(request[1] if len(request) > 1 else "")
+        parts = url.path.strip("/").split("/")
+        query = parse_qs(url.query)
+        guild_id = int(parts[1]) if len(parts) == 2 and parts[0] == "events" and parts[1].isdigit() else None
+        manager = registry.get(guild_id, create=False) if guild_id is not None else None
+        if manager is None:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            return
+        kinds = query["kinds"][0].split(",") if "kinds" in query else None
+        since = int(query["since"][0]) if "since" in query else None
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        try:
+            sub = manager.events.subscribe(kinds, since)
+        except SubscriberLagged as e:
+            writer.write((json.dumps({"kind": "lagged", "resume_from": e.last_id}) + "\n").encode())
+            return
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.get(), HEARTBEAT)
+                except asyncio.TimeoutError:
+                    if registry.loaded.get(guild_id) is not manager:
+                        # the league was evicted/reloaded, this manager won't emit anymore
+                        raise SubscriberLagged(sub.last_id)
+                    writer.write(b"\n")
+                else:
+                    writer.write((event.to_json() + "\n").encode())
+                await writer.drain()  # a slow reader holds us here while its queue fills up
+        except SubscriberLagged as e:
+            writer.write((json.dumps({"kind": "lagged", "resume_from": e.last_id}) + "\n").encode())
+        finally:
+            sub.close()
+    except (ConnectionError, IndexError, ValueError):
+        pass
+    finally:
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+
+async def serve_events(registry, host="127.0.0.1", port=None, path=None):
+    """
+    Starts the NDJSON event stream on a local port or unix socket, e.g.
+    curl -N localhost:8765/events/<guild_id>?since=0 or curl -N --unix-socket <path> http://x/events/<guild_id>
+
+    :param registry: the leagues to serve ~LeagueRegistry
+    :returns server: ~asyncio.Server
+    """
+    handler = functools.partial(_stream, registry)
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path=path)
+    return await asyncio.start_server(handler, host=host, port=port)
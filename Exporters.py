@@ -0,0 +1,179 @@
+"""
+Exports of the listings, the active bids and the clubs' finances for the OCM spreadsheet.
+
+Rows come from generators that walk the league a chunk at a time, and the writers stream
+them straight into the file, so an export never holds the whole table in memory twice
+(no to_dict("records") or full DataFrame copies). CSV needs nothing extra, XLSX needs
+openpyxl and Parquet needs pyarrow, both only imported when that format is asked for.
+
+The writers run in a worker thread while the event loop keeps changing the league, so they
+read a snapshot() taken on the loop: the listed rows' positions, the running bids, the name
+maps and the clubs' money, all references or a few numbers per club. Only the listings are
+still read from players_df while streaming, the caller checks manager.version afterwards
+and exports again if the league moved (LIVE_TABLES).
+"""
+import csv
+import os
+
+import numpy as np
+
+EXPORT_CHUNK = 1_000  # rows pulled from the league / written per parquet row group
+FORMATS = ("csv", "xlsx", "parquet")
+
+LISTING_COLUMNS = ("player_id", "name", "club_id", "club_name", "starting_bid", "Type", "wage")
+BID_COLUMNS = ("player_id", "player", "bidding_team", "bidding_club", "outgoing_team", "bid", "wage", "type",
+               "ending_time")
+FINANCE_COLUMNS = ("club_id", "club_name", "budget", "wage", "committed_budget", "reserved_budget",
+                   "committed_wage", "reserved_wage", "bids_placed", "bids_received", "players_listed")
+# parquet type of every column above (pyarrow aliases). Amounts from the data files/bids mix
+# ints and floats, so they are float64 (wage in every table), the ledger's money and the counts are int64
+COLUMN_TYPES = {
+    "player_id": "int64", "club_id": "int64", "bidding_team": "int64", "outgoing_team": "int64",
+    "name": "string", "club_name": "string", "player": "string", "bidding_club": "string", "Type": "string",
+    "type": "string", "ending_time": "string",
+    "starting_bid": "float64", "wage": "float64", "bid": "float64",
+    "budget": "int64", "committed_budget": "int64", "reserved_budget": "int64", "committed_wage": "int64",
+    "reserved_wage": "int64", "bids_placed": "int64", "bids_received": "int64", "players_listed": "int64",
+}
+
+
+def _plain(value):
+    # numpy scalars/NaN as python values, openpyxl and pyarrow don't take numpy types
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def snapshot(manager):
+    """
+    What an export reads, taken on the event loop before the rows are written in a thread.
+
+    :returns snap: version, players (the frame, not a copy) and the listed rows' positions,
+             bids, player/club name maps and one finance row per club ~dict
+    """
+    players = manager.players_df
+    player_names, club_names = manager.render.names()
+    clubs = []
+    for club_id, summary in manager.team_summary.items():
+        balance = manager.ledger.balance(club_id)
+        clubs.append((club_id, summary["club_name"], balance["budget"], balance["wage"], balance["committed_budget"],
+                      balance["reserved_budget"], balance["committed_wage"], balance["reserved_wage"],
+                      summary["bids_placed"], summary["bids_received"], summary["players_listed"]))
+    return {"version": manager.version, "players": players,
+            "listed": np.flatnonzero((players["is_listed"] == True).to_numpy()),
+            "bids": [b for b in manager.bids if b.is_active()], "player_names": player_names,
+            "club_names": club_names, "clubs": clubs}
+
+
+def listing_rows(snap, chunk=EXPORT_CHUNK):
+    """The listed players, one tuple per player in LISTING_COLUMNS order."""
+    players, rows = snap["players"], snap["listed"]
+    columns = [players.columns.get_loc(c) for c in LISTING_COLUMNS]
+    for start in range(0, len(rows), chunk):
+        yield from players.iloc[rows[start:start + chunk], columns].itertuples(index=False, name=None)
+
+
+def bid_rows(snap):
+    """The active bids, one tuple per bid in BID_COLUMNS order."""
+    player_names, club_names = snap["player_names"], snap["club_names"]
+    for b in snap["bids"]:
+        yield (b.player_id, player_names.get(b.player_id, f"ID {b.player_id} (Name Unknown)"), b.bidding_team,
+               club_names.get(b.bidding_team, str(b.bidding_team)), b.outgoing_team, b.bid, b.wage, b.typeo,
+               b.ending_time.isoformat(timespec="seconds"))
+
+
+def finance_rows(snap):
+    """Every club's money from the ledger, one tuple per club in FINANCE_COLUMNS order."""
+    return iter(snap["clubs"])
+
+
+EXPORTS = {  # table name -> (columns, rows generator)
+    "listings": (LISTING_COLUMNS, listing_rows),
+    "active_bids": (BID_COLUMNS, bid_rows),
+    "finances": (FINANCE_COLUMNS, finance_rows),
+}
+LIVE_TABLES = ("listings",)  # still read from players_df while writing, see the module docstring
+
+
+def write_csv(path, columns, rows):
+    """:returns count: rows written ~int"""
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_xlsx(path, columns, rows):
+    """:returns count: rows written ~int"""
+    from openpyxl import Workbook  # optional, only for xlsx exports
+    workbook = Workbook(write_only=True)  # rows go to a temp file as they come, not into memory
+    sheet = workbook.create_sheet()
+    sheet.append(list(columns))
+    count = 0
+    for row in rows:
+        sheet.append([_plain(v) for v in row])
+        count += 1
+    workbook.save(path)
+    return count
+
+
+def write_parquet(path, columns, rows, chunk=EXPORT_CHUNK):
+    """
+    The schema comes from COLUMN_TYPES, not from the first chunk, so a chunk of all None
+    or ints followed by floats can't change a column's type.
+
+    :returns count: rows written ~int
+    """
+    import pyarrow as pa  # optional, only for parquet exports
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(c, pa.type_for_alias(COLUMN_TYPES[c])) for c in columns])
+    batch, count = [], 0
+
+    def flush():
+        writer.write_table(pa.table({c: list(values) for c, values in zip(columns, zip(*batch))} if batch
+                                    else {c: [] for c in columns}, schema=schema))
+        batch.clear()
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for row in rows:
+            batch.append([_plain(v) for v in row])
+            count += 1
+            if len(batch) == chunk:
+                flush()
+        if batch or not count:
+            flush()
+    return count
+
+
+WRITERS = {"csv": write_csv, "xlsx": write_xlsx, "parquet": write_parquet}
+
+
+def export(manager, table, fmt, path, snap=None):
+    """
+    Streams one of the league's tables into a file.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param table: listings, active_bids or finances ~str
+    :param fmt: csv, xlsx or parquet ~str
+    :param path: the file to write ~str
+    :param snap: snapshot() taken on the event loop, taken here if not given (same thread) ~dict
+
+    :returns (ok, msg): ~(bool, str)
+    """
+    if table not in EXPORTS:
+        return False, f"Unknown table '{table}', pick one of {', '.join(EXPORTS)}."
+    if fmt not in WRITERS:
+        return False, f"Unknown format '{fmt}', pick one of {', '.join(FORMATS)}."
+    columns, rows = EXPORTS[table]
+    try:
+        count = WRITERS[fmt](path, columns, rows(snap or snapshot(manager)))
+    except ImportError as e:
+        return False, f"{fmt} exports need {e.name} installed on the bot (pip install {e.name})."
+    return True, f"Exported {count} {table} rows ({os.path.getsize(path) / 1024:,.1f} KB)."
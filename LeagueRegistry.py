@@ -0,0 +1,136 @@
+import asyncio
+import contextlib
+import os
+from collections import OrderedDict
+
+DISCORD_EPOCH_SHIFT = 22  # discord's shard formula: (guild_id >> 22) % shard_count
+
+
+class LeagueRegistry:
+    """
+    One AuctionManager per discord guild (league). Managers are loaded on first use from
+    their league's folder and the least recently used ones are saved and dropped once more
+    than max_loaded are in memory. A league a command is using (see using()) is never
+    dropped, the registry stays over max_loaded until it's released.
+
+    Every league keeps its own files under data_root/<guild_id>/: the state snapshot and
+    its expired_bids archive. With shard_ids/shard_count set, a process only serves the
+    guilds of its discord shards, so leagues can be split across worker processes.
+    """
+
+    def __init__(self, loader, data_root="leagues", max_loaded=8, shard_ids=None, shard_count=1):
+        """
+        :param loader: builds a fresh AuctionManager for a league that has no saved state ~callable
+        :param data_root: folder holding one sub folder per league ~str
+        :param max_loaded: how many leagues may stay in memory ~int
+        :param shard_ids: the discord shards this process serves (None = all) ~list
+        :param shard_count: total number of shards/processes ~int
+        """
+        self.loader = loader
+        self.data_root = data_root
+        self.max_loaded = max_loaded
+        self.shard_ids = set(shard_ids) if shard_ids is not None else None
+        self.shard_count = shard_count
+        self.loaded = OrderedDict()  # guild_id -> manager, least recently used first
+        self._saved_versions = {}  # guild_id -> manager.version at the last save
+        self.in_use = {}  # guild_id -> how many commands are using the league right now
+
+    def owns(self, guild_id):
+        """True if this process is responsible for the guild ~bool"""
+        if self.shard_ids is None:
+            return True
+        return (int(guild_id) >> DISCORD_EPOCH_SHIFT) % self.shard_count in self.shard_ids
+
+    def league_dir(self, guild_id):
+        return os.path.join(self.data_root, str(guild_id))
+
+    def state_path(self, guild_id):
+        return os.path.join(self.league_dir(guild_id), "state.pkl")
+
+    def get(self, guild_id, create=True):
+        """
+        Returns the guild's manager, loading its snapshot (or building it with the loader)
+        the first time it's needed.
+
+        :returns manager: ~AuctionManager or None (not ours / not set up)
+        """
+        if guild_id is None or not self.owns(guild_id):
+            return None
+        manager = self.loaded.get(guild_id)
+        if manager is not None:
+            self.loaded.move_to_end(guild_id)
+            return manager
+        if os.path.exists(self.state_path(guild_id)):
+            from AuctionManager import AuctionManager  # pandas only loads with the first league
+            manager = AuctionManager.load(self.state_path(guild_id))
+        elif create:
+            return self.setup(guild_id)
+        else:
+            return None
+        self._add(guild_id, manager)
+        return manager
+
+    @contextlib.contextmanager
+    def using(self, guild_id):
+        """Pins the guild's league for the block, eviction skips it until the block is left"""
+        self.in_use[guild_id] = self.in_use.get(guild_id, 0) + 1
+        try:
+            yield
+        finally:
+            self.in_use[guild_id] -= 1
+            if not self.in_use[guild_id]:
+                del self.in_use[guild_id]
+                self._trim()
+
+    def setup(self, guild_id):
+        """Builds a fresh manager for the guild, replacing only that league ~AuctionManager"""
+        manager = self.loader()
+        self.loaded.pop(guild_id, None)
+        self._add(guild_id, manager)
+        self.save(guild_id)
+        return manager
+
+    def _add(self, guild_id, manager):
+        os.makedirs(self.league_dir(guild_id), exist_ok=True)
+        manager.archive_dir = os.path.join(self.league_dir(guild_id), "expired_bids")
+        self.loaded[guild_id] = manager
+        self._saved_versions.setdefault(guild_id, manager.version)
+        self._trim()
+
+    def _trim(self):
+        # least recently used leagues first, the ones in use are skipped
+        while len(self.loaded) > self.max_loaded:
+            idle = next((g for g in self.loaded if g not in self.in_use), None)
+            if idle is None:
+                return
+            self.evict(idle)
+
+    def evict(self, guild_id):
+        """Saves the league and drops it from memory, it comes back on the next get(). Not while it's in use."""
+        if guild_id not in self.loaded or guild_id in self.in_use:
+            return
+        self.save(guild_id)
+        self.loaded.pop(guild_id)
+        self._saved_versions.pop(guild_id, None)
+        print(f"League {guild_id} evicted ({len(self.loaded)} still loaded).")
+
+    def save(self, guild_id):
+        manager = self.loaded.get(guild_id)
+        if manager is None:
+            return
+        manager.save(self.state_path(guild_id))
+        self._saved_versions[guild_id] = manager.version
+
+    def save_all(self, only_changed=True):
+        for guild_id, manager in list(self.loaded.items()):
+            if not only_changed or self._saved_versions.get(guild_id) != manager.version:
+                self.save(guild_id)
+
+    async def run_scheduler(self, interval=60):
+        """Background loop: saves every league that changed since its last save."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.save_all()
+            except Exception as e:
+                print(f"League autosave failed: {e}")
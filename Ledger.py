@@ -0,0 +1,196 @@
+from datetime import datetime
+
+import pandas as pd
+
+# system accounts, everything that isn't a club's money lives in one of these
+EQUITY = "equity"  # opening balances come from here
+LEAGUE_WAGES = "league_wages"  # wage headroom isn't zero-sum between clubs, the league absorbs the difference
+EXTERNAL = "external"  # clubs outside the league (e.g. rotw)
+
+FIELDS = ("budget", "wage")
+
+
+class Ledger:
+    """
+    Double-entry ledger for club budgets and wages. Every money move is a transaction
+    of postings (src -> dst), so the league total never changes and every refund is an
+    exact reversal of what was charged.
+
+    A transaction is "open" while its bid is running: its postings count as reserved.
+    Settling it turns them into committed money, reversing it posts the opposite
+    postings. available = committed + reserved, and is what the bid rules read.
+    """
+
+    def __init__(self):
+        self.postings = []  # (tx_id, src, dst, field, amount)
+        self.transactions = {}  # tx_id -> {"kind", "state", "postings", "memo", "time"}
+        # account -> [committed budget, reserved budget, committed wage, reserved wage]
+        self.balances = {}
+        self._next_tx = 1
+
+    @classmethod
+    def from_teams(cls, teams_df):
+        """Opens one account per club with its current budget and wage ~Ledger"""
+        ledger = cls()
+        for club_id, budget, wage in zip(teams_df["club_id"], teams_df["budget"], teams_df["wage"]):
+            ledger.open_account(club_id, budget, wage)
+        return ledger
+
+    def _account(self, account):
+        if account not in self.balances:
+            self.balances[account] = [0, 0, 0, 0]
+        return self.balances[account]
+
+    def _apply(self, src, dst, field, amount, reserved):
+        slot = FIELDS.index(field) * 2 + (1 if reserved else 0)
+        self._account(src)[slot] -= amount
+        self._account(dst)[slot] += amount
+
+    def has_account(self, account):
+        return account in self.balances
+
+    def open_account(self, club_id, budget, wage):
+        self._account(club_id)
+        return self.post("opening", [(EQUITY, club_id, "budget", budget), (EQUITY, club_id, "wage", wage)],
+                         reserve=False, memo=f"opening balance for {club_id}")
+
+    def post(self, kind, postings, reserve=True, memo=None):
+        """
+        Records a transaction.
+
+        :param kind: what happened (bid, opening, ...) ~str
+        :param postings: (src, dst, field, amount) tuples, field is "budget" or "wage" ~list
+        :param reserve: keep it open (reserved) until settle/reverse ~bool
+        :returns tx_id: ~int
+        """
+        tx_id = self._next_tx
+        self._next_tx += 1
+        rows = []
+        for src, dst, field, amount in postings:
+            amount = int(amount)
+            if amount == 0:
+                continue
+            self._apply(src, dst, field, amount, reserve)
+            rows.append(len(self.postings))
+            self.postings.append((tx_id, src, dst, field, amount))
+        self.transactions[tx_id] = {"kind": kind, "state": "open" if reserve else "committed",
+                                    "postings": rows, "memo": memo, "time": datetime.now()}
+        return tx_id
+
+    def post_bid(self, bidder, seller, fee, bidder_wage, seller_wage, memo=None, payee=None):
+        """
+        Reserves a bid: the fee goes bidder -> seller (or payee), the offered wage leaves the
+        bidder's headroom and the seller gets seller_wage of headroom back.
+
+        :returns tx_id: ~int
+        """
+        seller = seller if self.has_account(seller) else EXTERNAL
+        payee = seller if payee is None else payee
+        return self.post("bid", [(bidder, payee, "budget", fee),
+                                 (bidder, LEAGUE_WAGES, "wage", bidder_wage),
+                                 (LEAGUE_WAGES, seller, "wage", seller_wage)], memo=memo)
+
+    def _close(self, tx, state):
+        # reserved -> committed, the amounts stay where they are
+        for i in tx["postings"]:
+            _, src, dst, field, amount = self.postings[i]
+            self._apply(src, dst, field, -amount, True)
+            self._apply(src, dst, field, amount, False)
+        tx["state"] = state
+
+    def reverse(self, tx_id, memo=None, settled=False):
+        """
+        Refunds an open transaction exactly as it was charged, with settled=True a settled one too.
+
+        :returns tx_id: the reversal's, None if there was nothing to reverse ~int
+        """
+        tx = self.transactions.get(tx_id)
+        if tx is None or tx["state"] not in (("open", "settled") if settled else ("open",)):
+            return None
+        if tx["state"] == "open":
+            self._close(tx, "reversed")
+        tx["state"] = "reversed"
+        return self.post("reversal", [(dst, src, field, amount) for _, src, dst, field, amount
+                                      in (self.postings[i] for i in tx["postings"])],
+                         reserve=False, memo=memo or f"reversal of {tx_id}")
+
+    def repost(self, tx_id, memo=None):
+        """Charges a reversed transaction again as a new open one ~int (the new tx_id, None if it wasn't reversed)"""
+        tx = self.transactions.get(tx_id)
+        if tx is None or tx["state"] != "reversed":
+            return None
+        return self.post(tx["kind"], [self.postings[i][1:] for i in tx["postings"]], memo=memo or f"repost of {tx_id}")
+
+    def settle(self, tx_id):
+        """Turns an open transaction's reserved money into committed money ~bool"""
+        tx = self.transactions.get(tx_id)
+        if tx is None or tx["state"] != "open":
+            return False
+        self._close(tx, "settled")
+        return True
+
+    def available(self, club_id):
+        """What a club can spend right now ~(int budget, int wage)"""
+        b = self.balances.get(club_id)
+        if b is None:
+            return 0, 0
+        return b[0] + b[1], b[2] + b[3]
+
+    def balance(self, club_id):
+        """Committed and reserved parts of a club's money ~dict"""
+        b = self.balances.get(club_id, [0, 0, 0, 0])
+        return {"budget": b[0] + b[1], "wage": b[2] + b[3],
+                "committed_budget": b[0], "reserved_budget": b[1],
+                "committed_wage": b[2], "reserved_wage": b[3]}
+
+    def history(self, club_id=None):
+        """Audit trail, every posting (optionally only the ones touching club_id) ~DataFrame"""
+        df = pd.DataFrame(self.postings, columns=["tx_id", "src", "dst", "field", "amount"])
+        if club_id is not None:
+            df = df[(df["src"] == club_id) | (df["dst"] == club_id)]
+        meta = pd.DataFrame([(tx_id, tx["kind"], tx["state"], tx["memo"], tx["time"])
+                             for tx_id, tx in self.transactions.items()],
+                            columns=["tx_id", "kind", "state", "memo", "time"])
+        return df.merge(meta, on="tx_id", how="left")
+
+    def check_invariants(self, teams_df=None):
+        """
+        Recomputes every account from the postings in one vectorized pass and checks that
+        1) the league total of each field is zero (nothing was created or lost),
+        2) the cached balances match the postings, and
+        3) teams_df (if given) shows the same budget/wage as the ledger.
+
+        :returns (ok, problems): ~bool, list of str
+        """
+        problems = []
+        df = pd.DataFrame(self.postings, columns=["tx_id", "src", "dst", "field", "amount"])
+        open_txs = [tx_id for tx_id, tx in self.transactions.items() if tx["state"] == "open"]
+        df["open"] = df["tx_id"].isin(open_txs)
+        signed = pd.concat([
+            df[["dst", "field", "open", "amount"]].rename(columns={"dst": "account"}),
+            df[["src", "field", "open", "amount"]].rename(columns={"src": "account"}).assign(amount=lambda d: -d["amount"]),
+        ])
+        signed["account"] = signed["account"].astype(str)
+        totals = signed.groupby(["field"])["amount"].sum()
+        for field, total in totals.items():
+            if total != 0:
+                problems.append(f"{field} postings don't net to zero ({total:,})")
+
+        recomputed = signed.pivot_table(index="account", columns=["field", "open"], values="amount",
+                                        aggfunc="sum", fill_value=0)
+        cached = pd.DataFrame.from_dict({str(k): v for k, v in self.balances.items()}, orient="index",
+                                        columns=pd.MultiIndex.from_tuples([("budget", False), ("budget", True),
+                                                                           ("wage", False), ("wage", True)]))
+        recomputed = recomputed.reindex(index=cached.index, columns=cached.columns, fill_value=0)
+        drift = (recomputed != cached).any(axis=1)
+        for account in drift[drift].index:
+            problems.append(f"account {account} drifted from its postings")
+
+        if teams_df is not None:
+            clubs = teams_df["club_id"].astype(str)
+            ledger_budget = clubs.map(cached[("budget", False)] + cached[("budget", True)])
+            ledger_wage = clubs.map(cached[("wage", False)] + cached[("wage", True)])
+            bad = (ledger_budget.values != teams_df["budget"].values) | (ledger_wage.values != teams_df["wage"].values)
+            for club in teams_df.loc[bad, "club_id"]:
+                problems.append(f"teams_df and ledger disagree for club {club}")
+        return not problems, problems
@@ -0,0 +1,90 @@
+import asyncio
+import hashlib
+
+import discord
+
+BOARD_LINES = 15  # per section, the embed description caps at 4096 characters
+
+
+def render_board(manager):
+    """
+    Builds the board text: active bids then listed players. End times use discord
+    timestamps, which the client counts down itself, so the text only changes when the
+    auction does.
+
+    :returns description: ~str
+    """
+    bids = sorted(manager.get_active_bids(), key=lambda b: b.ending_time)
+    lines = [f"**Active bids** ({len(bids)})"]
+    for b in bids[:BOARD_LINES]:
+        lines.append(f"{manager.render.bid_card(b)} | ends <t:{int(b.ending_time.timestamp())}:R>")
+    if len(bids) > BOARD_LINES:
+        lines.append(f"...and {len(bids) - BOARD_LINES} more, see `/active_bids`")
+
+    listed = manager.get_listed_players()
+    lines.append(f"\n**Listed players** ({len(listed)})")
+    lines += manager.render.listing_cards(listed.head(BOARD_LINES))
+    if len(listed) > BOARD_LINES:
+        lines.append(f"...and {len(listed) - BOARD_LINES} more, see `/listed_players`")
+    return "\n".join(lines)[:4096]
+
+
+class LiveBoard:
+    """
+    One pinned message per league that the bot keeps up to date, instead of everyone
+    polling /active_bids and /listed_players.
+
+    Changes are coalesced: the board looks at the manager at most every min_interval
+    seconds, only renders when manager.version moved, and only edits the message when
+    the rendered text's hash changed.
+    """
+
+    def __init__(self, source, message, min_interval=5.0):
+        """
+        :param source: returns the league's manager, or None while it's not loaded ~callable
+        :param message: the board message to edit ~discord.Message
+        :param min_interval: seconds between two edits at most ~float
+        """
+        self.source = source
+        self.message = message
+        self.min_interval = min_interval
+        self._seen_version = None
+        self._hash = None
+        self.edits = 0
+        self.task = None
+
+    async def tick(self):
+        """One check, returns True if the message was edited ~bool"""
+        manager = self.source()
+        if manager is None or manager.version == self._seen_version:
+            return False  # league idle/evicted or nothing happened, nothing to render
+        self._seen_version = manager.version
+        text = render_board(manager)
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        if digest == self._hash:
+            return False
+        embed = discord.Embed(title="Live Auction Board", description=text, color=discord.Color.gold())
+        await self.message.edit(content=None, embed=embed)
+        self._hash = digest
+        self.edits += 1
+        return True
+
+    async def run(self):
+        while True:
+            try:
+                await self.tick()
+            except discord.NotFound:
+                print("Live board message was deleted, stopping the board.")
+                return
+            except discord.HTTPException as e:
+                print(f"Live board edit failed: {e}")
+                self._seen_version = None  # try again next round
+            await asyncio.sleep(self.min_interval)
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+        return self.task
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
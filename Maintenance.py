@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+
+class MaintenanceWorker:
+    """
+    Background loop that finalizes expired bids of every loaded league as their deadlines
+    pass, so nobody has to run /cleanup and the active bid lists stay small.
+
+    Settling happens on the event loop (it changes the league), writing the archive CSV
+    happens in a worker thread. metrics holds the numbers shown by /command_stats.
+    """
+
+    def __init__(self, registry, interval=5.0, batch=None):
+        """
+        :param registry: the leagues to look after ~LeagueRegistry
+        :param interval: seconds between two passes ~float
+        :param batch: bids finalized per league and pass at most, None = AuctionManager.EXPIRY_BATCH ~int
+        """
+        self.registry = registry
+        self.interval = interval
+        self.batch = batch
+        self.metrics = {"passes": 0, "finalized": 0, "backlog": 0, "last_runtime": 0.0,
+                        "max_runtime": 0.0, "archive_failures": 0}
+
+    async def run_once(self):
+        """One pass over the loaded leagues ~int (bids finalized)"""
+        start = time.perf_counter()
+        finalized, backlog, archives = 0, 0, []
+        for guild_id, manager in list(self.registry.loaded.items()):
+            records = manager.expire_due(limit=self.batch) if self.batch else manager.expire_due()
+            if records:
+                finalized += len(records)
+                archives.append(asyncio.to_thread(manager.archive, records))
+            backlog += manager.expiry_backlog()
+        # only the settling above counts as runtime, it's the part that holds the event loop
+        runtime = time.perf_counter() - start
+        for result in await asyncio.gather(*archives, return_exceptions=True):
+            if isinstance(result, Exception):
+                self.metrics["archive_failures"] += 1
+                print(f"Archiving expired bids failed: {result}")
+        self.metrics.update(passes=self.metrics["passes"] + 1, finalized=self.metrics["finalized"] + finalized,
+                            backlog=backlog, last_runtime=runtime,
+                            max_runtime=max(self.metrics["max_runtime"], runtime))
+        if finalized:
+            print(f"Maintenance finalized {finalized} expired bids in {runtime * 1000:.1f} ms ({backlog} still due).")
+        return finalized
+
+    async def run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Maintenance pass failed: {e}")
+            # catch up straight away while a batch limit left bids behind
+            await asyncio.sleep(0 if self.metrics["backlog"] else self.interval)
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+
+class TokenBucket:
+    """
+    Classic token bucket: holds up to `burst` tokens and refills `rate` tokens a second,
+    every call takes one. Only stores two floats so keeping one per user is cheap.
+    """
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate, burst, now=None):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic() if now is None else now
+
+    def take(self, now=None):
+        """
+        :returns retry_after: 0 if a token was taken, else seconds until the next one ~float
+        """
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """One TokenBucket per key (discord user, club...), idle buckets are dropped when there are too many."""
+
+    def __init__(self, rate, burst, max_keys=10_000):
+        """
+        :param rate: tokens refilled per second ~float
+        :param burst: how many calls can be made back to back ~int
+        :param max_keys: buckets kept before idle ones are pruned ~int
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.buckets = {}
+        self.rejected = 0
+
+    def hit(self, key, now=None):
+        """
+        Takes a token for the key.
+
+        :returns retry_after: 0 if allowed, else seconds to wait ~float
+        """
+        now = time.monotonic() if now is None else now
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            if len(self.buckets) >= self.max_keys:
+                self.prune(now)
+            bucket = self.buckets[key] = TokenBucket(self.rate, self.burst, now)
+        retry_after = bucket.take(now)
+        if retry_after:
+            self.rejected += 1
+        return retry_after
+
+    def prune(self, now=None):
+        """Drops buckets that have refilled completely, they'd behave like a new one anyway."""
+        now = time.monotonic() if now is None else now
+        full = self.burst / self.rate  # time after which even an empty bucket is back to full
+        self.buckets = {k: b for k, b in self.buckets.items() if now - b.updated < full}
+
+
+class SingleFlight:
+    """
+    Shares one computation between identical queries. Keys should include everything the
+    answer depends on (query, guild, manager, manager.version), so a finished result can be handed
+    to later callers with the same key too - a new version means a new key.
+    """
+
+    def __init__(self, keep=32):
+        """
+        :param keep: finished results kept for repeated keys ~int
+        """
+        self.keep = keep
+        self.inflight = {}  # key -> future of a running computation
+        self.results = OrderedDict()  # key -> finished result, oldest first
+        self.computed = 0
+        self.shared = 0
+
+    async def do(self, key, fn):
+        """
+        Returns fn()'s result for the key, computing it only if nobody else has or is.
+
+        :param key: hashable query key ~tuple
+        :param fn: builds the result, may be sync or async ~callable
+        """
+        if key in self.results:
+            self.shared += 1
+            self.results.move_to_end(key)
+            return self.results[key]
+        future = self.inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        try:
+            result = fn()
+            if asyncio.iscoroutine(result):
+                result = await result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved, waiters (if any) still get it
+            raise
+        finally:
+            self.inflight.pop(key, None)
+        self.computed += 1
+        future.set_result(result)
+        self.results[key] = result
+        while len(self.results) > self.keep:
+            self.results.popitem(last=False)
+        return result
@@ -0,0 +1,92 @@
+import weakref
+
+
+def number(num):
+    return f"{int(num):,}"
+
+
+class RenderCache:
+    """
+    Ready-made display text for players, clubs and bids, so building a listing page or a
+    bid message is a dict lookup and a join instead of DataFrame scans and formatting.
+
+    Everything is thrown away when the manager's data_version changes (data reload), and
+    listing cards are keyed by the values they show, so a new starting bid or type just
+    makes a new card.
+    """
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._data_version = None
+        self._player_names = None  # player_id -> name, built in one pass on first use
+        self._club_names = None  # club_id -> club_name
+        self._listing_cards = {}  # (player_id, starting_bid, Type) -> str
+        self._bid_cards = weakref.WeakKeyDictionary()  # Bids -> str, goes away with the bid
+
+    def __getstate__(self):
+        # caches are rebuilt after loading a saved league
+        return {"manager": self.manager}
+
+    def __setstate__(self, state):
+        self.__init__(state["manager"])
+
+    def _check_version(self):
+        if self._data_version != self.manager.data_version:
+            self._data_version = self.manager.data_version
+            self._player_names = None
+            self._club_names = None
+            self._listing_cards.clear()
+            self._bid_cards.clear()
+
+    def player_name(self, player_id):
+        self._check_version()
+        if self._player_names is None:
+            players_df = self.manager.players_df
+            self._player_names = dict(zip(players_df["player_id"], players_df["name"]))
+        return self._player_names.get(player_id, f"ID {player_id} (Name Unknown)")
+
+    def club_name(self, club_id):
+        self._check_version()
+        if self._club_names is None:
+            teams_df = self.manager.teams_df
+            self._club_names = dict(zip(teams_df["club_id"], teams_df["club_name"]))
+        return self._club_names.get(club_id, str(club_id))
+
+    def names(self):
+        """
+        Both name maps, built now if needed. A reload replaces them instead of changing them,
+        so a worker thread can keep reading the pair it got ~(dict, dict)
+        """
+        self.player_name(None)
+        self.club_name(None)
+        return self._player_names, self._club_names
+
+    def listing_card(self, player_id, starting_bid, typeo):
+        self._check_version()
+        key = (player_id, starting_bid, typeo)
+        card = self._listing_cards.get(key)
+        if card is None:
+            card = (f"**{self.player_name(player_id)}** (ID: {int(player_id)})\n"
+                    f"> Starting Bid: £{number(starting_bid)} | Type: `{typeo}`")
+            self._listing_cards[key] = card
+        return card
+
+    def listing_cards(self, listed_df):
+        """Cards for every row of a get_listed_players() frame ~list of str"""
+        sealed = self.manager.sealed
+        return [self.listing_card(pid, bid, typeo) + (f" | Sealed, {sealed[pid].rule} price" if pid in sealed else "")
+                for pid, bid, typeo in zip(listed_df["player_id"], listed_df["starting_bid"], listed_df["Type"])]
+
+    def bid_card(self, bid):
+        """The fixed part of an active bid card, the caller adds the time left ~str"""
+        self._check_version()
+        card = self._bid_cards.get(bid)
+        if card is None:
+            card = (f"**{self.player_name(bid.player_id)}** (ID: {bid.player_id})\n"
+                    f"> Bid: £{number(bid.bid)} by **{self.club_name(bid.bidding_team)}**\n"
+                    f"> Wage: £{number(bid.wage)} | Type: `{bid.typeo}`")
+            self._bid_cards[bid] = card
+        return card
+
+    def bid_message(self, player_id, bidding_team):
+        return f"Created bid for {self.player_name(player_id)} by {self.club_name(bidding_team)}."
@@ -0,0 +1,188 @@
+"""
+End of season batch job: settles every open auction of a league, then builds each club's
+transfer report (bought/sold, fees, wages, loans) from its expired_bids archive.
+
+The archive is turned into flat numpy arrays once, grouped by buying and selling club,
+and saved to a temp folder. Worker processes map them read-only (np.load mmap_mode="r")
+so nothing big gets pickled to them, each works through a contiguous range of clubs and
+the parent puts the results back together in teams_df order, so the report is the same
+whatever the number of workers.
+
+run: python Settlement.py leagues/<guild_id> [--workers N]
+"""
+import argparse
+import glob
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+TYPE_CODES = {"Regular": 0, "Dev Loan": 1, "Free Loan": 2, "Paid Loan": 3, "Regular Loan": 4}  # all but 0 are loans
+TYPE_NAMES = np.array(list(TYPE_CODES))
+ARRAYS = ("club_id", "player_id", "buyer", "seller", "fee", "wage", "type",
+          "buy_rows", "buy_offsets", "sell_rows", "sell_offsets")
+CHUNKS_PER_WORKER = 4  # smaller ranges than one per worker even out clubs with big seasons
+
+
+def load_transfers(archive_dir):
+    """
+    Every finished auction of the league, oldest archive file first.
+
+    :returns transfers: player_id, bidding_team, outgoing_team, bid, wage, type ~DataFrame
+    """
+    columns = ("player_id", "bidding_team", "outgoing_team", "bid", "wage", "type")
+    files = sorted(glob.glob(os.path.join(archive_dir, "expired_bids_*.csv")))  # names sort by time
+    frames = [pd.read_csv(f, usecols=lambda c: c in columns) for f in files]
+    if not frames:
+        return pd.DataFrame(columns=list(columns))
+    return pd.concat(frames, ignore_index=True)
+
+
+def share_tables(transfers, teams_df, folder):
+    """
+    Writes the season as .npy arrays the workers can map. Clubs are referred to by their row
+    in teams_df (-1 = not in the league, e.g. rotw). buy_rows[buy_offsets[k]:buy_offsets[k+1]]
+    are the transfers club k bought, in archive order, same for sell_*.
+
+    :param transfers: load_transfers() output ~DataFrame
+    :param teams_df: the league's teams ~DataFrame
+    :param folder: where to write the arrays ~str
+    """
+    clubs = teams_df["club_id"].to_numpy(dtype=np.int64)
+    order = np.argsort(clubs, kind="stable")
+    sorted_clubs = clubs[order]
+
+    def club_rows(column):
+        ids = pd.to_numeric(transfers[column], errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+        pos = np.clip(np.searchsorted(sorted_clubs, ids), 0, len(clubs) - 1)
+        return np.where(sorted_clubs[pos] == ids, order[pos], -1)
+
+    arrays = {
+        "club_id": clubs,
+        "player_id": pd.to_numeric(transfers["player_id"], errors="coerce").fillna(-1).to_numpy(dtype=np.int64),
+        "buyer": club_rows("bidding_team"),
+        "seller": club_rows("outgoing_team"),
+        "fee": pd.to_numeric(transfers["bid"], errors="coerce").fillna(0).to_numpy(dtype=np.float64),
+        "wage": pd.to_numeric(transfers["wage"], errors="coerce").fillna(0).to_numpy(dtype=np.float64),
+        "type": transfers["type"].map(TYPE_CODES).fillna(0).to_numpy(dtype=np.int8),
+    }
+    for side, rows_of in (("buy", arrays["buyer"]), ("sell", arrays["seller"])):
+        rows = np.argsort(rows_of, kind="stable")
+        arrays[f"{side}_rows"] = rows
+        arrays[f"{side}_offsets"] = np.searchsorted(rows_of[rows], np.arange(len(clubs) + 1))
+    for name, array in arrays.items():
+        np.save(os.path.join(folder, f"{name}.npy"), array)
+
+
+def club_reports(folder, start, stop, out_dir=None):
+    """
+    Worker: the reports of clubs start..stop (teams_df rows), reading the mapped arrays.
+    With out_dir set it also writes each club's transfers to out_dir/<club_id>.csv.
+
+    :returns reports: one dict per club, in range order ~list
+    """
+    a = {name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode="r") for name in ARRAYS}
+    reports = []
+    for k in range(start, stop):
+        club_id = int(a["club_id"][k])
+        bought = np.asarray(a["buy_rows"][a["buy_offsets"][k]:a["buy_offsets"][k + 1]])
+        sold = np.asarray(a["sell_rows"][a["sell_offsets"][k]:a["sell_offsets"][k + 1]])
+        loans_in = a["type"][bought] != TYPE_CODES["Regular"]  # every loan type, regular loans included
+        loans_out = a["type"][sold] != TYPE_CODES["Regular"]
+        spent, received = a["fee"][bought].sum(), a["fee"][sold].sum()
+        reports.append({
+            "club_id": club_id,
+            "bought": int((~loans_in).sum()),
+            "sold": int((~loans_out).sum()),
+            "loans_in": int(loans_in.sum()),
+            "loans_out": int(loans_out.sum()),
+            "spent": int(spent),
+            "received": int(received),
+            "net_spend": int(spent - received),
+            "wages_added": int(a["wage"][bought].sum()),
+            "record_signing": int(a["player_id"][bought[a["fee"][bought].argmax()]]) if len(bought) else None,
+        })
+        if out_dir is not None:
+            rows = np.concatenate([bought, sold])
+            other = np.concatenate([a["seller"][bought], a["buyer"][sold]])  # -1 = outside the league
+            pd.DataFrame({
+                "direction": ["in"] * len(bought) + ["out"] * len(sold),
+                "player_id": a["player_id"][rows],
+                "other_club": np.where(other >= 0, a["club_id"][other], -1),
+                "fee": a["fee"][rows],
+                "wage": a["wage"][rows],
+                "type": TYPE_NAMES[a["type"][rows]],
+            }).to_csv(os.path.join(out_dir, f"{club_id}.csv"), index=False)
+    return reports
+
+
+def season_report(teams_df, archive_dir, workers=None, out_dir=None):
+    """
+    Builds every club's season report from the archive, partitioned over a process pool.
+
+    :param teams_df: the league's teams after settlement ~DataFrame
+    :param archive_dir: the league's expired_bids folder ~str
+    :param workers: processes to use, None = one per core, 1 = no pool ~int
+    :param out_dir: also write one transfer CSV per club there ~str
+
+    :returns report: one row per club in teams_df order, with its end of season budget/wage ~DataFrame
+    """
+    workers = workers or os.cpu_count() or 1
+    transfers = load_transfers(archive_dir)
+    n_clubs = len(teams_df)
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory() as folder:
+        share_tables(transfers, teams_df, folder)
+        step = max(1, -(-n_clubs // (workers * CHUNKS_PER_WORKER)))
+        starts = list(range(0, n_clubs, step))
+        parts = [folder] * len(starts), starts, [min(s + step, n_clubs) for s in starts], [out_dir] * len(starts)
+        if workers == 1:
+            results = list(map(club_reports, *parts))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(club_reports, *parts))  # map keeps submission order
+    report = pd.DataFrame([r for part in results for r in part],
+                          columns=["club_id", "bought", "sold", "loans_in", "loans_out", "spent", "received",
+                                   "net_spend", "wages_added", "record_signing"])
+    report.insert(1, "club_name", teams_df["club_name"].to_numpy())
+    report["budget"] = teams_df["budget"].to_numpy()
+    report["wage"] = teams_df["wage"].to_numpy()
+    return report
+
+
+def end_season(manager, workers=None, out_dir=None):
+    """
+    Settles every open auction, archives them and builds the season report.
+
+    :param manager: the league's auction manager ~class
+    :returns report: season_report() output ~DataFrame
+    """
+    records = manager.settle_all()
+    if records:
+        manager.archive(records)
+    print(f"Settled {len(records)} open auctions.")
+    return season_report(manager.teams_df, manager.archive_dir, workers=workers, out_dir=out_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End of season settlement and club transfer reports.")
+    parser.add_argument("league_dir", help="the league's folder, e.g. leagues/<guild_id>")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    from AuctionManager import AuctionManager
+    state = os.path.join(args.league_dir, "state.pkl")
+    manager = AuctionManager.load(state)
+    manager.archive_dir = os.path.join(args.league_dir, "expired_bids")
+    out_dir = os.path.join(args.league_dir, "season_report")
+    report = end_season(manager, workers=args.workers, out_dir=out_dir)
+    manager.save(state)
+    report.to_csv(os.path.join(out_dir, "clubs.csv"), index=False)
+    print(f"Season report for {len(report)} clubs written to '{out_dir}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import asyncio
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+FEATURE_COLUMNS = ("overall", "potential", "age", "wage")  # whichever of these players_df has
+MIN_SAMPLES = 20  # finished auctions needed before the regression replaces the fallback
+DEFAULT_FEE_PER_WAGE = 100  # fallback: fee ~ 100x the player's wage
+ROUND_TO = 10_000
+
+
+def load_history(archive_dir):
+    """
+    Reads the finished auctions cleanup/maintenance wrote to archive_dir.
+
+    :returns history: player_id, bid, wage of every settled Regular bid ~DataFrame
+    """
+    files = glob.glob(os.path.join(archive_dir, "expired_bids_*.csv"))
+    frames = [pd.read_csv(f, usecols=lambda c: c in ("player_id", "bid", "wage", "type")) for f in files]
+    if not frames:
+        return pd.DataFrame(columns=["player_id", "bid", "wage"])
+    history = pd.concat(frames, ignore_index=True)
+    if "type" in history.columns:
+        history = history[history["type"] == "Regular"]  # loans aren't priced like transfers
+    return history[["player_id", "bid", "wage"]]
+
+
+class Valuation:
+    """
+    Suggested fee and wage for every player, computed for the whole players_df at once and
+    kept in a dict so showing a suggestion costs one lookup.
+
+    With enough finished auctions the fee comes from a least squares fit of log(fee) on the
+    player attributes (FEATURE_COLUMNS), otherwise it falls back to a multiple of the
+    player's wage. The wage suggestion is the player's wage times the median raise clubs
+    offered in past auctions.
+    """
+
+    def __init__(self):
+        self.suggestions = {}  # player_id -> (fee, wage)
+        self.fitted_on = None  # (data_version, archive files) the suggestions were built from
+        self.method = "none"
+        self.samples = 0
+
+    def suggest(self, player_id):
+        """:returns (fee, wage): ~(int, int) or None if there's no suggestion yet"""
+        return self.suggestions.get(player_id)
+
+    def fit(self, players_df, history):
+        """
+        Builds the suggestions for every player. Doesn't touch self until the end, so it can
+        run in a worker thread while commands keep reading the old suggestions.
+
+        :param players_df: the league's players ~DataFrame
+        :param history: load_history() output ~DataFrame
+        """
+        features = [c for c in FEATURE_COLUMNS if c in players_df.columns]
+        X_all = players_df[features].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=float, copy=True)
+        if "wage" in features:
+            X_all[:, features.index("wage")] = np.log1p(np.clip(X_all[:, features.index("wage")], 0, None))
+        X_all = np.column_stack([np.ones(len(X_all)), X_all])
+        player_wage = pd.to_numeric(players_df["wage"], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+        rows = pd.Series(np.arange(len(players_df)), index=players_df["player_id"].to_numpy())
+        rows = rows[~rows.index.duplicated()]
+        history = history[history["player_id"].isin(rows.index) & (history["bid"] > 0)]
+        idx = rows.loc[history["player_id"]].to_numpy()
+
+        if len(history) >= MIN_SAMPLES:
+            coef, *_ = np.linalg.lstsq(X_all[idx], np.log(history["bid"].to_numpy(dtype=float)), rcond=None)
+            fee = np.exp(X_all @ coef)
+            method = "regression"
+        else:
+            fee = player_wage * DEFAULT_FEE_PER_WAGE
+            method = "wage multiple"
+        paid = player_wage[idx]
+        raises = history["wage"].to_numpy(dtype=float)[paid > 0] / paid[paid > 0]
+        wage = player_wage * (np.median(raises) if len(raises) else 1.0)
+
+        fee = (np.round(fee / ROUND_TO) * ROUND_TO).astype(np.int64)
+        wage = np.round(wage).astype(np.int64)
+        return {"suggestions": dict(zip(players_df["player_id"].tolist(), zip(fee.tolist(), wage.tolist()))),
+                "method": method, "samples": len(history)}
+
+    def refit(self, players_df, archive_dir, fitted_on=None):
+        """load_history + fit + swap in the new suggestions, meant for asyncio.to_thread"""
+        result = self.fit(players_df, load_history(archive_dir))
+        self.suggestions, self.method, self.samples = result["suggestions"], result["method"], result["samples"]
+        self.fitted_on = fitted_on
+        return result
+
+    @staticmethod
+    def inputs_of(manager):
+        """What the suggestions depend on, refit when it changes ~tuple"""
+        return manager.data_version, len(glob.glob(os.path.join(manager.archive_dir, "expired_bids_*.csv")))
+
+
+async def run_refits(registry, interval=60):
+    """Background loop: refits the valuation of every loaded league whose data or archive changed."""
+    while True:
+        for guild_id, manager in list(registry.loaded.items()):
+            try:
+                inputs = Valuation.inputs_of(manager)
+                if manager.valuation.fitted_on != inputs:
+                    await asyncio.to_thread(manager.valuation.refit, manager.players_df, manager.archive_dir, inputs)
+            except Exception as e:
+                print(f"Valuation refit for league {guild_id} failed: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,13 @@
+"""
+The discord auction bot as a package. Nothing heavy is imported here: `main()` pulls in
+discord and the bot when it runs, and pandas/numpy/the data files only load once a league
+needs them.
+
+run: python -m auction_bot
+"""
+from auction_bot import profile as _profile  # noqa: F401 - starts the startup clock
+
+
+def main():
+    from auction_bot.app import main as run
+    return run()
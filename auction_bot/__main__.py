@@ -0,0 +1,3 @@
+from auction_bot import main
+
+main()
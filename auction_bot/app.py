@@ -0,0 +1,16 @@
+import os
+
+from auction_bot.profile import StartupProfile
+
+
+def main():
+    """Builds the bot and runs it until it's stopped (needs DISCORD_BOT_ID in the env or .env)."""
+    profile = StartupProfile()
+    profile.mark("package imported")
+    from dotenv import load_dotenv
+    from auction_bot.bot import AuctionBot
+    profile.mark("discord imported")
+    load_dotenv()
+    bot = AuctionBot(profile=profile)
+    profile.mark("bot built")
+    bot.run(os.environ.get("DISCORD_BOT_ID"))
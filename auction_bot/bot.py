@@ -0,0 +1,172 @@
+import asyncio
+import os
+
+import discord
+from discord.ext import commands
+
+from LeagueRegistry import LeagueRegistry
+from LiveBoard import LiveBoard
+from Maintenance import MaintenanceWorker
+from auction_bot import services
+from auction_bot.middleware import COMMANDS, on_app_command_error
+from auction_bot.profile import StartupProfile
+
+
+# --- Discord Bot Implementation ---
+
+# Set up the bot with necessary intents
+class AuctionBot(commands.AutoShardedBot):
+    def __init__(self, profile=None):
+        self.profile = profile or StartupProfile()
+        # We need message content intent to process standard commands, but
+        # since we focus on slash commands, fewer intents are needed.
+        intents = discord.Intents.default()
+        # SHARD_COUNT/SHARD_IDS split the leagues over several bot processes,
+        # e.g. SHARD_COUNT=2 SHARD_IDS=0 and SHARD_COUNT=2 SHARD_IDS=1
+        shard_count = int(os.environ.get("SHARD_COUNT", 1))
+        shard_ids = [int(i) for i in os.environ["SHARD_IDS"].split(",")] if os.environ.get("SHARD_IDS") else None
+        super().__init__(command_prefix='!', intents=intents, shard_count=shard_count, shard_ids=shard_ids)
+        # one AuctionManager per guild (league), loaded on first use
+        self.leagues = LeagueRegistry(services.setUp, data_root=os.environ.get("LEAGUES_DIR", "leagues"),
+                                      max_loaded=int(os.environ.get("MAX_LOADED_LEAGUES", 8)),
+                                      shard_ids=shard_ids, shard_count=shard_count)
+        self.boards = {}  # guild_id -> running LiveBoard
+        self.maintenance = MaintenanceWorker(self.leagues)  # finalizes expired bids as their deadlines pass
+
+    async def setup_hook(self):
+        import auction_bot.commands  # noqa: F401 - defines the slash commands
+        for command in COMMANDS:
+            self.tree.add_command(command)
+        self.tree.error(on_app_command_error)
+        self.loop.create_task(self.leagues.run_scheduler())
+        self.loop.create_task(self.maintenance.run())
+        self.loop.create_task(self._run_refits())
+        # change feed for the spreadsheet sync/stats site, local only, off unless configured
+        if os.environ.get("EVENTS_SOCKET") or os.environ.get("EVENTS_PORT"):
+            from Events import serve_events
+            port = int(os.environ["EVENTS_PORT"]) if os.environ.get("EVENTS_PORT") else None
+            self.event_server = await serve_events(self.leagues, port=port, path=os.environ.get("EVENTS_SOCKET"))
+        self.profile.mark("setup_hook")
+
+    async def _run_refits(self):
+        # numpy/pandas for the valuation model are loaded after login, not before it
+        await self.wait_until_ready()
+        from Valuation import run_refits
+        await run_refits(self.leagues)
+
+    async def on_ready(self):
+        self.profile.mark("ready")
+        print(f'Logged in as {self.user} (ID: {self.user.id})')
+        await self.tree.sync()
+        print('Synced application commands.')
+        self.profile.mark("commands synced")
+        print(self.profile.report())
+        print('---')
+
+    async def close(self):
+        self.leagues.save_all(only_changed=False)
+        await super().close()
+
+
+def get_manager(interaction: discord.Interaction):
+    """
+    Returns the AuctionManager of the league (guild) the command came from.
+
+    :returns manager: ~AuctionManager or None if the league isn't set up
+    """
+    try:
+        # only /setup_auction creates a league, it loads the data files
+        manager = interaction.client.leagues.get(interaction.guild_id, create=False)
+    except Exception as e:
+        print(f"Loading league {interaction.guild_id} failed: {e}")
+        return None
+    if manager is not None and manager.live_board and interaction.guild_id not in interaction.client.boards:
+        start_live_board(interaction.client, interaction.guild_id, manager)  # board of a league saved before a restart
+    return manager
+
+
+def start_live_board(bot, guild_id: int, manager, message: discord.Message = None):
+    """
+    Starts (or restarts) the league's live board task.
+
+    :param bot: the running bot ~AuctionBot
+    :param guild_id: the league ~int
+    :param manager: the league's auction manager ~class
+    :param message: the board message, looked up from manager.live_board if not given
+    """
+    if message is None:
+        channel = bot.get_channel(manager.live_board[0])
+        if channel is None:
+            return None
+        message = channel.get_partial_message(manager.live_board[1])
+    old = bot.boards.pop(guild_id, None)
+    if old is not None:
+        old.stop()
+    # the board reads the league only while it's loaded, an evicted league hasn't changed
+    board = LiveBoard(lambda: bot.leagues.loaded.get(guild_id), message)
+    bot.boards[guild_id] = board
+    board.start()
+    return board
+
+
+background_tasks = set()  # keeps fire-and-forget tasks alive until they finish
+
+
+def notify_clubs(bot, manager, club_ids, message_content: str):
+    """
+    DMs the managers of club_ids in the background, the command doesn't wait for it.
+
+    :param bot: the running bot ~AuctionBot
+    :param manager: the league the clubs play in ~class
+    :param club_ids: the clubs to tell ~list
+    :param message_content: the message to send ~str
+    """
+    async def send_all():
+        for club_id in club_ids:
+            discord_id = manager.user_of_club.get(club_id)
+            if discord_id is not None:
+                await send_direct_message(bot, discord_id, message_content)
+
+    task = asyncio.create_task(send_all())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+
+async def send_direct_message(bot: commands.Bot, user_id: int, message_content: str):
+    """
+    Sends a direct message to a Discord user.
+
+    Args:
+        bot (commands.Bot): The bot client instance.
+        user_id (int): The Discord ID of the user to message.
+        message_content (str): The message to send.
+
+    Returns:
+        bool: True if the message was sent successfully, False otherwise.
+    """
+    try:
+        user = await bot.fetch_user(user_id)
+
+        if user is None:
+            print(f"Error: Could not find user with ID {user_id}.")
+            return False
+
+        # 2. Send the message to the user
+        await user.send(message_content)
+        print(f"Successfully sent DM to {user.name} (ID: {user_id}).")
+        return True
+
+    except discord.Forbidden:
+        # This occurs if the user has disabled DMs from server members/bots
+        # or has blocked the bot.
+        print(f"Error: Cannot send DM to user {user_id}. DMs may be disabled.")
+        return False
+    except discord.HTTPException as e:
+        # Other potential issues, like rate limits or message too long
+        print(f"An HTTP error occurred while sending DM to {user_id}: {e}")
+        return False
+    except Exception as e:
+        # Catch any other unexpected errors
+        print(f"An unexpected error occurred: {e}")
+        return False
@@ -0,0 +1,656 @@
+"""
+The slash commands. Importing this module registers them in middleware.COMMANDS, the bot adds
+them to its command tree in setup_hook.
+"""
+import os
+
+import discord
+from discord import app_commands
+
+from RenderCache import number
+from auction_bot.bot import get_manager, notify_clubs, start_live_board
+from auction_bot.middleware import (auction_command, admin_only, caller_club, command_timings, defer, read_queries,
+                                    reply, user_limiter, club_limiter)
+from auction_bot.services import (active_bid_list, cancel_proxy_bid, clean_memory, create_bid, create_bids_bulk,
+                                  create_dev_bid, create_free_loan_bid, create_proxy_bid, create_reg_loan_bid,
+                                  export_table, format_bulk_results, get_info, get_listed_players, list_player,
+                                  list_players_bulk, parse_bulk_items, player_history, reload_data, remove_bid,
+                                  set_auction_mode, suggestion_note, undo, unlist_player, watch, what_if)
+from auction_bot.views import PaginationView
+
+
+@auction_command(name="setup_auction", description="Initializes the Auction Manager and loads player/team data.", ephemeral=True)
+@admin_only
+@app_commands.describe(
+    reset="Start a fresh auction (drops open bids and budget changes) instead of reloading the data")
+async def setup_command(interaction: discord.Interaction, reset: bool = False):
+    """
+    Initializes the auction system by loading player and team data and creating the AuctionManager.
+    If the league already runs an auction the data is hot reloaded instead, unless reset is set.
+
+    :returns manager: the initialized AuctionManager instance ~class
+    """
+    await defer(interaction, ephemeral=True)
+    existing = interaction.client.leagues.get(interaction.guild_id, create=False)
+    if existing is not None and not reset:
+        msg = await reload_data(existing)
+        return await reply(interaction, f"Auction already running, data reloaded. {msg}")
+    try:
+        manager = interaction.client.leagues.setup(interaction.guild_id)
+        team_count = len(manager.teams_df)
+        player_count = len(manager.players_df)
+
+        embed = discord.Embed(
+            title=" Auction System Initialized",
+            description=f"The auction manager has been set up successfully with initial data.",
+            color=discord.Color.green()
+        )
+        embed.add_field(name="Teams Loaded", value=f"{team_count} teams found", inline=True)
+        embed.add_field(name="Players Loaded", value=f"{player_count} players found", inline=True)
+
+        await reply(interaction, embed=embed)
+
+    except Exception as e:
+        await reply(interaction, f" **SETUP FAILED:** {e}", ephemeral=True)
+
+
+@auction_command(name="reload_data", description="Reloads player/team data without touching open auctions.", ephemeral=True)
+@admin_only
+async def reload_data_command(interaction: discord.Interaction):
+    """
+    Applies a refreshed OCM spreadsheet export (ratings, wages, new players/clubs) to the running auction.
+    """
+    await defer(interaction, ephemeral=True)
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, "Auction system is not set up. Run `/setup_auction` first.")
+    try:
+        msg = await reload_data(manager)
+    except Exception as e:
+        msg = f" **RELOAD FAILED:** {e}"
+    await reply(interaction, msg)
+
+
+@auction_command(name="auction_mode", description="Open bidding or sealed bids for new listings of a type.", ephemeral=True)
+@admin_only
+@app_commands.describe(
+    type="Regular, Free Loan, Dev Loan or Paid Loan",
+    mode="open, first (sealed, the winner pays his bid) or second (sealed, the winner pays the next best bid)",
+)
+async def auction_mode_command(interaction: discord.Interaction, type: str, mode: str):
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    msg = set_auction_mode(manager, type, mode)
+    await reply(interaction, msg, ephemeral=True)
+
+
+@auction_command(name="list_player", description="Lists a player for auction with a starting bid.")
+@app_commands.describe(
+    player_id="The ID of the player you want to list (e.g., 101)",
+    starting_bid="The minimum starting bid amount (e.g., 500)",
+    type = "Regular,Dev Loan, Paid Loan, Free Loan"
+)
+async def list_player_command(interaction: discord.Interaction, player_id: int, starting_bid: int, type:str):
+    """
+    Lists a player for auction (only listed players can be bid on).
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player to list (the caller's club must own him) ~ int
+    :param bid: the amount of the starting bid ~int
+
+    :returns msg: accordingly if created the bid ~str
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, "❌ Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager)
+    if club_id is None:
+        return
+
+    msg = list_player(manager, player_id, club_id, starting_bid,type)
+    await reply(interaction, msg + suggestion_note(manager, player_id))
+
+
+@auction_command(name="bid", description="Place a new bid on a currently listed player.")
+@app_commands.describe(
+    player_id="The ID of the player you want to bid on (must be listed)",
+    bid_amount="The total amount of the bid",
+    wage="The player's proposed wage component of the bid",
+)
+async def create_bid_command(interaction: discord.Interaction, player_id: int, bid_amount: int,
+                             wage: int):
+    """
+    Attempts to create a bid on a listed player.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player being bid on ~int
+    :param bid_amount: the amount of the bid ~int
+    :param wage: the amount of wage being offered (manual entry for now) ~int
+
+    :returns msg: accordingly if created the bid or if didn't (the msg contains the reason why it didn't) ~str
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager)
+    if club_id is None:
+        return
+
+    msg,watchers = create_bid(manager, player_id, bid_amount, club_id, wage)
+    await reply(interaction, msg + suggestion_note(manager, player_id))
+    # the DMs go out after the reply, they don't count against the interaction deadline
+    if watchers:
+        notify_clubs(interaction.client, manager, watchers, msg)
+
+
+@auction_command(name="bulk_list", description="Lists many of your players at once.")
+@app_commands.describe(
+    type="Regular,Dev Loan, Paid Loan, Free Loan",
+    players="player_id:starting_bid pairs, comma separated (e.g., 101:500000, 102:750000)",
+    file="Optional .csv/.txt with one player_id,starting_bid per line",
+)
+async def bulk_list_command(interaction: discord.Interaction, type: str, players: str = "",
+                            file: discord.Attachment = None):
+    """
+    Lists up to MAX_BULK_ITEMS of the caller's club's players in one transaction (all or nothing).
+
+    :param type: the type of the listings ~str
+    :param players: player_id:starting_bid pairs ~str
+    :param file: attachment with the same pairs, one per line ~discord.Attachment
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager)
+    if club_id is None:
+        return
+
+    text = players
+    if file is not None:
+        text += "\n" + (await file.read()).decode("utf-8", errors="ignore").replace(",", ":")
+    items, errors = parse_bulk_items(text, 2)
+    ok, results = list_players_bulk(manager, club_id, items, type) if items else (False, [])
+    await reply(interaction, format_bulk_results(results, errors))
+
+
+@auction_command(name="bulk_bid", description="Places a package of bids, either all are placed or none.")
+@app_commands.describe(
+    bids="player_id:bid_amount:wage, comma separated (e.g., 101:5000000:20000, 102:750000:9000)",
+)
+async def bulk_bid_command(interaction: discord.Interaction, bids: str):
+    """
+    Places a bid package for the caller's club, budget and wage are checked for the package as a whole.
+
+    :param bids: player_id:bid_amount:wage triples ~str
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager)
+    if club_id is None:
+        return
+
+    items, errors = parse_bulk_items(bids, 3)
+    if errors:
+        return await reply(interaction, format_bulk_results([], errors))
+    ok, results = create_bids_bulk(manager, club_id, items)
+    await reply(interaction, format_bulk_results(results))
+    # one DM per placed bid, like /bid
+    for r in results:
+        if r["ok"] and r["watchers"]:
+            notify_clubs(interaction.client, manager, r["watchers"], r["message"])
+
+
+@auction_command(name="proxy_bid", description="Set a max bid, the bot outbids others for you up to it.", ephemeral=True)
+@app_commands.describe(
+    player_id="The ID of the player you want to bid on (must be listed)",
+    max_amount="The most you are willing to pay",
+    wage="The player's proposed wage component of the bid",
+)
+async def create_proxy_bid_command(interaction: discord.Interaction, player_id: int, max_amount: int,
+                                   wage: int):
+    """
+    Registers a proxy bid, competing proxies are resolved at once (second highest max + increment).
+
+    :param player_id: the ID of the player being bid on ~int
+    :param max_amount: the most the team is willing to pay ~int
+    :param wage: the amount of wage being offered ~int
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager)
+    if club_id is None:
+        return
+
+    msg, watchers, news = create_proxy_bid(manager, player_id, max_amount, club_id, wage)
+    await reply(interaction, msg + suggestion_note(manager, player_id), ephemeral=True)
+    # the teams that lost the lead and the player's watchers, like a /bid
+    if watchers:
+        notify_clubs(interaction.client, manager, watchers, news)
+
+
+@auction_command(name="cancel_proxy", description="Cancels your proxy (max) bid on a player.", ephemeral=True)
+@app_commands.describe(
+    player_id="The ID of the player",
+)
+async def cancel_proxy_bid_command(interaction: discord.Interaction, player_id: int):
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager)
+    if club_id is None:
+        return
+
+    msg = cancel_proxy_bid(manager, player_id, club_id)
+    await reply(interaction, msg, ephemeral=True)
+
+
+@auction_command(name="watch", description="Get a DM for every new bid on a player until his auction ends.", ephemeral=True)
+@app_commands.describe(
+    player_id="The ID of the player",
+    stop="Stop watching him",
+)
+async def watch_command(interaction: discord.Interaction, player_id: int, stop: bool = False):
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager)
+    if club_id is None:
+        return
+
+    msg = watch(manager, player_id, club_id, stop)
+    await reply(interaction, msg, ephemeral=True)
+
+
+@auction_command(name="whatif", description="Checks which of some bids/sales your budget and wage allow, places nothing.", ephemeral=True)
+@app_commands.describe(
+    bids="player_id:bid_amount:wage, comma separated (e.g., 101:5000000:20000, 102:750000:9000)",
+    sales="Your players you'd sell, player_id or player_id:fee, comma separated (e.g., 150, 151:2000000)",
+)
+async def what_if_command(interaction: discord.Interaction, bids: str = "", sales: str = ""):
+    """
+    Projects the caller's budget/wage headroom for every combination of the given bids and sales.
+
+    :param bids: player_id:bid_amount:wage triples ~str
+    :param sales: player_id or player_id:fee items ~str
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager, rate_limit=False)
+    if club_id is None:
+        return
+
+    bid_items, errors = parse_bulk_items(bids, 3)
+    sale_ids, id_errors = parse_bulk_items(",".join(c for c in sales.split(",") if ":" not in c), 1)
+    sale_fees, sale_errors = parse_bulk_items(",".join(c for c in sales.split(",") if ":" in c), 2)
+    errors += id_errors + sale_errors
+    if errors:
+        return await reply(interaction, format_bulk_results([], errors), ephemeral=True)
+    sale_items = [(pid, None) for (pid,) in sale_ids] + sale_fees
+    await reply(interaction, what_if(manager, club_id, bid_items, sale_items), ephemeral=True)
+
+
+@auction_command(name="unlist_player", description="Removes a player from the auction.")
+@app_commands.describe(
+    player_id="The ID of the player to unlist",
+)
+async def unlist_player_command(interaction: discord.Interaction, player_id: int):
+    """
+    Unlists a player (player need to be listed (i think) currently the only way to change player starting bid (don't ask me to find other way pls)
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player who wants to unbid ~int
+    :return msg accordingly if created the bid ~str
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager)
+    if club_id is None:
+        return
+
+    msg = unlist_player(manager, player_id, club_id)
+    await reply(interaction, msg)
+
+
+@auction_command(name="listed_players", description="Shows all players currently available for bidding.")
+async def get_listed_players_command(interaction: discord.Interaction):
+    """
+    Returns a paginated list of all players who are listed in the auction.
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        await reply(interaction, "Auction system is not set up. Run `/setup_auction` first.", ephemeral=True)
+        return
+
+    # cached display cards instead of converting the whole frame to dicts, built once per
+    # league version however many people ask at the same time. A reset starts a new manager
+    # whose versions count from the start again, so the manager is part of the key too
+    listed_players_data = await read_queries.do(
+        ("listed_players", interaction.guild_id, id(manager), manager.version),
+        lambda: manager.render.listing_cards(get_listed_players(manager)))
+
+    if not listed_players_data:
+        await reply(interaction, "No players are currently listed for auction.")
+        return
+
+    # Create an instance of our pagination view and send it
+    view = PaginationView(interaction, listed_players_data, "Currently Listed Players")
+    await view.send_initial_message()
+
+
+@auction_command(name="active_bids", description="Shows all active bids on listed players.")
+async def active_bid_list_command(interaction: discord.Interaction):
+    """
+    Returns a paginated list of all active bids.
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        await reply(interaction, "Auction system is not set up. Run `/setup_auction` first.", ephemeral=True)
+        return
+
+    active_bids = active_bid_list(manager)
+
+    if not active_bids:
+        await reply(interaction, "There are no active bids right now.")
+        return
+
+    # Create an instance of our pagination view and send it
+    view = PaginationView(interaction, active_bids, "Active Bids",
+                          render=lambda b: f"{manager.render.bid_card(b)}\n> Time Left: {b.time_remaining()}")
+    await view.send_initial_message()
+
+
+@auction_command(name="remove_bid", description="Deletes the active bid for a specific player.")
+@admin_only
+@app_commands.describe(
+    player_id="The ID of the player whose bid you want to remove",
+    type ="Regular,Dev Loan, Paid Loan, Free Loan"
+)
+async def remove_bid_command(interaction: discord.Interaction, player_id: int,type: str):
+    """
+    Deletes a bid for a specific player.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player whose bid should be removed ~int
+    :param type: the type of the bid you wish to remove
+    :return: a message confirming the bid removal ~str
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    msg = remove_bid(manager, player_id,type)
+    await reply(interaction, msg)
+
+
+@auction_command(name="history", description="Shows a player's latest auction events with their ids.", ephemeral=True)
+@admin_only
+@app_commands.describe(
+    player_id="The ID of the player",
+)
+async def player_history_command(interaction: discord.Interaction, player_id: int):
+    """
+    Lists the player's recent events (listed, bids, outbids, removals, settlements), the ids go into /undo.
+
+    :param player_id: the ID of the player ~int
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, "Auction system is not set up. Run `/setup_auction` first.", ephemeral=True)
+
+    lines = player_history(manager, player_id)
+    await reply(interaction, "\n".join(lines) if lines else f"No events for player {player_id}.", ephemeral=True)
+
+
+@auction_command(name="undo", description="Takes back one bid, bid removal or settlement by its event id.")
+@admin_only
+@app_commands.describe(
+    event_id="The event's id from /history",
+)
+async def undo_command(interaction: discord.Interaction, event_id: int):
+    """
+    Undoes a single event instead of removing every bid on the player: the bid it outbid comes
+    back (or the player is listed again), a removed bid is reopened, a settlement is refunded.
+
+    :param event_id: the id of the event to undo ~int
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, "Auction system is not set up. Run `/setup_auction` first.", ephemeral=True)
+
+    msg = undo(manager, event_id)
+    await reply(interaction, msg)
+
+
+@auction_command(name="cleanup", description="Finalizes expired auctions right now (the bot also does it by itself).")
+@admin_only
+async def clean_memory_command(interaction: discord.Interaction):
+    """
+    Cleans memory and creates a CSV file of finished auctions (in the real implementation).
+
+    :param manager: the auction manager instance created by setUp() ~class
+
+    :returns status_msg: a message confirming the cleanup ~str
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, "Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    msg = clean_memory(manager)
+    await reply(interaction, msg)
+
+
+
+@auction_command(name="dev_bid", description="Place a new dev loan bid on a currently listed player.")
+@app_commands.describe(
+    player_id="The ID of the player you want to bid on (must be listed)",
+    bid_amount="The total amount of the bid",
+    wage="The player's proposed wage component of the bid",
+)
+async def create_dev_loan_bid_command(interaction: discord.Interaction, player_id: int, bid_amount: int,
+                             wage: int):
+    """
+    Attempts to create a bid on a listed player.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player being bid on ~int
+    :param bid_amount: the amount of the bid ~int
+    :param wage: the amount of wage being offered (manual entry for now) ~int
+
+    :returns msg: accordingly if created the bid or if didn't (the msg contains the reason why it didn't) ~str
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager)
+    if club_id is None:
+        return
+
+    msg,watchers = create_dev_bid(manager, player_id, bid_amount, club_id, wage)
+    await reply(interaction, msg + suggestion_note(manager, player_id))
+    if watchers:
+        notify_clubs(interaction.client, manager, watchers, msg)
+
+@auction_command(name="free_loan_bid", description="Place a new free loan bid on a currently listed player.")
+@app_commands.describe(
+    player_id="The ID of the player you want to bid on (must be listed)",
+    bid_amount="The total amount of the bid",
+    wage="The player's proposed wage component of the bid",
+)
+async def create_free_loan_bid_command(interaction: discord.Interaction, player_id: int, bid_amount: int,
+                             wage: int):
+    """
+    Attempts to create a bid on a listed player.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player being bid on ~int
+    :param bid_amount: the amount of the bid ~int
+    :param wage: the amount of wage being offered (manual entry for now) ~int
+
+    :returns msg: accordingly if created the bid or if didn't (the msg contains the reason why it didn't) ~str
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager)
+    if club_id is None:
+        return
+
+    msg,watchers = create_free_loan_bid(manager, player_id, bid_amount, club_id, wage)
+    await reply(interaction, msg + suggestion_note(manager, player_id))
+    if watchers:
+        notify_clubs(interaction.client, manager, watchers, msg)
+
+
+@auction_command(name="regular_loan_bid", description="Place a new Regular loan bid on a currently listed player.")
+@app_commands.describe(
+    player_id="The ID of the player you want to bid on (must be listed)",
+    bid_amount="The total amount of the bid",
+    wage="The player's proposed wage component of the bid",
+)
+async def create_regular_loan_bid_command(interaction: discord.Interaction, player_id: int, bid_amount: int,
+                             wage: int):
+    """
+    Attempts to create a bid on a listed player.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player being bid on ~int
+    :param bid_amount: the amount of the bid ~int
+    :param wage: the amount of wage being offered (manual entry for now) ~int
+
+    :returns msg: accordingly if created the bid or if didn't (the msg contains the reason why it didn't) ~str
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager)
+    if club_id is None:
+        return
+
+    msg,watchers = create_reg_loan_bid(manager, player_id, bid_amount, club_id, wage)
+    await reply(interaction, msg + suggestion_note(manager, player_id))
+    if watchers:
+        notify_clubs(interaction.client, manager, watchers, msg)
+
+@auction_command(name="info", description="Get Info about your budget and wage")
+async def get_info_command(interaction: discord.Interaction):
+    """
+    Get info about your club's budget and wage
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, " Auction system is not set up. Run `/setup_auction` first.",
+                           ephemeral=True)
+
+    club_id = await caller_club(interaction, manager, rate_limit=False)
+    if club_id is None:
+        return
+
+    summary = get_info(manager, club_id)
+    msg = (f"**{summary['club_name']}**\n"
+           f"Team Budget: {number(summary['budget'])}\nTeam Wage: {number(summary['wage'])}\n"
+           f"Open bids placed: {summary['bids_placed']} | Open bids received: {summary['bids_received']}\n"
+           f"Players listed: {summary['players_listed']}")
+    roster = manager.get_roster(club_id)
+    msg += f"\nSquad (incl. open bids): {roster['squad']} | Loans: {roster['loans']}"
+    await reply(interaction, msg)
+
+
+@auction_command(name="export", description="Exports listings, active bids or club finances as a file.", ephemeral=True)
+@admin_only
+@app_commands.describe(
+    table="listings, active_bids or finances",
+    format="csv, xlsx or parquet",
+)
+async def export_command(interaction: discord.Interaction, table: str, format: str = "csv"):
+    """
+    Uploads one of the league's tables as an attachment, for the OCM spreadsheet.
+
+    :param table: listings, active_bids or finances ~str
+    :param format: csv, xlsx or parquet ~str
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, "Auction system is not set up. Run `/setup_auction` first.", ephemeral=True)
+
+    await defer(interaction, ephemeral=True)
+    ok, msg, path = await export_table(manager, table, format)
+    if not ok:
+        return await reply(interaction, msg, ephemeral=True)
+    try:
+        limit = getattr(interaction.guild, "filesize_limit", 10 * 1024 * 1024)
+        if os.path.getsize(path) > limit:
+            return await reply(interaction, f"{msg} That's over the upload limit, try csv or parquet.", ephemeral=True)
+        await reply(interaction, msg, file=discord.File(path, filename=f"{table}.{format}"), ephemeral=True)
+    finally:
+        os.remove(path)
+
+
+@auction_command(name="live_board", description="Posts a pinned auction board here that updates itself.", ephemeral=True)
+@admin_only
+async def live_board_command(interaction: discord.Interaction):
+    """
+    Posts the league's live board in this channel (replacing the old one), edited at most every few seconds.
+    """
+    manager = get_manager(interaction)
+    if not manager:
+        return await reply(interaction, "Auction system is not set up. Run `/setup_auction` first.", ephemeral=True)
+
+    message = await interaction.channel.send("Live auction board loading...")
+    try:
+        await message.pin()
+    except discord.HTTPException as e:
+        print(f"Could not pin the live board: {e}")
+    manager.live_board = (message.channel.id, message.id)
+    manager._touch()
+    start_live_board(interaction.client, interaction.guild_id, manager, message)
+    await reply(interaction, "Live board posted, it updates itself when bids change.", ephemeral=True)
+
+
+@auction_command(name="command_stats", description="Shows how long the bot's commands take.", ephemeral=True)
+@admin_only
+async def command_stats_command(interaction: discord.Interaction):
+    """
+    Latency per command from the middleware: calls, p50/p90 and how often it had to defer.
+    """
+    lines = [f"`/{name}` calls: {t.calls} | p50 {t.percentile(0.5) * 1000:.0f} ms | "
+             f"p90 {t.percentile(0.9) * 1000:.0f} ms | deferred {t.deferred}"
+             for name, t in sorted(command_timings.items())]
+    lines.append(f"Rate limited: {user_limiter.rejected} by user, {club_limiter.rejected} by club | "
+                 f"shared read queries: {read_queries.shared}/{read_queries.shared + read_queries.computed}")
+    m = interaction.client.maintenance.metrics
+    lines.append(f"Expiry worker: {m['finalized']} bids finalized in {m['passes']} passes | backlog {m['backlog']} | "
+                 f"last pass {m['last_runtime'] * 1000:.1f} ms (max {m['max_runtime'] * 1000:.1f} ms)")
+    await reply(interaction, "\n".join(lines), ephemeral=True)
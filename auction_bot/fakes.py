@@ -0,0 +1,227 @@
+"""
+An offline stand-in for the parts of discord the commands touch: interactions (response,
+followup, extras), users and their DMs, channels/messages and bot.fetch_user. Every call
+that would go over the network waits a simulated API latency and, like discord.py, sleeps
+out a rate limit instead of failing, so the real command path can be driven and timed
+without a server. Nothing here opens a connection.
+"""
+import asyncio
+import itertools
+import random
+import time
+from collections import defaultdict
+
+from RateLimiter import TokenBucket
+from auction_bot.middleware import on_app_command_error
+
+INTERACTION_DEADLINE = 3.0  # discord drops an interaction that isn't answered within this
+
+
+class FakeAPI:
+    """
+    The simulated discord HTTP API: every request waits latency +- jitter seconds and
+    takes a token from the global bucket (rate requests a second, burst back to back).
+    Interaction callbacks aren't bound by the global limit on discord either.
+    """
+
+    def __init__(self, latency=0.05, jitter=0.0, rate=50.0, burst=50, seed=0):
+        """
+        :param latency: seconds one request takes ~float
+        :param jitter: +- seconds added at random to every request ~float
+        :param rate: requests a second before the global rate limit kicks in, None = unlimited ~float
+        :param burst: requests allowed back to back ~int
+        :param seed: seed of the jitter, runs with the same seed wait the same ~int
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.random = random.Random(seed)
+        self.requests = defaultdict(int)  # route -> requests made
+        self.rate_limited = 0  # requests that had to wait for the bucket
+        self.waited = 0.0  # seconds spent waiting for the bucket
+
+    async def request(self, route, global_limit=True):
+        if global_limit and self.bucket is not None:
+            retry_after = self.bucket.take()
+            while retry_after:
+                self.rate_limited += 1
+                self.waited += retry_after
+                await asyncio.sleep(retry_after)
+                retry_after = self.bucket.take()
+        self.requests[route] += 1
+        delay = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(delay, 0))
+
+
+class FakeMessage:
+    _ids = itertools.count(1)
+
+    def __init__(self, api, channel, content=None, **kwargs):
+        self.api = api
+        self.channel = channel
+        self.id = next(self._ids)
+        self.content = content
+        self.kwargs = kwargs
+        self.edits = 0
+
+    async def edit(self, content=None, **kwargs):
+        await self.api.request("edit_message")
+        self.content, self.kwargs = content, kwargs
+        self.edits += 1
+
+    async def pin(self):
+        await self.api.request("pin_message")
+
+
+class FakeChannel:
+    def __init__(self, api, channel_id):
+        self.api = api
+        self.id = channel_id
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        await self.api.request("send_message")
+        message = FakeMessage(self.api, self, content, **kwargs)
+        self.messages.append(message)
+        return message
+
+    def get_partial_message(self, message_id):
+        return next((m for m in self.messages if m.id == message_id), None)
+
+
+class FakeUser:
+    def __init__(self, api, user_id):
+        self.api = api
+        self.id = user_id
+        self.name = f"user{user_id}"
+        self.dms = []  # what the bot sent this user
+
+    async def send(self, content=None, **kwargs):
+        await self.api.request("dm")
+        self.dms.append(content)
+
+
+class FakeResponse:
+    """interaction.response: one answer (message or defer) per interaction."""
+
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    def _answer(self):
+        if self._done:
+            raise RuntimeError("This interaction has already been responded to before")
+        self._done = True
+        self.interaction.answered_after = time.perf_counter() - self.interaction.created
+
+    async def defer(self, ephemeral=False, thinking=False):
+        self._answer()
+        self.interaction.thinking = ephemeral
+        await self.interaction.api.request("interaction_callback", global_limit=False)
+
+    async def send_message(self, content=None, **kwargs):
+        self._answer()
+        await self.interaction.api.request("interaction_callback", global_limit=False)
+        self.interaction.sent.append(content if content is not None else kwargs.get("embed"))
+        self.interaction.private.append(kwargs.get("ephemeral", False))
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        await self.interaction.api.request("followup", global_limit=False)
+        self.interaction.sent.append(content if content is not None else kwargs.get("embed"))
+        # the first followup replaces the "thinking..." message and keeps the deferral's visibility
+        thinking, self.interaction.thinking = self.interaction.thinking, None
+        self.interaction.private.append(kwargs.get("ephemeral", False) if thinking is None else thinking)
+
+
+class FakeInteraction:
+    """
+    What a slash command gets called with. sent collects every reply (text or embed) and
+    private whether only the caller saw it, answered_after is how long the first answer
+    took, None while there's none.
+    """
+
+    def __init__(self, client, user_id, guild_id, channel_id=1, command=None):
+        self.client = client
+        self.api = client.api
+        self.user = client.user_for(user_id)
+        self.guild_id = guild_id
+        self.channel = client.channel_for(channel_id)
+        self.command = command
+        self.extras = {}
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+        self.created = time.perf_counter()
+        self.answered_after = None
+        self.sent = []
+        self.private = []
+        self.thinking = None  # visibility of a deferral no followup answered yet
+
+    async def original_response(self):
+        await self.api.request("original_response", global_limit=False)
+        return FakeMessage(self.api, self.channel, self.sent[0] if self.sent else None)
+
+    @property
+    def expired(self):
+        """True if discord would have dropped the interaction ~bool"""
+        return self.answered_after is None or self.answered_after > INTERACTION_DEADLINE
+
+
+class FakeClient:
+    """
+    Enough of AuctionBot for the commands: leagues, boards, maintenance and the discord
+    lookups (fetch_user, get_channel) answered from the fakes above.
+    """
+
+    def __init__(self, leagues, api=None, maintenance=None):
+        """
+        :param leagues: the leagues the commands run against ~LeagueRegistry
+        :param api: the simulated API, a FakeAPI with its defaults if not given ~FakeAPI
+        :param maintenance: the expiry worker /command_stats reads ~MaintenanceWorker
+        """
+        self.leagues = leagues
+        self.api = api or FakeAPI()
+        self.maintenance = maintenance
+        self.boards = {}
+        self.users = {}
+        self.channels = {}
+
+    def user_for(self, user_id):
+        if user_id not in self.users:
+            self.users[user_id] = FakeUser(self.api, user_id)
+        return self.users[user_id]
+
+    def channel_for(self, channel_id):
+        if channel_id not in self.channels:
+            self.channels[channel_id] = FakeChannel(self.api, channel_id)
+        return self.channels[channel_id]
+
+    def get_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+    async def fetch_user(self, user_id):
+        await self.api.request("fetch_user")
+        return self.user_for(user_id)
+
+    async def invoke(self, command, user_id, guild_id, **params):
+        """
+        Runs one slash command the way discord would call it (checks like admin_only aside),
+        errors go to the same handler the bot's tree uses.
+
+        :param command: an app command from middleware.COMMANDS ~app_commands.Command
+        :param params: the command's options ~kwargs
+        :returns interaction: the finished interaction, its replies in .sent ~FakeInteraction
+        """
+        interaction = FakeInteraction(self, user_id, guild_id, command=command)
+        try:
+            await command.callback(interaction, **params)
+        except Exception as e:
+            await on_app_command_error(interaction, e)
+        return interaction
@@ -0,0 +1,163 @@
+import asyncio
+import functools
+import os
+import time
+from collections import defaultdict, deque
+
+import discord
+from discord import app_commands
+
+from RateLimiter import RateLimiter, SingleFlight
+
+COMMANDS = []  # every app command made by auction_command, in definition order
+
+
+# --- Command middleware: timing, automatic deferral and replies ---
+
+# discord drops an interaction that isn't answered within 3 seconds, a command that may take
+# longer than this is deferred ("bot is thinking...") and answered through followups instead
+LATENCY_BUDGET = 1.5
+
+
+class CommandTiming:
+    """Recent latencies of one command, used to decide whether to defer up front."""
+
+    def __init__(self, keep=50):
+        self.latencies = deque(maxlen=keep)
+        self.calls = 0
+        self.deferred = 0
+
+    def record(self, seconds, deferred):
+        self.latencies.append(seconds)
+        self.calls += 1
+        self.deferred += bool(deferred)
+
+    def percentile(self, q):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+command_timings = defaultdict(CommandTiming)  # command name -> CommandTiming
+
+# every command takes a token from its user's bucket, commands acting for a club
+# (bids, listings) also take one from that club's once caller_club() resolved it
+user_limiter = RateLimiter(rate=0.5, burst=5)  # 5 back to back, then one every 2s
+club_limiter = RateLimiter(rate=0.2, burst=5)  # one every 5s per club once the burst is used
+read_queries = SingleFlight()  # identical read queries (same guild + manager.version) share one result
+
+
+async def defer(interaction: discord.Interaction, ephemeral: bool = False):
+    """Defers the interaction once, safe to call from the watchdog and the command at the same time."""
+    async with interaction.extras.setdefault("reply_lock", asyncio.Lock()):
+        if not interaction.response.is_done():
+            await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+            interaction.extras["deferred"] = time.perf_counter() - interaction.extras.get("started", 0)
+
+
+async def reply(interaction: discord.Interaction, content: str = None, **kwargs):
+    """
+    Answers an interaction: the first reply goes through the response, anything after a
+    deferral (or a first reply) goes out as a followup.
+    """
+    async with interaction.extras.setdefault("reply_lock", asyncio.Lock()):
+        if interaction.response.is_done():
+            return await interaction.followup.send(content, **kwargs)
+        return await interaction.response.send_message(content, **kwargs)
+
+
+async def _defer_when_over_budget(interaction: discord.Interaction, seconds: float, ephemeral: bool):
+    await asyncio.sleep(max(seconds, 0))
+    await defer(interaction, ephemeral=ephemeral)
+
+
+async def _rate_limited(interaction: discord.Interaction):
+    """
+    Takes the user's token, answering straight away when there is none.
+    Runs before anything else so a rejected call never gets near the league.
+
+    :returns rejected: ~bool
+    """
+    retry_after = user_limiter.hit(interaction.user.id)
+    if not retry_after:
+        return False
+    await interaction.response.send_message(f"Slow down! Try again in {retry_after:.0f}s.", ephemeral=True)
+    return True
+
+
+def auction_command(ephemeral=False, **command_kwargs):
+    """
+    Registers a slash command (same arguments as bot.tree.command) wrapped in the middleware:
+    - rate limits the user
+    - keeps the guild's league loaded while the command runs (LeagueRegistry.using)
+    - defers straight away if the command's recent p90 latency is over LATENCY_BUDGET,
+      otherwise a watchdog defers it once the budget runs out while it's still awaiting
+    - records the latency into command_timings and interaction.extras["timing"]
+
+    ephemeral=True is for commands that answer only the caller: discord shows the first
+    followup with the visibility of the deferral, so the middleware defers privately too.
+    """
+    def decorator(func):
+        name = command_kwargs.get("name", func.__name__)
+
+        @functools.wraps(func)
+        async def wrapper(interaction: discord.Interaction, *args, **kwargs):
+            if await _rate_limited(interaction):
+                return None
+            start = time.perf_counter()
+            interaction.extras["started"] = start
+            timing = command_timings[name]
+            if timing.percentile(0.9) > LATENCY_BUDGET:
+                await defer(interaction, ephemeral=ephemeral)
+            watchdog = asyncio.create_task(_defer_when_over_budget(
+                interaction, LATENCY_BUDGET - (time.perf_counter() - start), ephemeral))
+            try:
+                with interaction.client.leagues.using(interaction.guild_id):
+                    return await func(interaction, *args, **kwargs)
+            finally:
+                watchdog.cancel()
+                elapsed = time.perf_counter() - start
+                deferred = interaction.extras.get("deferred")
+                timing.record(elapsed, deferred is not None)
+                interaction.extras["timing"] = {"command": name, "seconds": elapsed, "deferred_after": deferred}
+                if elapsed > LATENCY_BUDGET:
+                    print(f"/{name} took {elapsed:.2f}s (deferred after {deferred if deferred is None else round(deferred, 2)}s)")
+
+        command = app_commands.command(**command_kwargs)(wrapper)
+        COMMANDS.append(command)  # AuctionBot adds them to its tree in setup_hook
+        return command
+    return decorator
+
+
+ADMIN_ROLE = os.getenv("AUCTION_ADMIN_ROLE", "Auction Admin")
+# put under @auction_command, only members with the league's admin role can run the command
+admin_only = app_commands.checks.has_any_role(ADMIN_ROLE)
+
+
+async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
+    if isinstance(error, app_commands.CheckFailure):
+        return await reply(interaction, f"Nice try, Ban PC! This needs the `{ADMIN_ROLE}` role.", ephemeral=True)
+    print(f"/{interaction.command.name if interaction.command else '?'} failed: {error!r}")
+    await reply(interaction, "Something went wrong, try again later.", ephemeral=True)
+
+
+async def caller_club(interaction: discord.Interaction, manager, rate_limit: bool = True):
+    """
+    The club the calling user manages, from the league's identity map (teams_df.discord_id).
+    Answers the interaction itself when there is none, or when the club is rate limited.
+
+    :param manager: the league's auction manager ~class
+    :param rate_limit: take a token from the club's bucket ~bool
+
+    :returns club_id: ~int or None
+    """
+    club_id = manager.club_for(interaction.user.id)
+    if club_id is None:
+        await reply(interaction, "You're not registered as a club manager in this league.", ephemeral=True)
+        return None
+    retry_after = club_limiter.hit((interaction.guild_id, club_id)) if rate_limit else 0
+    if retry_after:
+        await reply(interaction, f"Slow down! Try again in {retry_after:.0f}s.", ephemeral=True)
+        return None
+    return club_id
@@ -0,0 +1,28 @@
+import sys
+import time
+
+PROCESS_START = time.perf_counter()  # as early as the package gets imported
+
+
+class StartupProfile:
+    """
+    Time stamps of the startup phases (imports, bot built, login, ready...), printed once
+    the bot is ready so slow starts can be traced to a phase.
+    """
+
+    def __init__(self, start=None):
+        self.start = PROCESS_START if start is None else start
+        self.marks = []  # (phase, seconds since start, modules loaded)
+
+    def mark(self, phase):
+        self.marks.append((phase, time.perf_counter() - self.start, len(sys.modules)))
+
+    def report(self):
+        lines = ["Startup profile:"]
+        previous = 0.0
+        for phase, at, modules in self.marks:
+            lines.append(f"  {phase:<20} {at * 1000:8.1f} ms  (+{(at - previous) * 1000:7.1f} ms, {modules} modules)")
+            previous = at
+        heavy = [m for m in ("pandas", "numpy", "Data_loader") if m in sys.modules]
+        lines.append(f"  heavy modules loaded: {', '.join(heavy) or 'none'}")
+        return "\n".join(lines)
@@ -0,0 +1,453 @@
+"""
+The auction's command logic as plain functions of a manager: no discord in here, so they can
+be called (and benchmarked) without a bot or a connection.
+"""
+import asyncio
+import os
+import tempfile
+
+from RenderCache import number
+
+
+def load_data():
+    """
+    Loads the player and team data files.
+
+    :returns players_df, teams_df: ~DataFrame, DataFrame
+    """
+    from Data_loader import data_loader  # reads the OCM files, only needed once a league is set up
+    try:
+        players_df_loaded, teams_df_loaded = data_loader()
+    except FileNotFoundError as e:
+        raise Exception(f"Setup Failed: Could not find required CSV file: {e}. Ensure all data files are present.")
+
+    if 'teams' in teams_df_loaded.columns:
+        teams_df_loaded = teams_df_loaded.rename(columns={"teams": "team_name"})
+    return players_df_loaded, teams_df_loaded
+
+
+def setUp():
+    """
+    Initializes the auction system by loading player and team data and creating the AuctionManager.
+
+    :returns manager: the initialized AuctionManager instance ~class
+    """
+    from AuctionManager import AuctionManager
+    players_df_loaded, teams_df_loaded = load_data()
+    manager = AuctionManager(teams_df_loaded, players_df_loaded)
+    return manager
+
+
+async def reload_data(manager, attempts: int = 3):
+    """
+    Re-reads the data files and applies only the changed rows to a running auction, open bids,
+    listings and budgets are kept. Loading and diffing run in a worker thread, the swap itself
+    happens on the event loop so commands never see half-loaded tables.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param attempts: how often to retry if bids came in while diffing ~int
+    :returns msg: what changed ~str
+    """
+    players_df_loaded, teams_df_loaded = await asyncio.to_thread(load_data)
+    msg = "Reload failed."
+    for _ in range(attempts):
+        plan = await asyncio.to_thread(manager.prepare_reload, players_df_loaded, teams_df_loaded)
+        ok, msg = manager.apply_reload(plan)
+        if ok:
+            break
+    return msg
+
+
+def create_bid(manager, player_id: int, bid_amount: int, bidding_team: int, wage: int):
+    """
+    Attempts to create a bid on a listed player.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player being bid on ~int
+    :param bid_amount: the amount of the bid ~int
+    :param bidding_team: the ID of the team placing the bid (e.g., team ID or password) ~int
+    :param wage: the amount of wage being offered (manual entry for now) ~int
+
+    :returns msg, watchers: accordingly if created the bid or if didn't (the msg contains the reason why it didn't),
+        and the clubs to DM about the new bid ~str, list
+    """
+    bid,msg,watchers  = manager.create_bid(player_id, bid_amount, wage,bidding_team)
+    if bid is not None:
+        msg, watchers = answer_proxies(manager, player_id, bidding_team, msg, watchers)
+    return msg,watchers
+
+
+def answer_proxies(manager, player_id: int, bidding_team: int, msg: str, watchers: list):
+    """
+    Lets the standing proxy bids on a player answer a bid that was just placed.
+
+    :returns msg, watchers: the bid's message and clubs to DM, with the proxies' outcome added ~str, list
+    """
+    if player_id not in manager.proxy_bids:
+        return msg, watchers
+    proxy_bid, proxy_msg, notify = manager.resolve_proxy_bids(player_id)
+    if proxy_bid is not None:
+        msg += f"\nOutbid straight away by a proxy bid: {proxy_msg}"
+    return msg, list(dict.fromkeys(c for c in watchers + notify if c != bidding_team))
+
+
+def create_proxy_bid(manager, player_id: int, max_amount: int, bidding_team: int, wage: int):
+    """
+    Registers a proxy (max) bid, the bot keeps the team on top up to max_amount.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player being bid on ~int
+    :param max_amount: the most the team is willing to pay ~int
+    :param bidding_team: the ID of the team placing the bid ~int
+    :param wage: the amount of wage being offered ~int
+
+    :returns msg, watchers, news: the result message, the clubs to DM (teams that lost the lead and
+        the player's watchers) and what to tell them ~str, list, str
+    """
+    _, msg, watchers = manager.place_proxy_bid(player_id, max_amount, wage, bidding_team)
+    leader = manager.get_leading_bid(player_id)
+    # the caller's max stays private, the others only hear who leads now
+    news = manager.render.bid_message(player_id, leader.bidding_team) if leader is not None else msg
+    return msg, watchers, news
+
+
+def cancel_proxy_bid(manager, player_id: int, bidding_team: int):
+    """
+    Cancels a team's proxy bid, the bid already placed for them stays.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player ~int
+    :param bidding_team: the ID of the team that registered the proxy ~int
+    :returns msg: ~str
+    """
+    _, msg = manager.cancel_proxy_bid(player_id, bidding_team)
+    return msg
+
+
+def list_player(manager, player_id: int, team_id: int, bid: int,typeo: str):
+    """
+    Lists a player for auction (only listed players can be bid on).
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player to list ~ int
+    :param team_id: the ID of the team listing the player ~int
+    :param bid: the amount of the starting bid ~int
+    :param typeo: the type of the starting bid ~str (Regular,Dev Loan, Paid Loan, Free Loan)
+    :returns msg: accordingly if created the bid ~str
+    """
+    _, msg = manager.list_player(player_id, team_id, bid,typeo)
+    return msg
+
+
+def parse_bulk_items(text: str, fields: int):
+    """
+    Parses a comma (or newline) separated list of colon separated numbers,
+    e.g. "101:500000, 102:750000" -> [(101, 500000), (102, 750000)].
+
+    :param text: the raw text (from the command or an attached file) ~str
+    :param fields: how many numbers each item must have ~int
+    :returns items, errors: parsed tuples and the chunks that couldn't be read ~list, list
+    """
+    items, errors = [], []
+    for chunk in text.replace("\n", ",").split(","):
+        chunk = chunk.strip()
+        if not chunk or chunk.lower().startswith("player_id"):  # skip blanks and a csv header
+            continue
+        parts = [p.strip().replace("_", "") for p in chunk.replace(";", ":").split(":")]
+        if len(parts) != fields or not all(p.isdigit() for p in parts):
+            errors.append(chunk)
+            continue
+        items.append(tuple(int(p) for p in parts))
+    return items, errors
+
+
+def format_bulk_results(results, errors=()):
+    """Turns the per-item results of a bulk call into one message ~str"""
+    lines = [f"{'✅' if r['ok'] else '❌'} {r['message']}" for r in results]
+    lines += [f"❌ could not read `{e}`" for e in errors]
+    return "\n".join(lines) or "Nothing to do."
+
+
+def list_players_bulk(manager, team_id: int, items: list, typeo: str):
+    """
+    Lists many players of one team in one go.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param team_id: the ID of the team listing the players ~int
+    :param items: (player_id, starting_bid) tuples ~list
+    :param typeo: the type of the listings ~str (Regular,Dev Loan, Paid Loan, Free Loan)
+    :returns ok, results: ~bool, list of dicts
+    """
+    return manager.list_players_bulk([(pid, team_id, bid, typeo) for pid, bid in items])
+
+
+def create_bids_bulk(manager, bidding_team: int, items: list):
+    """
+    Places a package of bids for one team, all or nothing. Once the package is placed every bid
+    goes through the same proxy answer as a /bid.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param bidding_team: the ID of the team placing the bids ~int
+    :param items: (player_id, bid_amount, wage) tuples ~list
+    :returns ok, results: one dict per item, "watchers" are the clubs to DM "message" ~bool, list of dicts
+    """
+    ok, results = manager.create_bids_bulk(bidding_team, items)
+    for r in results:
+        if r["ok"]:
+            r["message"], r["watchers"] = answer_proxies(manager, r["player_id"], bidding_team,
+                                                         r["message"], r["watchers"])
+    return ok, results
+
+
+def what_if(manager, club_id: int, bids: list, sales: list):
+    """
+    Checks a basket of hypothetical bids and sales for a club without placing anything.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param club_id: the club asking ~int
+    :param bids: (player_id, bid_amount, wage) tuples ~list
+    :param sales: (player_id, fee) tuples, fee None = the listing's starting bid ~list
+    :returns msg: the projection and the baskets that fit ~str
+    """
+    ok, report = manager.what_if(club_id, bids, sales)
+    if not ok:
+        return report
+    items = report["items"]
+    names = [f"{'bid' if i['kind'] == 'bid' else 'sell'} {manager.render.player_name(i['player_id'])}" for i in items]
+    lines = [f"Now: budget £{number(report['budget'])} | wage £{number(report['wage'])}"]
+    for name, item in zip(names, items):
+        if item["ok"]:
+            lines.append(f"✅ {name}: budget {item['budget']:+,} | wage {item['wage']:+,}")
+        else:
+            lines.append(f"❌ {name}: {item['message']}")
+    everything = report["all"]
+    lines.append(f"All valid items together: budget £{number(everything['budget'])} | "
+                 f"wage £{number(everything['wage'])} -> {'fits' if everything['feasible'] else 'does NOT fit'}")
+    if not everything["feasible"]:
+        lines.append(f"{report['feasible']} combinations fit, the biggest ones:")
+        for basket in report["best"][:5]:
+            lines.append("> " + (", ".join(names[i] for i in basket) or "nothing"))
+    return "\n".join(lines)
+
+
+def suggestion_note(manager, player_id: int):
+    """The player's precomputed market value for command replies, empty before the first fit ~str"""
+    suggestion = manager.valuation.suggest(player_id)
+    if suggestion is None:
+        return ""
+    fee, wage = suggestion
+    return f"\n> Suggested: fee ~£{number(fee)} | wage ~£{number(wage)}"
+
+
+def unlist_player(manager, player_id: int, team_id: int):
+    """
+    Unlists a player. Currently, the main way to change a player's starting bid.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player to unlist ~int
+    :param team_id: the ID of the team unlisting the player ~int
+
+    :returns msg: accordingly if the player was unlisted ~str
+    """
+    _, msg = manager.unlist_player(player_id, team_id)
+    return msg
+
+
+def get_listed_players(manager):
+    """
+    Returns a list of all players who are currently listed in the auction.
+
+    :param manager: the auction manager instance created by setUp() ~class
+
+    :returns list of players: who are listed in the auction manager ~list of dicts
+    """
+    lst = manager.get_listed_players()
+    print(lst)
+    return lst
+
+
+def clean_memory(manager):
+    """
+    Cleans up memory by removing expired auctions and creates a CSV file of finished auctions (in the real implementation).
+
+    :param manager: the auction manager instance created by setUp() ~class
+
+    :returns status_msg: a message confirming the cleanup ~str
+    """
+    manager.cleanup_expired()
+    return " **Cleanup Complete:** Expired auctions have been processed and memory has been reset."
+
+
+def active_bid_list(manager):
+    """
+    Returns a list of all active bids on currently listed players.
+
+    :param manager: the auction manager instance created by setUp() ~class
+
+    :returns list of active bids: ~list of dicts
+    """
+    lst = manager.get_active_bids()
+    print(f"Active bids {lst}")
+    return lst
+
+
+def remove_bid(manager, player_id: int,typeo: str):
+    """
+    Deletes the active bid for a specific player.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player whose bid should be removed ~int
+    :param typeo: the type of the bid should be removed ~str
+    :returns msg: a message confirming the bid removal ~str
+    """
+    manager.remove_bid(player_id, typeo)
+    return f"Player {player_id} removed bid {typeo}"
+
+def create_dev_bid(manager, player_id: int, bid_amount: int, bidding_team: int, wage: int):
+    """
+    Attempts to create a bid on a listed player.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player being bid on ~int
+    :param bid_amount: the amount of the bid ~int
+    :param bidding_team: the ID of the team placing the bid (e.g., team ID or password) ~int
+    :param wage: the amount of wage being offered (manual entry for now) ~int
+
+    :returns msg, watchers: accordingly if created the bid or if didn't (the msg contains the reason why it didn't),
+        and the clubs to DM about the new bid ~str, list
+    """
+    bid, msg = manager.dev_loan_bid(player_id, bid_amount, wage,bidding_team)
+    # dev_loan_bid returns False on most refusals, None on the rest
+    return msg, manager.watchers_to_notify(player_id, bidding_team) if bid else None
+
+def create_free_loan_bid(manager, player_id: int, bid_amount: int, bidding_team: int, wage: int):
+    """
+    Attempts to create a bid on a listed player.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player being bid on ~int
+    :param bid_amount: the amount of the bid ~int
+    :param bidding_team: the ID of the team placing the bid (e.g., team ID or password) ~int
+    :param wage: the amount of wage being offered (manual entry for now) ~int
+
+    :returns msg, watchers: accordingly if created the bid or if didn't (the msg contains the reason why it didn't),
+        and the clubs to DM about the new bid ~str, list
+    """
+    _, msg,watchers = manager.create_free_loan_bid(player_id, bid_amount, wage,bidding_team)
+    return msg,watchers
+
+def create_reg_loan_bid(manager, player_id: int, bid_amount: int, bidding_team: int, wage: int):
+    """
+    Attempts to create a bid on a listed player.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player being bid on ~int
+    :param bid_amount: the amount of the bid ~int
+    :param bidding_team: the ID of the team placing the bid (e.g., team ID or password) ~int
+    :param wage: the amount of wage being offered (manual entry for now) ~int
+
+    :returns msg, watchers: accordingly if created the bid or if didn't (the msg contains the reason why it didn't),
+        and the clubs to DM about the new bid ~str, list
+    """
+    _, msg,watchers = manager.create_reg_loan_bid(player_id, bid_amount, wage,bidding_team)
+    return msg,watchers
+
+def get_info(manager,team_id):
+    """
+    Returns the cached summary of a team (budget, wage, open bids, listed players).
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param team_id: the club_id of the team ~int
+    :returns summary: ~dict or None if the team doesn't exist
+    """
+    return manager.get_team_summary(team_id)
+
+
+def set_auction_mode(manager, typeo: str, mode: str):
+    """
+    Switches a listing type between open bidding and sealed bids (first or second price).
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param typeo: Regular, Free Loan, Dev Loan or Paid Loan ~str
+    :param mode: open, first or second ~str
+    :returns msg: ~str
+    """
+    _, msg = manager.set_auction_mode(typeo, mode)
+    return msg
+
+
+def watch(manager, player_id: int, club_id: int, stop: bool = False):
+    """
+    Subscribes a club to DMs about every new bid on a player until his auction ends.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player to watch ~int
+    :param club_id: the club that wants the DMs ~int
+    :param stop: unsubscribe instead ~bool
+    :returns msg: ~str
+    """
+    _, msg = manager.watch(player_id, club_id, stop)
+    return msg
+
+
+def undo(manager, event_id: int):
+    """
+    Takes back a bid, an admin's bid removal or a settlement by its event id (see /history).
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param event_id: the id of the event to undo ~int
+    :returns msg: what was undone and replayed, or why it couldn't be ~str
+    """
+    _, msg = manager.undo(event_id)
+    return msg
+
+
+def player_history(manager, player_id: int, limit: int = 15):
+    """
+    The player's latest events with their ids, for /undo.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param player_id: the ID of the player ~int
+    :param limit: how many events to show ~int
+    :returns lines: one line per event, oldest first ~list
+    """
+    lines = []
+    for e in manager.events.for_player(player_id)[-limit:]:
+        line = f"`#{e.id}` {e.time:%d/%m %H:%M} **{e.kind}**"
+        if e.club_id is not None:
+            line += f" {manager.render.club_name(e.club_id)}"
+        if "bid" in e.data:
+            line += f" {number(e.data['bid'])} ({e.data['type']})"
+        if "undoes" in e.data:
+            line += f" of #{e.data['undoes']}"
+        lines.append(line)
+    return lines
+
+
+async def export_table(manager, table: str, fmt: str, attempts: int = 3):
+    """
+    Streams a league table (listings, active_bids, finances) into a csv/xlsx/parquet file in a
+    worker thread, the rows are read a chunk at a time so memory stays flat whatever the size.
+    The thread works off a snapshot taken here on the loop, listings are written again if the
+    league changed meanwhile.
+
+    :param manager: the auction manager instance created by setUp() ~class
+    :param table: listings, active_bids or finances ~str
+    :param fmt: csv, xlsx or parquet ~str
+    :param attempts: how often to write the listings again if the league changed while writing ~int
+    :returns ok, msg, path: the file to upload (delete it once sent) ~bool, str, str
+    """
+    from Exporters import LIVE_TABLES, export, snapshot  # numpy only loads once someone exports
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}", prefix=f"{table}_")
+    os.close(fd)
+    ok, msg = False, "The league kept changing during the export, try again."
+    for _ in range(attempts):
+        snap = snapshot(manager)
+        ok, msg = await asyncio.to_thread(export, manager, table, fmt, path, snap)
+        if not ok or table not in LIVE_TABLES or manager.version == snap["version"]:
+            break
+        ok, msg = False, "The league kept changing during the export, try again."
+    if not ok:
+        os.remove(path)
+        return False, msg, None
+    return True, msg, path
@@ -0,0 +1,69 @@
+import math
+
+import discord
+
+from auction_bot.middleware import reply
+
+
+class PaginationView(discord.ui.View):
+    """A class to create paginated embeds with interactive buttons."""
+    def __init__(self, interaction: discord.Interaction, data: list, title: str, items_per_page: int = 5,
+                 render=str):
+        super().__init__(timeout=180)  # View times out after 180 seconds of inactivity
+        self.interaction = interaction
+        self.data = data
+        self.title = title
+        self.render = render  # turns one item into its text, only called for the items on the page
+        self.items_per_page = items_per_page
+        self.current_page = 0
+        # Calculate the total number of pages needed
+        self.total_pages = math.ceil(len(self.data) / self.items_per_page)
+
+    async def send_initial_message(self):
+        """Sends the first page of the embed."""
+        self.update_buttons()
+        embed = self.create_embed()
+
+        await reply(self.interaction, embed=embed, view=self)
+        self.message = await self.interaction.original_response()
+
+    def create_embed(self) -> discord.Embed:
+
+        start_index = self.current_page * self.items_per_page
+        end_index = start_index + self.items_per_page
+        page_data = self.data[start_index:end_index]
+
+        embed = discord.Embed(
+            title=f"{self.title} (Page {self.current_page + 1}/{self.total_pages})",
+            color=discord.Color.blue()
+        )
+
+        if not page_data:
+            embed.description = "There are no items on this page."
+        else:
+            embed.description = "\n\n".join(self.render(item) for item in page_data)
+
+        embed.set_footer(text=f"Showing items {start_index + 1}-{min(end_index, len(self.data))} of {len(self.data)}")
+        return embed
+
+    def update_buttons(self):
+        """Disables/enables buttons based on the current page."""
+        # The first child is the 'Previous' button, the second is 'Next'
+        self.children[0].disabled = self.current_page == 0
+        self.children[1].disabled = self.current_page >= self.total_pages - 1
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Callback for the 'Previous' button."""
+        self.current_page -= 1
+        self.update_buttons()
+        embed = self.create_embed()
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Callback for the 'Next' button."""
+        self.current_page += 1
+        self.update_buttons()
+        embed = self.create_embed()
+        await interaction.response.edit_message(embed=embed, view=self)
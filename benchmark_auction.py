@@ -0,0 +1,195 @@
+"""
+Micro-benchmarks of the AuctionManager calls the bot makes all the time (can_bid_be_placed,
+create_bid, remove_bid, get_listed_players, get_active_bids, cleanup_expired, expire_due)
+on synthetic leagues of a given number of players, clubs and open bids. Every player is
+listed, the open bids sit on the first players and each timed call works on players that
+no other call touched, so the league keeps its size from round to round.
+
+Results go to a JSON file (microseconds per call, median and best of the rounds). Given a
+baseline file from an earlier run, every call that got slower than the baseline by more
+than the threshold is reported and the run exits with 1, so CI can fail on it. Compare runs
+from the same machine only.
+
+run: python benchmark_auction.py [--size 1000,50,100 --size 10000,500,1000] [--out benchmark_results.json]
+     python benchmark_auction.py --baseline benchmark_baseline.json [--threshold 0.25]
+     python benchmark_auction.py --out benchmark_baseline.json  (records a new baseline)
+"""
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from AuctionManager import AuctionManager
+from simulate_features import make_league
+
+SIZES = ((1_000, 50, 100), (10_000, 500, 1_000))  # (players, clubs, open bids)
+CALLS = 50  # timed calls per round
+ROUNDS = 5
+THRESHOLD = 0.25  # slower than the baseline by more than 25% = regression
+NOISE_US = 2.0  # differences below this are timer noise, never a regression
+STARTING_BID = 1_000_000
+WAGE = 10_000
+
+
+def make_manager(n_players, n_clubs, n_bids):
+    """A league with every player listed and n_bids open bids on the first players ~AuctionManager"""
+    players_df, teams_df = make_league(n_players=n_players, n_clubs=n_clubs, wage=100_000_000)
+    players_df["is_listed"] = True
+    players_df["starting_bid"] = STARTING_BID
+    manager = AuctionManager(teams_df, players_df)
+    manager.archive_dir = tempfile.mkdtemp()
+    manager.roster_limits["squad"] = None  # any bid count fits, roster_check still runs
+    clubs = teams_df["club_id"].tolist()
+    for player_id, owner in zip(players_df["player_id"][:n_bids], players_df["club_id"][:n_bids]):
+        manager.create_bid(int(player_id), STARTING_BID, WAGE, bidder(clubs, owner))
+    return manager
+
+
+def bidder(clubs, owner):
+    # the club after the owner, never the owner himself
+    return clubs[(clubs.index(owner) + 1) % len(clubs)]
+
+
+class Round:
+    """Hands out players nobody bid on yet, in order, so no call sees another one's leftovers."""
+
+    def __init__(self, manager, n_bids):
+        self.manager = manager
+        self.clubs = manager.teams_df["club_id"].tolist()
+        self.free = iter(zip(manager.players_df["player_id"][n_bids:].tolist(),
+                             manager.players_df["club_id"][n_bids:].tolist()))
+
+    def take(self, n):
+        taken = [next(self.free, None) for _ in range(n)]
+        if None in taken:
+            raise ValueError("not enough players left for the rounds, use more players or fewer calls")
+        return [(player_id, bidder(self.clubs, owner)) for player_id, owner in taken]
+
+    def open_bids(self, n):
+        # untimed: n new auctions, replaces what cleanup/expire_due finished
+        for player_id, club_id in self.take(n):
+            self.manager.create_bid(player_id, STARTING_BID, WAGE, club_id)
+
+
+def timed(fn, items):
+    """:returns seconds per call: ~float"""
+    start = time.perf_counter()
+    for item in items:
+        fn(*item)
+    return (time.perf_counter() - start) / max(1, len(items))
+
+
+def bench_size(n_players, n_clubs, n_bids, calls=CALLS, rounds=ROUNDS):
+    """
+    Times every call on one league size.
+
+    :returns timings: call name -> seconds per call, one value per round ~dict
+    """
+    manager = make_manager(n_players, n_clubs, n_bids)
+    players = Round(manager, n_bids)
+    timings = {name: [] for name in ("can_bid_be_placed", "create_bid", "remove_bid", "get_listed_players",
+                                     "get_active_bids", "cleanup_expired", "expire_due")}
+    for _ in range(rounds):
+        fresh = players.take(calls)
+        timings["can_bid_be_placed"].append(
+            timed(lambda pid, club: manager.can_bid_be_placed(pid, STARTING_BID, club, WAGE), fresh))
+        timings["create_bid"].append(timed(lambda pid, club: manager.create_bid(pid, STARTING_BID, WAGE, club), fresh))
+        timings["remove_bid"].append(timed(lambda pid, club: manager.remove_bid(pid, "Regular"), fresh))
+        timings["get_listed_players"].append(timed(manager.get_listed_players, [()] * calls))
+        timings["get_active_bids"].append(timed(manager.get_active_bids, [()] * calls))
+
+        # finishing auctions: the oldest `calls` bids are due, then as many new ones are opened
+        for b in manager.bids[:calls]:
+            b.active = False
+        timings["cleanup_expired"].append(timed(manager.cleanup_expired, [()]))
+        players.open_bids(calls)
+        tomorrow = datetime.now() + timedelta(days=1)
+        timings["expire_due"].append(timed(lambda: manager.expire_due(now=tomorrow, limit=calls), [()]))
+        players.open_bids(calls)
+    return timings
+
+
+def run_benchmark(sizes=SIZES, calls=CALLS, rounds=ROUNDS):
+    """
+    :param sizes: (players, clubs, open bids) per league ~iterable
+    :returns results: {"meta": ..., "results": {"<call>[<players>p/<clubs>c/<bids>b]": {...}}} ~dict
+    """
+    results = {}
+    for n_players, n_clubs, n_bids in sizes:
+        with contextlib.redirect_stdout(io.StringIO()):  # the manager prints a line per bid
+            timings = bench_size(n_players, n_clubs, n_bids, calls, rounds)
+        for name, seconds in timings.items():
+            results[f"{name}[{n_players}p/{n_clubs}c/{n_bids}b]"] = {
+                "call": name, "players": n_players, "clubs": n_clubs, "bids": n_bids,
+                "median_us": statistics.median(seconds) * 1e6, "best_us": min(seconds) * 1e6,
+                "calls": calls, "rounds": rounds}
+    meta = {"time": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+            "pandas": pd.__version__, "machine": platform.machine(), "processor": platform.processor()}
+    return {"meta": meta, "results": results}
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    The calls that got slower than the baseline by more than the threshold (median per call).
+    Calls missing from either side are skipped, a new size isn't a regression.
+
+    :returns regressions: (name, baseline us, now us, ratio) tuples, worst first ~list
+    """
+    regressions = []
+    for name, now in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        if now["median_us"] > before["median_us"] * (1 + threshold) and now["median_us"] - before["median_us"] > NOISE_US:
+            regressions.append((name, before["median_us"], now["median_us"], now["median_us"] / before["median_us"]))
+    return sorted(regressions, key=lambda r: -r[3])
+
+
+def parse_size(text):
+    players, clubs, bids = (int(v) for v in text.split(","))
+    return players, clubs, bids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AuctionManager micro-benchmarks with a regression check.")
+    parser.add_argument("--size", type=parse_size, action="append", help="players,clubs,open_bids (repeatable)")
+    parser.add_argument("--calls", type=int, default=CALLS)
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="an earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.size or SIZES, args.calls, args.rounds)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(f"AuctionManager calls, us per call (median of {args.rounds} rounds x {args.calls} calls):")
+    for name, r in results["results"].items():
+        line = f"  {name:<44} {r['median_us']:11.1f}"
+        before = baseline and baseline["results"].get(name)
+        if before:
+            line += f"  baseline {before['median_us']:11.1f}  {r['median_us'] / before['median_us']:5.2f}x"
+        print(line)
+    print(f"Results written to '{args.out}'.")
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for name, before, now, ratio in regressions:
+        print(f"REGRESSION {name}: {before:.1f} -> {now:.1f} us ({ratio:.2f}x, over {1 + args.threshold:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+End to end latency of the slash commands, offline: many club managers fire a mix of
+commands at one league through the fake discord layer (auction_bot.fakes), each API call
+waiting a simulated latency and discord's global rate limit. Reports per command the time
+until the first answer (what discord's 3s deadline is about) and until the command
+finished, plus how late the event loop woke up while all of it ran.
+
+The bot's own per user/club rate limits are lifted for the run (--keep-limits leaves them
+on), otherwise most of the load would be answered with "Slow down!".
+
+run: python benchmark_commands.py [--users 40] [--commands 20] [--latency 0.05] [--jitter 0.02] [--rate 50]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import random
+import tempfile
+import time
+from collections import defaultdict
+
+from AuctionManager import AuctionManager
+from LeagueRegistry import LeagueRegistry
+from Maintenance import MaintenanceWorker
+from RateLimiter import RateLimiter
+from simulate_features import make_league
+from auction_bot import middleware
+import auction_bot.commands  # noqa: F401 - registers the commands
+from auction_bot.bot import background_tasks
+from auction_bot.fakes import FakeAPI, FakeClient
+
+GUILD_ID = 1
+MIX = {"bid": 5, "proxy_bid": 2, "listed_players": 3, "active_bids": 2, "info": 2, "whatif": 1}  # command -> weight
+PLAYERS_PER_CLUB = 10
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def sample_loop_lag(samples, interval=0.01):
+    """How much later than asked the loop wakes a sleeping task, i.e. how long something blocked it."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+def command_params(name, rng, listed, club_id):
+    """Random options for one command, bids go to players of other clubs."""
+    others = [pid for pid, owner in listed if owner != club_id]
+    if name == "bid":
+        return {"player_id": rng.choice(others), "bid_amount": 1_000_000 + rng.randint(1, 200) * 100_000,
+                "wage": 100_000}
+    if name == "proxy_bid":
+        return {"player_id": rng.choice(others), "max_amount": 2_000_000 + rng.randint(1, 200) * 100_000,
+                "wage": 100_000}
+    if name == "whatif":
+        picks = rng.sample(others, 2)
+        return {"bids": ", ".join(f"{pid}:{rng.randint(10, 40) * 100_000}:50000" for pid in picks)}
+    return {}
+
+
+async def run_benchmark(users=40, commands=20, latency=0.05, jitter=0.02, rate=50.0, keep_limits=False, seed=0):
+    """
+    :param users: club managers firing commands at the same time (one club each) ~int
+    :param commands: commands each of them sends, one after the other ~int
+    :param latency: simulated seconds per discord API request ~float
+    :param jitter: +- seconds added to every request ~float
+    :param rate: discord's global rate limit in requests a second ~float
+    :param keep_limits: leave the bot's user/club rate limits on ~bool
+    :param seed: seeds the command mix and the API jitter ~int
+
+    :returns results: per command latencies, loop lag and API counters ~dict
+    """
+    players_df, teams_df = make_league(n_players=users * PLAYERS_PER_CLUB, n_clubs=users)
+    manager = AuctionManager(teams_df, players_df)
+    listed = []
+    for pid, club_id in zip(players_df["player_id"], players_df["club_id"]):
+        if pid % 2 == 0:
+            manager.list_player(int(pid), int(club_id), 1_000_000, "Regular")
+            listed.append((int(pid), int(club_id)))
+
+    registry = LeagueRegistry(lambda: None, data_root=tempfile.mkdtemp())
+    registry.loaded[GUILD_ID] = manager
+    manager.archive_dir = tempfile.mkdtemp()
+    client = FakeClient(registry, FakeAPI(latency=latency, jitter=jitter, rate=rate, seed=seed),
+                        maintenance=MaintenanceWorker(registry))
+    by_name = {c.name: c for c in middleware.COMMANDS}
+    names, weights = list(MIX), list(MIX.values())
+
+    first_answer, finished, expired = defaultdict(list), defaultdict(list), defaultdict(int)
+
+    async def manager_session(club_id, user_id, rng):
+        for _ in range(commands):
+            name = rng.choices(names, weights)[0]
+            start = time.perf_counter()
+            interaction = await client.invoke(by_name[name], user_id, GUILD_ID,
+                                              **command_params(name, rng, listed, club_id))
+            finished[name].append(time.perf_counter() - start)
+            if interaction.answered_after is not None:
+                first_answer[name].append(interaction.answered_after)
+            expired[name] += interaction.expired
+
+    limiters = middleware.user_limiter, middleware.club_limiter
+    if not keep_limits:
+        middleware.user_limiter = middleware.club_limiter = RateLimiter(rate=1e9, burst=1e9)
+    lag = []
+    lag_task = asyncio.create_task(sample_loop_lag(lag))
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*[manager_session(int(club_id), int(discord_id), random.Random(seed + i))
+                               for i, (club_id, discord_id) in enumerate(zip(teams_df["club_id"],
+                                                                             teams_df["discord_id"]))])
+        await asyncio.gather(*list(background_tasks))  # the DMs sent after the replies
+    finally:
+        wall = time.perf_counter() - start
+        lag_task.cancel()
+        middleware.user_limiter, middleware.club_limiter = limiters
+
+    return {
+        "commands": {name: {"calls": len(finished[name]),
+                            "answer_p50": percentile(first_answer[name], 0.5),
+                            "answer_p99": percentile(first_answer[name], 0.99),
+                            "done_p50": percentile(finished[name], 0.5),
+                            "done_p99": percentile(finished[name], 0.99),
+                            "expired": expired[name]} for name in names if finished[name]},
+        "loop_lag": {"p50": percentile(lag, 0.5), "p99": percentile(lag, 0.99), "max": max(lag, default=0.0)},
+        "api": {"requests": dict(client.api.requests), "rate_limited": client.api.rate_limited,
+                "waited": client.api.waited},
+        "dms": sum(len(u.dms) for u in client.users.values()),
+        "wall": wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=40)
+    parser.add_argument("--commands", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--rate", type=float, default=50.0)
+    parser.add_argument("--keep-limits", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):  # the commands print a line per bid/DM
+        results = asyncio.run(run_benchmark(args.users, args.commands, args.latency, args.jitter, args.rate,
+                                            args.keep_limits, args.seed))
+
+    print(f"{args.users} managers x {args.commands} commands, API latency {args.latency * 1000:.0f}"
+          f"+-{args.jitter * 1000:.0f} ms, global limit {args.rate:.0f}/s, ran {results['wall']:.2f}s")
+    print(f"  {'command':<16}{'calls':>7}{'answer p50':>12}{'answer p99':>12}{'done p50':>10}{'done p99':>10}"
+          f"{'expired':>9}")
+    for name, r in results["commands"].items():
+        print(f"  /{name:<15}{r['calls']:>7}{r['answer_p50'] * 1000:>10.1f}ms{r['answer_p99'] * 1000:>10.1f}ms"
+              f"{r['done_p50'] * 1000:>8.1f}ms{r['done_p99'] * 1000:>8.1f}ms{r['expired']:>9}")
+    lag = results["loop_lag"]
+    print(f"Event loop lag: p50 {lag['p50'] * 1000:.1f} ms | p99 {lag['p99'] * 1000:.1f} ms | "
+          f"max {lag['max'] * 1000:.1f} ms")
+    api = results["api"]
+    print(f"API: {sum(api['requests'].values())} requests, {api['rate_limited']} waited for the global limit "
+          f"({api['waited']:.2f}s) | DMs sent: {results['dms']}")
+
+
+if __name__ == "__main__":
+    main()
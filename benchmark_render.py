@@ -0,0 +1,58 @@
+"""
+Times building 1,000 listing cards and 1,000 bid messages the old way (to_dict + number()
+per row, .loc lookups per message) against the RenderCache (cold and warm).
+
+run: python benchmark_render.py [n_cards]
+"""
+import sys
+import time
+
+from AuctionManager import AuctionManager
+from RenderCache import number
+from simulate_features import make_league
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n_cards=1000):
+    players_df, teams_df = make_league(n_players=n_cards, n_clubs=40)
+    players_df["is_listed"] = True
+    players_df["starting_bid"] = [1_000_000 + i * 1_000 for i in range(n_cards)]
+    manager = AuctionManager(teams_df, players_df)
+    listed = manager.get_listed_players()
+    ids = list(listed["player_id"])
+
+    def old_listing():
+        return ["**{}** (ID: {})\n> Starting Bid: £{} | Type: `{}`".format(
+            p["name"], int(p["player_id"]), number(p["starting_bid"]), p["Type"]) for p in listed.to_dict("records")]
+
+    def old_messages():
+        return [f'Created bid for {players_df.loc[players_df["player_id"] == pid, "name"].item()} by '
+                f'{teams_df.loc[teams_df["club_id"] == 101, "club_name"].item()}.' for pid in ids]
+
+    def cold_listing():
+        manager.data_version += 1  # invalidates the cache
+        return manager.render.listing_cards(listed)
+
+    results = {
+        "listing cards, to_dict + number()": timed(old_listing),
+        "listing cards, cache cold": timed(cold_listing),
+        "listing cards, cache warm": timed(lambda: manager.render.listing_cards(listed)),
+        "bid messages, .loc lookups": timed(old_messages, repeat=1),
+        "bid messages, cache warm": timed(lambda: [manager.render.bid_message(pid, 101) for pid in ids]),
+    }
+    assert old_listing() == manager.render.listing_cards(listed)
+    print(f"Rendering {n_cards:,} cards (best of 5):")
+    for name, seconds in results.items():
+        print(f"  {name:<38} {seconds * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,54 @@
+"""
+Times the end of season report over a synthetic season (100k transfers between 1,000
+clubs by default) with 1, 2, 4... worker processes, writing every club's transfer CSV,
+and checks every run gives the same report.
+
+run: python benchmark_settlement.py [n_transfers] [n_clubs]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from Settlement import TYPE_CODES, season_report
+
+
+def make_season(archive_dir, n_transfers, n_clubs, seed=0):
+    rng = np.random.default_rng(seed)
+    teams_df = pd.DataFrame({"club_id": np.arange(100, 100 + n_clubs), "club_name": [f"Club {i}" for i in range(n_clubs)],
+                             "budget": 500_000_000, "wage": 2_000_000})
+    buyer = rng.integers(0, n_clubs, n_transfers)
+    seller = (buyer + rng.integers(1, n_clubs, n_transfers)) % n_clubs
+    season = pd.DataFrame({"player_id": rng.permutation(n_transfers) + 1000, "bidding_team": buyer + 100,
+                           "outgoing_team": seller + 100, "bid": rng.integers(1, 500, n_transfers) * 100_000,
+                           "wage": rng.integers(10, 300, n_transfers) * 1_000,
+                           "type": rng.choice(list(TYPE_CODES), n_transfers, p=[0.7, 0.1, 0.1, 0.1])})
+    step = -(-n_transfers // 20)  # the maintenance worker archives in batches
+    for i, start in enumerate(range(0, n_transfers, step)):
+        season.iloc[start:start + step].to_csv(os.path.join(archive_dir, f"expired_bids_{i:04d}.csv"), index=False)
+    return teams_df
+
+
+def main(n_transfers=100_000, n_clubs=1_000):
+    archive_dir = tempfile.mkdtemp()
+    teams_df = make_season(archive_dir, n_transfers, n_clubs)
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, *[w for w in (4, 8, 16) if w <= cores], cores})
+    print(f"Season report, {n_transfers:,} transfers / {n_clubs:,} clubs, {cores} cores:")
+    baseline, reference = None, None
+    for workers in counts:
+        start = time.perf_counter()
+        report = season_report(teams_df, archive_dir, workers=workers, out_dir=tempfile.mkdtemp())
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        if reference is None:
+            reference = report
+        assert report.equals(reference), f"{workers} workers gave a different report"
+        print(f"  {workers:>2} workers {seconds * 1000:9.1f} ms  speedup {baseline / seconds:4.2f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -58,7 +58,8 @@ class TestAuctionManager(unittest.TestCase):
         success, message = self.manager.list_player(
             player_id=self.PLAYER_ID,
             team_id=self.TEAM_A_ID,
-            bid=bid_amount
+            bid=bid_amount,
+            typeo="Regular"
         )
         self.assertTrue(success, f"Listing failed: {message}")
 
@@ -70,7 +71,7 @@ class TestAuctionManager(unittest.TestCase):
     ## 2) Show the transfer list
     def test_get_listed_players(self):
         # List Player 231747
-        self.manager.list_player(player_id=self.PLAYER_ID, team_id=self.TEAM_A_ID, bid=1000000)
+        self.manager.list_player(player_id=self.PLAYER_ID, team_id=self.TEAM_A_ID, bid=1000000, typeo="Regular")
 
         listed_players = self.manager.get_listed_players()
 
@@ -80,7 +81,7 @@ class TestAuctionManager(unittest.TestCase):
     ## 3) Bidding (includes budget transfer test)
     def test_create_bid_success_and_budget_transfer(self):
         # 1. Setup: List Player (Mbappe)
-        self.manager.list_player(player_id=self.PLAYER_ID, team_id=self.TEAM_A_ID, bid=1000000)
+        self.manager.list_player(player_id=self.PLAYER_ID, team_id=self.TEAM_A_ID, bid=1000000, typeo="Regular")
 
         bid_amount = 5000000
         new_wage = 10000
@@ -90,7 +91,7 @@ class TestAuctionManager(unittest.TestCase):
         self.manager.teams_df.loc[self.manager.teams_df["club_id"] == self.TEAM_B_ID, "budget"].iloc[0]
         budget_A_before = \
         self.manager.teams_df.loc[self.manager.teams_df["club_id"] == self.TEAM_A_ID, "budget"].iloc[0]
-        bid = self.manager.create_bid(
+        bid, _, _ = self.manager.create_bid(
             player_id=self.PLAYER_ID,
             bid_amount=bid_amount,
             wage=new_wage,
@@ -116,7 +117,7 @@ class TestAuctionManager(unittest.TestCase):
     ## 4) Showing active bids
     def test_get_active_bids_and_cleanup(self):
         # Setup: List Player 231747
-        self.manager.list_player(player_id=self.PLAYER_ID, team_id=self.TEAM_A_ID, bid=1000000)
+        self.manager.list_player(player_id=self.PLAYER_ID, team_id=self.TEAM_A_ID, bid=1000000, typeo="Regular")
 
         # Create two bids (Manchester United is assumed to have enough funds)
         TEAM_C_id = 11
@@ -135,7 +136,7 @@ class TestAuctionManager(unittest.TestCase):
     ## 5) Removing player from transfer list and showing it updated
     def test_unlist_player(self):
         # 1. List Player 231747
-        self.manager.list_player(player_id=self.PLAYER_ID, team_id=self.TEAM_A_ID, bid=1000000)
+        self.manager.list_player(player_id=self.PLAYER_ID, team_id=self.TEAM_A_ID, bid=1000000, typeo="Regular")
 
         # 2. Unlist Player 231747
         success, message = self.manager.unlist_player(player_id=self.PLAYER_ID, team_id=self.TEAM_A_ID)
@@ -158,7 +159,8 @@ class TestAuctionManager(unittest.TestCase):
         self.manager.list_player(
             player_id=self.PLAYER_ID,
             team_id=self.TEAM_A_ID,
-            bid=INITIAL_BID
+            bid=INITIAL_BID,
+            typeo="Regular"
         )
 
         # 3. Attempt to bid less than the starting bid
@@ -173,7 +175,7 @@ class TestAuctionManager(unittest.TestCase):
         self.assertFalse(is_valid, f"Bid should have failed due to low amount but passed. Message: {message}")
 
         # 5. Verify no bid was created
-        bid,msg = self.manager.create_bid(
+        bid, msg, _ = self.manager.create_bid(
             player_id=self.PLAYER_ID,
             bid_amount=LOW_BID,
             wage=WAGE,
@@ -198,11 +200,12 @@ class TestAuctionManager(unittest.TestCase):
         self.manager.list_player(
             player_id=PLAYER_ID,
             team_id=TEAM_A_ID,
-            bid=INITIAL_BID
+            bid=INITIAL_BID,
+            typeo="Regular"
         )
 
         # Team B places the bid
-        is_valid, _ = self.manager.create_bid(
+        is_valid, _, _ = self.manager.create_bid(
             player_id=PLAYER_ID,
             bid_amount=INITIAL_BID,
             bidding_team=TEAM_B_ID,
@@ -239,11 +242,12 @@ class TestAuctionManager(unittest.TestCase):
         self.manager.list_player(
             player_id=PLAYER_ID,
             team_id=TEAM_A_ID,
-            bid=INITIAL_BID
+            bid=INITIAL_BID,
+            typeo="Regular"
         )
 
         # Team B places Bid 1
-        bid1_obj, _ = self.manager.create_bid(
+        bid1_obj, _, _ = self.manager.create_bid(
             player_id=PLAYER_ID,
             bid_amount=INITIAL_BID,
             bidding_team=TEAM_B_ID,
@@ -252,7 +256,7 @@ class TestAuctionManager(unittest.TestCase):
         self.assertTrue(bid1_obj.is_active(), "Bid 1 should be active initially.")
 
         # Team C places Bid 2 (Outbids Bid 1)
-        bid2_obj, _ = self.manager.create_bid(
+        bid2_obj, _, _ = self.manager.create_bid(
             player_id=PLAYER_ID,
             bid_amount=BID_2,
             bidding_team=TEAM_C_ID,
@@ -270,9 +274,6 @@ class TestAuctionManager(unittest.TestCase):
 
     # 3. Check if the bid timer work correctly
     def test_bid_timer_expiration(self):
-        # NOTE: Using a 3-second timer for automated test speed.
-        # The underlying logic will be the same as a 30-second timer.
-        TEST_DURATION = 30
         INITIAL_BID = 10000000
         WAGE = 100000
         PLAYER_ID = self.PLAYER_ID
@@ -282,12 +283,12 @@ class TestAuctionManager(unittest.TestCase):
         self.manager.list_player(
             player_id=PLAYER_ID,
             team_id=TEAM_A_ID,
-            bid=INITIAL_BID
+            bid=INITIAL_BID,
+            typeo="Regular"
         )
 
-        # Team B places the bid with the short timer
-        # ASSUMPTION: create_bid now accepts 'duration_seconds' (modified in AuctionManager.py)
-        bid_obj, _ = self.manager.create_bid(
+        # Team B places the bid
+        bid_obj, _, _ = self.manager.create_bid(
             player_id=PLAYER_ID,
             bid_amount=INITIAL_BID,
             bidding_team=TEAM_B_ID,
@@ -296,12 +297,10 @@ class TestAuctionManager(unittest.TestCase):
 
         self.assertTrue(bid_obj.is_active(), "Bid should be active initially.")
 
-        # Wait for the bid to expire
-        print(f"Waiting for {TEST_DURATION} seconds for the bid to expire...")
-        time.sleep(TEST_DURATION + 1)  # Wait one second longer than the duration
-
-        # Check if the bid is marked as inactive by the internal timer thread
-        self.assertFalse(bid_obj.is_active(), "Bid did not expire after the timer ran out.")
+        # Run the clock to the deadline instead of sleeping through the timer
+        records = self.manager.expire_due(now=bid_obj.ending_time)
+        self.assertIn(PLAYER_ID, [r["player_id"] for r in records])
+        self.assertFalse(bid_obj.active, "Bid did not expire after the timer ran out.")
 
     def test_full_auction_simulation(self):
         """
@@ -341,11 +340,11 @@ class TestAuctionManager(unittest.TestCase):
 
         # --- 2. LISTING PHASE ---
         print("\n--- Phase 1: Listing Players ---")
-        self.manager.list_player(player_id=PLAYER_A_ID, team_id=TEAM_A_ID, bid=150_000_000)
+        self.manager.list_player(player_id=PLAYER_A_ID, team_id=TEAM_A_ID, bid=150_000_000, typeo="Regular")
         # Note: Player B's team ID must match TEAM_C_ID in the data for this to pass
         player_b_team_id = \
         self.manager.players_df.loc[self.manager.players_df['player_id'] == PLAYER_B_ID, 'club_id'].iloc[0]
-        self.manager.list_player(player_id=PLAYER_B_ID, team_id=player_b_team_id, bid=90_000_000)
+        self.manager.list_player(player_id=PLAYER_B_ID, team_id=player_b_team_id, bid=90_000_000, typeo="Regular")
 
         listed_players = self.manager.get_listed_players()
         print("Current Transfer List:")
@@ -360,7 +359,7 @@ class TestAuctionManager(unittest.TestCase):
         bid1_amount = 155_000_000
         bid1_wage = 400_000
         print(f"\nTeam B bids ${bid1_amount:,.0f} for Player A.")
-        bid1_obj, _ = self.manager.create_bid(PLAYER_A_ID, bid1_amount, bid1_wage, TEAM_B_ID)
+        bid1_obj, _, _ = self.manager.create_bid(PLAYER_A_ID, bid1_amount, bid1_wage, TEAM_B_ID)
         print(_)
         self.assertIsNotNone(bid1_obj, "Bid 1 object should be created.")
 
@@ -375,7 +374,7 @@ class TestAuctionManager(unittest.TestCase):
         bid2_amount = 165_000_000
         bid2_wage = 420_000
         print(f"\nTeam C outbids with ${bid2_amount:,.0f} for Player A.")
-        bid2_obj, _ = self.manager.create_bid(PLAYER_A_ID, bid2_amount, bid2_wage, TEAM_C_ID)
+        bid2_obj, _, _ = self.manager.create_bid(PLAYER_A_ID, bid2_amount, bid2_wage, TEAM_C_ID)
         print(_)
         self.assertIsNotNone(bid2_obj, "Bid 2 object should be created.")
 
@@ -400,7 +399,7 @@ class TestAuctionManager(unittest.TestCase):
         bid3_amount = 100_000_000
         bid3_wage = 300_000
         print(f"\nTeam A bids ${bid3_amount:,.0f} for Player B.")
-        bid3_obj, _ = self.manager.create_bid(PLAYER_B_ID, bid3_amount, bid3_wage, TEAM_A_ID)
+        bid3_obj, _, _ = self.manager.create_bid(PLAYER_B_ID, bid3_amount, bid3_wage, TEAM_A_ID)
         self.assertIsNotNone(bid3_obj, "Bid 3 object should be created for Team A buying Player B.")
 
         # Verify final financial states before cleanup
@@ -0,0 +1,1160 @@
+import asyncio
+import contextlib
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import unittest
+from unittest import mock
+import tempfile
+from datetime import datetime, timedelta
+import pandas as pd
+
+from AuctionManager import AuctionManager
+from LeagueRegistry import LeagueRegistry
+from LiveBoard import LiveBoard
+from RateLimiter import RateLimiter, SingleFlight
+from Maintenance import MaintenanceWorker
+from Valuation import Valuation, load_history
+from auction_bot import services
+
+
+def make_league(n_players=12, n_clubs=4, budget=500_000_000, wage=2_000_000):
+    """
+    Builds a small synthetic league with the same columns Data_loader produces, so the
+    features can be tested without the (private) OCM data files.
+
+    :returns players_df, teams_df: ~DataFrame, DataFrame
+    """
+    teams_df = pd.DataFrame({
+        "club_id": [100 + i for i in range(n_clubs)],
+        "club_name": [f"Club {i}" for i in range(n_clubs)],
+        "budget": [budget] * n_clubs,
+        "wage": [wage] * n_clubs,
+        "discord_id": [9000 + i for i in range(n_clubs)],
+    })
+    players_df = pd.DataFrame({
+        "player_id": [1000 + i for i in range(n_players)],
+        "name": [f"Player {i}" for i in range(n_players)],
+        "club_id": [100 + i % n_clubs for i in range(n_players)],
+        "club_name": [f"Club {i % n_clubs}" for i in range(n_players)],
+        "wage": [50_000 + 1_000 * i for i in range(n_players)],
+        "is_listed": [False] * n_players,
+        "starting_bid": [None] * n_players,
+        "Type": ["Regular"] * n_players,
+    })
+    players_df["past_bidders"] = [[] for _ in range(n_players)]
+    return players_df, teams_df
+
+
+def budget_of(manager, club_id):
+    return manager.teams_df.loc[manager.teams_df["club_id"] == club_id, "budget"].iloc[0]
+
+
+class TestProxyBids(unittest.TestCase):
+
+    def setUp(self):
+        players_df, teams_df = make_league()
+        self.manager = AuctionManager(teams_df, players_df)
+        self.PLAYER_ID = 1000  # plays for club 100
+        self.manager.list_player(self.PLAYER_ID, 100, 1_000_000, "Regular")
+
+    def test_single_proxy_opens_at_starting_bid(self):
+        bid, msg, outbid = self.manager.place_proxy_bid(self.PLAYER_ID, 5_000_000, 10_000, 101)
+        self.assertIsNotNone(bid, msg)
+        self.assertEqual(bid.bid, 1_000_000)
+        self.assertEqual(outbid, [])
+
+    def test_competing_proxies_settle_at_second_price(self):
+        self.manager.place_proxy_bid(self.PLAYER_ID, 5_000_000, 10_000, 101)
+        bid, msg, outbid = self.manager.place_proxy_bid(self.PLAYER_ID, 8_000_000, 10_000, 102)
+        self.assertIsNotNone(bid, msg)
+        self.assertEqual(bid.bidding_team, 102)
+        self.assertEqual(bid.bid, 5_100_000)
+        self.assertEqual(outbid, [101])
+        # only the final leader's money is held
+        self.assertEqual(budget_of(self.manager, 101), 500_000_000)
+        self.assertEqual(budget_of(self.manager, 102), 500_000_000 - 5_100_000)
+        self.assertEqual(len(self.manager.get_active_bids()), 1)
+
+    def test_lower_proxy_is_outbid_by_standing_proxy(self):
+        self.manager.place_proxy_bid(self.PLAYER_ID, 8_000_000, 10_000, 101)
+        bid, msg, outbid = self.manager.place_proxy_bid(self.PLAYER_ID, 3_000_000, 10_000, 102)
+        self.assertIsNone(bid)
+        self.assertEqual(outbid, [102])
+        leader = self.manager.get_leading_bid(self.PLAYER_ID)
+        self.assertEqual((leader.bidding_team, leader.bid), (101, 3_100_000))
+
+    def test_manual_bid_triggers_proxy(self):
+        self.manager.place_proxy_bid(self.PLAYER_ID, 8_000_000, 10_000, 101)
+        self.manager.create_bid(self.PLAYER_ID, 2_000_000, 10_000, 102)
+        bid, _, outbid = self.manager.resolve_proxy_bids(self.PLAYER_ID)
+        self.assertEqual((bid.bidding_team, bid.bid), (101, 2_100_000))
+        self.assertEqual(outbid, [102])
+
+    def test_watchers_hear_about_proxy_bids(self):
+        self.manager.watch(self.PLAYER_ID, 103)
+        self.manager.place_proxy_bid(self.PLAYER_ID, 5_000_000, 10_000, 101)
+        _, _, notify = self.manager.place_proxy_bid(self.PLAYER_ID, 8_000_000, 10_000, 102)
+        self.assertEqual(notify, [101, 103])  # the outbid team and the watcher, never the new leader
+
+    def test_unpriced_players(self):
+        bid, msg, _ = self.manager.place_proxy_bid(1004, 5_000_000, 10_000, 101)  # never listed
+        self.assertIsNone(bid)
+        self.assertEqual(msg, "Player 1004 not listed.")
+        players = self.manager.players_df
+        players.loc[players["player_id"] == 1005, "club_name"] = "rotw"  # biddable without a price
+        self.manager.place_proxy_bid(1005, 5_000_000, 10_000, 102)
+        bid, msg, _ = self.manager.place_proxy_bid(1005, 8_000_000, 10_000, 103)
+        self.assertEqual((bid.bidding_team, bid.bid), (103, 5_100_000), msg)
+
+
+class TestBulk(unittest.TestCase):
+
+    def setUp(self):
+        players_df, teams_df = make_league()
+        self.manager = AuctionManager(teams_df, players_df)
+
+    def test_bulk_list_all_or_nothing(self):
+        ok, results = self.manager.list_players_bulk([(1000, 100, 1_000_000, "Regular"),
+                                                      (1001, 100, 1_000_000, "Regular")])  # 1001 is club 101's
+        self.assertFalse(ok)
+        self.assertEqual([r["ok"] for r in results], [False, False])
+        self.assertIn("not in your team", results[1]["message"])
+        self.assertEqual(len(self.manager.get_listed_players()), 0)
+
+    def test_bulk_list_and_bid(self):
+        ok, _ = self.manager.list_players_bulk([(1000, 100, 1_000_000, "Regular"),
+                                                (1004, 100, 2_000_000, "Regular")])
+        self.assertTrue(ok)
+        self.assertEqual(sorted(self.manager.get_listed_players()["player_id"]), [1000, 1004])
+
+        ok, results = self.manager.create_bids_bulk(101, [(1000, 1_500_000, 10_000), (1004, 2_000_000, 10_000)])
+        self.assertTrue(ok, results)
+        self.assertEqual(budget_of(self.manager, 101), 500_000_000 - 3_500_000)
+
+    def test_bulk_bid_package_over_budget(self):
+        self.manager.list_players_bulk([(1000, 100, 300_000_000, "Regular"), (1004, 100, 300_000_000, "Regular")])
+        ok, results = self.manager.create_bids_bulk(101, [(1000, 300_000_000, 1), (1004, 300_000_000, 1)])
+        self.assertFalse(ok)
+        self.assertIn("over your budget", results[0]["message"])
+        self.assertEqual(self.manager.get_active_bids(), [])
+
+    def test_bulk_bid_takes_back_what_it_placed_when_a_bid_fails(self):
+        self.manager.list_players_bulk([(1000, 100, 1_000_000, "Regular"), (1004, 100, 1_000_000, "Regular")])
+        self.manager.create_bid(1000, 1_200_000, 10_000, 102)
+        real, answers = self.manager.can_bid_be_placed, iter([True, False])
+
+        def flaky(*args):
+            return real(*args) if next(answers) else (False, "Team 101 can't bid right now.")
+
+        with mock.patch.object(self.manager, "can_bid_be_placed", side_effect=flaky):
+            ok, results = self.manager.create_bids_bulk(101, [(1000, 1_500_000, 10_000), (1004, 2_000_000, 10_000)])
+        self.assertFalse(ok)
+        self.assertEqual([r["ok"] for r in results], [False, False])
+        leader = self.manager.get_leading_bid(1000)
+        self.assertEqual((leader.bidding_team, leader.bid), (102, 1_200_000))  # the outbid bid is back
+        self.assertEqual(self.manager.get_info(101)[0], 500_000_000)
+        self.assertEqual(len(self.manager.get_active_bids()), 1)
+
+    def test_bulk_bids_meet_the_proxies_like_a_bid(self):
+        self.manager.list_players_bulk([(1000, 100, 1_000_000, "Regular"), (1004, 100, 1_000_000, "Regular")])
+        self.manager.place_proxy_bid(1000, 5_000_000, 10_000, 103)
+        ok, results = services.create_bids_bulk(self.manager, 101, [(1000, 1_500_000, 10_000),
+                                                                    (1004, 2_000_000, 10_000)])
+        self.assertTrue(ok, results)
+        self.assertIn("Outbid straight away by a proxy bid", results[0]["message"])
+        self.assertEqual(results[0]["watchers"], [103])
+        leader = self.manager.get_leading_bid(1000)
+        self.assertEqual((leader.bidding_team, leader.bid), (103, 1_600_000))
+
+
+class TestLedger(unittest.TestCase):
+
+    def setUp(self):
+        players_df, teams_df = make_league()
+        self.manager = AuctionManager(teams_df, players_df)
+
+    def test_outbid_refund_is_exact_and_league_money_is_conserved(self):
+        self.manager.list_player(1000, 100, 1_000_000, "Regular")
+        self.manager.create_bid(1000, 2_000_000, 10_000, 101)
+        self.manager.create_bid(1000, 3_000_000, 20_000, 102)
+        self.assertEqual(self.manager.get_info(101), (500_000_000, 2_000_000))
+        self.assertEqual(self.manager.get_info(100)[0], 503_000_000)
+        self.assertEqual(self.manager.ledger.balance(102)["reserved_budget"], -3_000_000)
+        ok, problems = self.manager.ledger.check_invariants(self.manager.teams_df)
+        self.assertTrue(ok, problems)
+
+    def test_loan_refunds_match_what_was_charged(self):
+        self.manager.list_player(1000, 100, 1_000_000, "Free Loan")
+        self.manager.create_free_loan_bid(1000, 1_000_000, 10_000, 101)
+        self.manager.create_free_loan_bid(1000, 1_500_000, 10_000, 102)
+        self.manager.remove_bid(1000, "Free Loan")
+        for club in (100, 101, 102):
+            self.assertEqual(self.manager.get_info(club), (500_000_000, 2_000_000))
+        ok, problems = self.manager.ledger.check_invariants(self.manager.teams_df)
+        self.assertTrue(ok, problems)
+
+    def test_loan_fees_move_what_the_bid_stores(self):
+        self.manager.list_player(1000, 100, 1_000_000, "Dev Loan")
+        bid, _ = self.manager.dev_loan_bid(1000, 1_000_000, 10_000, 101)
+        self.assertEqual(bid.bid, 0)
+        self.assertEqual(self.manager.get_info(101)[0], 500_000_000)
+        self.assertEqual(self.manager.get_info(100)[0], 500_000_000)
+
+        # free loans: the bidder pays, the lending club gets nothing
+        self.manager.list_player(1001, 101, 1_000_000, "Free Loan")
+        self.manager.create_free_loan_bid(1001, 1_000_000, 10_000, 102)
+        self.assertEqual(self.manager.get_info(102)[0], 499_000_000)
+        self.assertEqual(self.manager.get_info(101)[0], 500_000_000)
+        ok, problems = self.manager.ledger.check_invariants(self.manager.teams_df)
+        self.assertTrue(ok, problems)
+
+    def test_settled_bid_moves_to_committed(self):
+        self.manager.list_player(1000, 100, 1_000_000, "Regular")
+        bid, _, _ = self.manager.create_bid(1000, 2_000_000, 10_000, 101)
+        bid.deactivate_bid()
+        self.manager.archive_dir = tempfile.mkdtemp()
+        self.manager.cleanup_expired()
+        self.assertEqual(self.manager.ledger.balance(101)["reserved_budget"], 0)
+        self.assertEqual(self.manager.ledger.balance(101)["committed_budget"], 498_000_000)
+
+    def test_invariant_checker_spots_direct_frame_arithmetic(self):
+        self.manager.teams_df.loc[self.manager.teams_df["club_id"] == 101, "budget"] += 1
+        ok, problems = self.manager.ledger.check_invariants(self.manager.teams_df)
+        self.assertFalse(ok)
+
+
+class TestWhatIf(unittest.TestCase):
+
+    def test_combinations_against_budget_and_wage(self):
+        players_df, teams_df = make_league(budget=3_000_000, wage=100_000)
+        manager = AuctionManager(teams_df, players_df)
+        for pid in (1000, 1004, 1008):
+            manager.list_player(pid, 100, 1_000_000, "Regular")
+        bids = [(1000, 2_000_000, 50_000), (1004, 1_500_000, 40_000), (1008, 500_000, 10_000)]
+        ok, report = manager.what_if(101, bids)
+        self.assertTrue(ok)
+        self.assertEqual(report["items"][2]["message"], "Player 1008 not enough starting bid.")
+        self.assertFalse(report["all"]["feasible"])  # 3.5M of bids on a 3M budget
+        self.assertEqual(report["best"], [[0], [1]])
+
+        # selling a player makes room for both
+        ok, report = manager.what_if(101, bids[:2], [(1009, 800_000)])
+        self.assertTrue(report["all"]["feasible"])
+        self.assertEqual((report["all"]["budget"], report["all"]["wage"]), (300_000, 100_000 - 90_000 + 59_000))
+        self.assertEqual(manager.get_info(101), (3_000_000, 100_000))  # nothing was reserved
+        self.assertFalse(manager.what_if(101, [], [(1000, None)])[1]["items"][0]["ok"])  # not their player
+
+    def test_squad_limit(self):
+        players_df, teams_df = make_league()  # 3 players per club
+        manager = AuctionManager(teams_df, players_df)
+        for pid in (1000, 1004, 1008):
+            manager.list_player(pid, 100, 1_000_000, "Regular")
+        manager.roster_limits["squad"] = 4  # room for one more at club 101
+        ok, report = manager.what_if(101, [(1000, 2_000_000, 10_000), (1004, 2_000_000, 10_000)])
+        self.assertEqual([i["ok"] for i in report["items"]], [True, True])
+        self.assertFalse(report["all"]["feasible"])
+        self.assertEqual(report["best"], [[0], [1]])
+        manager.roster_limits["squad"] = 3
+        ok, report = manager.what_if(101, [(1000, 2_000_000, 10_000)])
+        self.assertTrue(report["items"][0]["message"].startswith("Squad full"))
+        self.assertEqual(report["items"][0]["message"], manager.can_bid_be_placed(1000, 2_000_000, 101, 10_000)[1])
+
+
+class TestRoster(unittest.TestCase):
+
+    def setUp(self):
+        players_df, teams_df = make_league()  # 3 players per club
+        self.manager = AuctionManager(teams_df, players_df)
+        self.manager.archive_dir = tempfile.mkdtemp()
+        for pid in (1000, 1004, 1008, 1002):
+            self.manager.list_player(pid, 100 + (pid - 1000) % 4, 1_000_000, "Regular")
+
+    def test_squad_limit_counts_open_bids_and_raises(self):
+        self.manager.roster_limits["squad"] = 5
+        self.assertIsNotNone(self.manager.create_bid(1000, 2_000_000, 10_000, 101)[0])
+        self.assertIsNotNone(self.manager.create_bid(1004, 2_000_000, 10_000, 101)[0])
+        bid, msg, _ = self.manager.create_bid(1008, 2_000_000, 10_000, 101)
+        self.assertIsNone(bid)
+        self.assertTrue(msg.startswith("Squad full"))
+        # raising its own bid replaces it, so it still fits
+        self.assertIsNotNone(self.manager.create_bid(1000, 2_500_000, 10_000, 101)[0])
+        self.assertEqual(self.manager.get_roster(101)["squad"], 5)
+
+        # outbid: the slot frees up
+        self.manager.create_bid(1004, 3_000_000, 10_000, 102)
+        self.assertEqual(self.manager.get_roster(101)["squad"], 4)
+        self.manager.cleanup_expired()  # nothing expired yet
+        for b in self.manager.bids:
+            b.deactivate_bid()
+        self.manager.cleanup_expired()
+        self.assertEqual(self.manager.get_roster(101)["squad"], 4)
+        self.assertEqual(self.manager.get_roster(100)["squad"], 1)  # sold two
+
+    def test_loan_type_cap(self):
+        self.manager.roster_limits["Free Loan"] = 0
+        self.manager.players_df.loc[self.manager.players_df["player_id"] == 1002, "Type"] = "Free Loan"
+        ok, msg, _ = self.manager.create_free_loan_bid(1002, 2_000_000, 10_000, 101)
+        self.assertIsNone(ok)
+        self.assertTrue(msg.startswith("Too many Free Loans"))
+        ok, results = self.manager.create_bids_bulk(103, [(1000, 2_000_000, 1), (1004, 2_000_000, 1)])
+        self.assertTrue(ok, results)
+
+
+class TestTeamSummary(unittest.TestCase):
+
+    def test_summary_follows_list_bid_and_settle(self):
+        players_df, teams_df = make_league()
+        # a non-default index used to make get_info read the wrong row
+        teams_df.index = teams_df.index[::-1]
+        manager = AuctionManager(teams_df, players_df)
+        manager.list_player(1000, 100, 1_000_000, "Regular")
+        manager.list_player(1004, 100, 1_000_000, "Regular")
+        self.assertEqual(manager.get_team_summary(100)["players_listed"], 2)
+
+        bid, _, _ = manager.create_bid(1000, 2_000_000, 10_000, 101)
+        seller, buyer = manager.get_team_summary(100), manager.get_team_summary(101)
+        self.assertEqual((seller["players_listed"], seller["bids_received"]), (1, 1))
+        self.assertEqual((buyer["bids_placed"], buyer["budget"]), (1, 498_000_000))
+        self.assertEqual(manager.get_info(101), (498_000_000, 1_990_000))
+
+        bid.deactivate_bid()
+        manager.archive_dir = tempfile.mkdtemp()
+        manager.cleanup_expired()
+        self.assertEqual(manager.get_team_summary(101)["bids_placed"], 0)
+        self.assertIsNone(manager.get_team_summary(999))
+
+
+class TestLeagueRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.registry = LeagueRegistry(lambda: AuctionManager(*reversed(make_league())),
+                                       data_root=self.tmp.name, max_loaded=2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_leagues_are_separate(self):
+        a, b = self.registry.get(1), self.registry.get(2)
+        a.list_player(1000, 100, 1_000_000, "Regular")
+        a.create_bid(1000, 2_000_000, 10_000, 101)
+        self.assertEqual(a.get_info(101)[0], 498_000_000)
+        self.assertEqual(b.get_info(101)[0], 500_000_000)
+
+    def test_evicted_league_comes_back_with_its_state(self):
+        a = self.registry.get(1)
+        a.list_player(1000, 100, 1_000_000, "Regular")
+        a.create_bid(1000, 2_000_000, 10_000, 101)
+        self.registry.get(2)
+        self.registry.get(3)  # over max_loaded, league 1 is saved and dropped
+        self.assertNotIn(1, self.registry.loaded)
+
+        a = self.registry.get(1)
+        self.assertEqual(a.get_info(101)[0], 498_000_000)
+        self.assertEqual(len(a.get_active_bids()), 1)
+        ok, problems = a.ledger.check_invariants(a.teams_df)
+        self.assertTrue(ok, problems)
+
+    def test_leagues_in_use_are_not_evicted(self):
+        with self.registry.using(1):
+            a = self.registry.get(1)
+            self.registry.get(2)
+            self.registry.get(3)  # league 1 is the least recently used but busy, 2 goes
+            self.assertIs(self.registry.loaded.get(1), a)
+            self.assertNotIn(2, self.registry.loaded)
+            with self.registry.using(3), self.registry.using(4):
+                self.registry.get(4)
+                self.assertEqual(list(self.registry.loaded), [1, 3, 4])  # all busy, over max_loaded for now
+            self.assertEqual(list(self.registry.loaded), [1, 3])  # 4 was released first, so it's the one dropped
+        self.assertEqual(list(self.registry.loaded), [1, 3])
+
+    def test_shards_only_serve_their_guilds(self):
+        registry = LeagueRegistry(None, data_root=self.tmp.name, shard_ids=[0], shard_count=2)
+        self.assertTrue(registry.owns(0 << 22))
+        self.assertFalse(registry.owns(1 << 22))
+        self.assertIsNone(registry.get(1 << 22))
+
+
+class TestReload(unittest.TestCase):
+
+    def test_reload_keeps_open_auctions_and_money(self):
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        manager.list_player(1000, 100, 1_000_000, "Regular")
+        manager.list_player(1004, 100, 1_000_000, "Regular")
+        manager.create_bid(1000, 2_000_000, 10_000, 101)
+
+        new_players, new_teams = make_league(n_players=14, n_clubs=5)
+        new_players.loc[new_players["player_id"] == 1001, "wage"] = 99_000
+        new_players = new_players[new_players["player_id"] != 1000]  # dropped from the sheet mid-auction
+        ok, msg = manager.reload_data(new_players, new_teams)
+        self.assertTrue(ok, msg)
+
+        players = manager.players_df.set_index("player_id")
+        self.assertEqual(players.at[1001, "wage"], 99_000)
+        self.assertIn(1000, players.index)  # still being bid on, so kept
+        self.assertTrue(players.at[1004, "is_listed"])
+        self.assertFalse(players.at[1013, "is_listed"])
+        self.assertEqual(len(manager.get_active_bids()), 1)
+        self.assertEqual(manager.get_info(101)[0], 498_000_000)
+        self.assertEqual(manager.get_info(104)[0], 500_000_000)  # new club opened in the ledger
+        ok, problems = manager.ledger.check_invariants(manager.teams_df)
+        self.assertTrue(ok, problems)
+
+    def test_reload_doesnt_count_a_transfer_twice(self):
+        players_df, teams_df = make_league()  # 3 players per club
+        manager = AuctionManager(teams_df, players_df)
+        manager.archive_dir = tempfile.mkdtemp()
+        manager.list_player(1000, 100, 1_000_000, "Regular")
+        bid = manager.create_bid(1000, 2_000_000, 10_000, 101)[0]
+        manager.expire_due(now=bid.ending_time)
+        squads = lambda: (manager.get_roster(100)["squad"], manager.get_roster(101)["squad"])
+        self.assertEqual(squads(), (2, 4))
+        manager.reload_data(*make_league())  # the sheet doesn't have the transfer yet
+        self.assertEqual(squads(), (2, 4))
+        new_players, new_teams = make_league()
+        new_players.loc[new_players["player_id"] == 1000, ["club_id", "club_name"]] = [101, "Club 1"]
+        manager.reload_data(new_players, new_teams)  # now it does
+        self.assertEqual(squads(), (2, 4))
+        self.assertEqual(manager.sold, {})
+
+    def test_identity_map_follows_reload(self):
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        self.assertEqual(manager.club_for(9001), 101)
+        self.assertIsNone(manager.club_for(1234))
+
+        new_players, new_teams = make_league(n_clubs=5)
+        new_teams.loc[new_teams["club_id"] == 101, "discord_id"] = 7777  # club changed hands
+        ok, msg = manager.reload_data(new_players, new_teams)
+        self.assertTrue(ok, msg)
+        self.assertEqual(manager.club_for(7777), 101)
+        self.assertIsNone(manager.club_for(9001))
+        self.assertEqual(manager.club_for(9004), 104)
+        self.assertEqual(manager.user_of_club[101], 7777)
+
+    def test_stale_plan_is_refused(self):
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        plan = manager.prepare_reload(*make_league())
+        manager.list_player(1000, 100, 1_000_000, "Regular")
+        ok, _ = manager.apply_reload(plan)
+        self.assertFalse(ok)
+
+
+class FakeMessage:
+    def __init__(self):
+        self.edits = []
+
+    async def edit(self, **kwargs):
+        self.edits.append(kwargs)
+
+
+class TestLiveBoard(unittest.TestCase):
+
+    def test_board_edits_once_per_change(self):
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        message = FakeMessage()
+        board = LiveBoard(lambda: manager, message)
+
+        async def run():
+            await board.tick()
+            manager.list_player(1000, 100, 1_000_000, "Regular")
+            manager.create_bid(1000, 2_000_000, 10_000, 101)
+            await board.tick()  # two changes since the last tick, one edit
+            await board.tick()  # nothing changed
+            manager._touch()
+            await board.tick()  # version moved but the board reads the same
+
+        asyncio.run(run())
+        self.assertEqual(len(message.edits), 2)
+        self.assertIn("Player 0", message.edits[-1]["embed"].description)
+        self.assertIn("<t:", message.edits[-1]["embed"].description)
+
+
+class TestRateLimiting(unittest.TestCase):
+
+    def test_bucket_allows_burst_then_refills(self):
+        limiter = RateLimiter(rate=0.5, burst=3)
+        self.assertEqual([limiter.hit("user", now=0) for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(limiter.hit("user", now=0), 2.0)
+        self.assertEqual(limiter.hit("other", now=0), 0)  # buckets are per key
+        self.assertEqual(limiter.hit("user", now=2), 0)
+        limiter.prune(now=100)
+        self.assertEqual(limiter.buckets, {})
+
+    def test_prune_keeps_buckets_that_are_still_refilling(self):
+        limiter = RateLimiter(rate=0.5, burst=3)
+        for _ in range(3):
+            limiter.hit("user", now=0)  # empty, full again after 6s
+        limiter.prune(now=5)
+        self.assertIn("user", limiter.buckets)
+        limiter.prune(now=6.5)
+        self.assertEqual(limiter.buckets, {})
+
+    def test_concurrent_identical_queries_share_one_computation(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def snapshot():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return ["card"]
+
+        async def run():
+            first = await asyncio.gather(*[flight.do(("listed_players", 1, 5), snapshot) for _ in range(10)])
+            again = await flight.do(("listed_players", 1, 5), snapshot)
+            newer = await flight.do(("listed_players", 1, 6), snapshot)
+            return first, again, newer
+
+        first, again, newer = asyncio.run(run())
+        self.assertEqual(len(calls), 2)  # one per version
+        self.assertTrue(all(r == ["card"] for r in first + [again, newer]))
+
+
+class TestMaintenance(unittest.TestCase):
+
+    def setUp(self):
+        players_df, teams_df = make_league()
+        self.manager = AuctionManager(teams_df, players_df)
+        self.manager.archive_dir = tempfile.mkdtemp()
+        for pid in (1000, 1004, 1008):
+            self.manager.list_player(pid, 100, 1_000_000, "Regular")
+        self.bids = [self.manager.create_bid(pid, 2_000_000, 10_000, 101)[0] for pid in (1000, 1004, 1008)]
+        self.manager.create_bid(1000, 3_000_000, 10_000, 102)  # outbids the first one
+
+    def test_expire_due_works_in_batches_and_skips_outbid_bids(self):
+        later = datetime.now() + timedelta(hours=1)
+        self.assertEqual(self.manager.expire_due(), [])  # nothing is due yet
+        self.assertEqual(self.manager.expiry_backlog(later), 4)
+
+        first = self.manager.expire_due(now=later, limit=2)
+        rest = self.manager.expire_due(now=later, limit=2)
+        # the outbid bid's heap entry comes up but it's no longer open, so it's skipped
+        self.assertEqual(len(first) + len(rest), 3)
+        self.assertEqual(self.manager.bids, [])
+        self.assertEqual(self.manager.get_team_summary(101)["bids_placed"], 0)
+        self.assertEqual(self.manager.ledger.balance(102)["committed_budget"], 497_000_000)
+        ok, problems = self.manager.ledger.check_invariants(self.manager.teams_df)
+        self.assertTrue(ok, problems)
+
+    def test_worker_archives_off_the_loop_and_reports_metrics(self):
+        registry = LeagueRegistry(lambda: None, data_root=tempfile.mkdtemp())
+        registry.loaded[1] = self.manager
+        for b in self.manager.bids:
+            b.ending_time = datetime.now() - timedelta(seconds=1)
+        self.manager.deadlines = []
+        self.manager._deadline_seq = 0
+        bids, self.manager.bids = self.manager.bids, []
+        for b in bids:
+            self.manager._track(b)
+
+        worker = MaintenanceWorker(registry, batch=2)
+        self.assertEqual(asyncio.run(worker.run_once()), 2)
+        self.assertEqual(worker.metrics["backlog"], 1)
+        asyncio.run(worker.run_once())
+        self.assertEqual((worker.metrics["finalized"], worker.metrics["backlog"]), (3, 0))
+        self.assertEqual(len(os.listdir(self.manager.archive_dir)), 2)
+
+
+class TestValuation(unittest.TestCase):
+
+    def test_fallback_then_regression_from_the_archive(self):
+        players_df, teams_df = make_league(n_players=40)
+        players_df["overall"] = [60 + i for i in range(40)]
+        manager = AuctionManager(teams_df, players_df)
+        manager.archive_dir = tempfile.mkdtemp()
+
+        manager.valuation.refit(manager.players_df, manager.archive_dir)
+        self.assertEqual(manager.valuation.method, "wage multiple")
+        self.assertEqual(manager.valuation.suggest(1000), (5_000_000, 50_000))
+
+        # a market where fees double every 10 overall and clubs offer 20% more wage
+        overall = players_df["overall"].to_numpy()
+        pd.DataFrame({"player_id": players_df["player_id"], "bid": 1_000_000 * 2 ** ((overall - 60) / 10),
+                      "wage": players_df["wage"] * 1.2, "type": "Regular"}).to_csv(
+            os.path.join(manager.archive_dir, "expired_bids_1.csv"), index=False)
+        self.assertEqual(len(load_history(manager.archive_dir)), 40)
+        manager.valuation.refit(manager.players_df, manager.archive_dir, Valuation.inputs_of(manager))
+        self.assertEqual(manager.valuation.method, "regression")
+        fee, wage = manager.valuation.suggest(1020)  # overall 80
+        self.assertAlmostEqual(fee, 4_000_000, delta=20_000)
+        self.assertEqual(wage, round(70_000 * 1.2))
+        self.assertEqual(manager.valuation.fitted_on, (0, 1))
+
+
+class TestSettlement(unittest.TestCase):
+
+    def test_end_of_season_report_is_the_same_for_any_worker_count(self):
+        from Settlement import end_season, season_report
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        manager.archive_dir = tempfile.mkdtemp()
+        manager.list_player(1000, 100, 1_000_000, "Regular")
+        manager.list_player(1004, 100, 1_000_000, "Dev Loan")
+        manager.list_player(1001, 101, 1_000_000, "Regular")
+        manager.create_bid(1000, 4_000_000, 20_000, 101)
+        manager.dev_loan_bid(1004, 1_000_000, 5_000, 102)
+        manager.create_bid(1001, 2_000_000, 30_000, 102)
+
+        out_dir = tempfile.mkdtemp()
+        report = end_season(manager, workers=1, out_dir=out_dir)
+        self.assertEqual(manager.bids, [])
+        self.assertTrue(report.equals(season_report(manager.teams_df, manager.archive_dir, workers=2)))
+        rows = report.set_index("club_id")
+        # dev loan bids are stored with a 0 fee, the loan fee lives in the ledger only
+        self.assertEqual(rows.loc[100, ["sold", "loans_out", "received"]].tolist(), [1, 1, 4_000_000])
+        self.assertEqual(rows.loc[102, ["bought", "loans_in", "spent", "record_signing"]].tolist(),
+                         [1, 1, 2_000_000, 1001])
+        self.assertEqual(rows.loc[101, "net_spend"], 4_000_000 - 2_000_000)
+        self.assertEqual(rows.loc[101, "budget"], budget_of(manager, 101))
+        club_100 = pd.read_csv(os.path.join(out_dir, "100.csv"))
+        self.assertEqual(club_100["direction"].tolist(), ["out", "out"])
+        self.assertEqual(sorted(club_100["other_club"]), [101, 102])
+
+
+    def test_regular_loans_settle_as_loans(self):
+        from Settlement import end_season
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        manager.archive_dir = tempfile.mkdtemp()
+        manager.list_player(1000, 100, 1_000_000, "Regular")
+        manager.players_df.loc[manager.players_df["player_id"] == 1000, "Type"] = "Regular Loan"
+        manager.create_reg_loan_bid(1000, 2_000_000, 10_000, 101)
+
+        out_dir = tempfile.mkdtemp()
+        rows = end_season(manager, workers=1, out_dir=out_dir).set_index("club_id")
+        self.assertEqual(rows.loc[101, ["bought", "loans_in"]].tolist(), [0, 1])
+        self.assertEqual(rows.loc[100, ["sold", "loans_out"]].tolist(), [0, 1])
+        self.assertEqual(pd.read_csv(os.path.join(out_dir, "101.csv"))["type"].tolist(), ["Regular Loan"])
+
+
+class TestEvents(unittest.TestCase):
+
+    def setUp(self):
+        players_df, teams_df = make_league()
+        self.manager = AuctionManager(teams_df, players_df)
+        self.manager.archive_dir = tempfile.mkdtemp()
+
+    def test_feed_covers_the_auction_and_cuts_off_slow_subscribers(self):
+        from Events import SubscriberLagged
+        manager = self.manager
+        slow = manager.events.subscribe(maxsize=2)
+        manager.list_player(1000, 100, 1_000_000, "Regular")
+        manager.create_bid(1000, 2_000_000, 10_000, 101)
+        manager.create_bid(1000, 3_000_000, 10_000, 102)
+        manager.list_player(1004, 100, 1_000_000, "Regular")
+        manager.unlist_player(1004, 100)
+        manager.settle_all()
+        kinds = [e.kind for e in manager.events.since(0)]
+        self.assertEqual(kinds, ["listed", "bid_placed", "bid_placed", "outbid", "listed", "unlisted",
+                                 "expired", "settled"])
+        outbid = manager.events.get(4)
+        self.assertEqual((outbid.club_id, outbid.data["bid"]), (101, 2_000_000))
+
+        async def drain(sub):
+            seen = []
+            try:
+                while True:
+                    seen.append((await sub.get()).id)
+            except SubscriberLagged as e:
+                return seen, e.last_id
+
+        seen, last_id = asyncio.run(drain(slow))
+        self.assertEqual((seen, last_id), ([1, 2], 2))
+        self.assertNotIn(slow, manager.events.subscribers)  # the auction went on without it
+        resumed = manager.events.subscribe(since=last_id)
+        self.assertEqual([resumed.queue.get_nowait().id for _ in range(6)], [3, 4, 5, 6, 7, 8])
+
+    def test_ndjson_stream_over_a_local_socket(self):
+        import json
+        from Events import serve_events
+        registry = LeagueRegistry(lambda: None, data_root=tempfile.mkdtemp())
+        registry.loaded[1] = self.manager
+        self.manager.list_player(1000, 100, 1_000_000, "Regular")
+
+        async def run():
+            server = await serve_events(registry, port=0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /events/1?since=0 HTTP/1.1\r\nHost: x\r\n\r\n")
+            await writer.drain()
+            status = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+            first = json.loads(await reader.readline())
+            self.manager.create_bid(1000, 2_000_000, 10_000, 101)  # live, after subscribing
+            second = json.loads(await reader.readline())
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return status, first, second
+
+        status, first, second = asyncio.run(run())
+        self.assertIn(b"200", status)
+        self.assertEqual((first["id"], first["kind"], first["player_id"]), (1, "listed", 1000))
+        self.assertEqual((second["kind"], second["club_id"], second["bid"]), ("bid_placed", 101, 2_000_000))
+
+
+class TestUndo(unittest.TestCase):
+
+    def setUp(self):
+        players_df, teams_df = make_league()
+        self.manager = AuctionManager(teams_df, players_df)
+        self.manager.list_player(1000, 100, 1_000_000, "Regular")
+
+    def event_id(self, kind, club_id):
+        return next(e.id for e in reversed(self.manager.events.since(0)) if e.kind == kind and e.club_id == club_id)
+
+    def check_ledger(self):
+        ok, problems = self.manager.ledger.check_invariants(self.manager.teams_df)
+        self.assertTrue(ok, problems)
+
+    def test_undoing_the_leading_bid_brings_back_the_one_it_outbid(self):
+        manager = self.manager
+        manager.create_bid(1000, 2_000_000, 10_000, 101)
+        manager.create_bid(1000, 3_000_000, 10_000, 102)
+        ok, msg = manager.undo(self.event_id("bid_placed", 102))
+        self.assertTrue(ok, msg)
+        leader = manager.get_leading_bid(1000)
+        self.assertEqual((leader.bidding_team, leader.bid), (101, 2_000_000))
+        self.assertEqual(budget_of(manager, 102), 500_000_000)
+        self.assertEqual(budget_of(manager, 101), 498_000_000)
+        self.assertEqual(manager.get_team_summary(102)["bids_placed"], 0)
+        self.check_ledger()
+
+        ok, msg = manager.undo(self.event_id("bid_placed", 101))  # the restored bid, nothing left behind it
+        self.assertTrue(ok, msg)
+        self.assertEqual(manager.get_leading_bid(1000), None)
+        self.assertEqual(manager.get_listed_players()["player_id"].tolist(), [1000])
+        self.assertEqual(budget_of(manager, 101), 500_000_000)
+        self.assertFalse(manager.undo(self.event_id("outbid", 101))[0])  # only bids/removals/settlements
+        self.check_ledger()
+
+    def test_undo_removal_and_settlement(self):
+        manager = self.manager
+        manager.create_bid(1000, 2_000_000, 10_000, 101)
+        manager.remove_bid(1000, "Regular")
+        ok, msg = manager.undo(self.event_id("bid_removed", 101))
+        self.assertTrue(ok, msg)
+        self.assertEqual(manager.get_leading_bid(1000).bidding_team, 101)
+
+        manager.settle_all()
+        self.assertEqual(manager.get_roster(101)["squad"], 4)
+        ok, msg = manager.undo(self.event_id("settled", 101))
+        self.assertTrue(ok, msg)
+        self.assertEqual(budget_of(manager, 101), 500_000_000)
+        self.assertEqual(budget_of(manager, 100), 500_000_000)
+        self.assertEqual(manager.get_roster(101)["squad"], 3)
+        self.assertFalse(manager.undo(self.event_id("settled", 101))[0])  # not twice
+        self.check_ledger()
+
+
+class TestWatchers(unittest.TestCase):
+
+    def test_one_dm_per_watching_club_and_released_on_settle(self):
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        manager.list_player(1000, 100, 1_000_000, "Regular")
+        self.assertTrue(manager.watch(1000, 103)[0])
+        _, _, notify = manager.create_bid(1000, 2_000_000, 10_000, 101)
+        self.assertEqual(notify, [103])
+        for amount in range(3, 8):  # two clubs outbidding each other
+            club_id = 102 if amount % 2 else 101
+            _, _, notify = manager.create_bid(1000, amount * 1_000_000, 10_000, club_id)
+        self.assertEqual(sorted(notify), [101, 103])  # each club once, never the bidder
+        past_bidders = manager.players_df.loc[manager.players_df["player_id"] == 1000, "past_bidders"].item()
+        self.assertEqual(past_bidders, [101, 102])
+
+        with mock.patch("AuctionManager.WATCH_LIMIT", 1):
+            self.assertFalse(manager.watch(1000, 100)[0])  # full, bidders don't count against it
+        self.assertTrue(manager.watch(1000, 103, stop=True)[0])
+        self.assertFalse(manager.watch(1000, 101, stop=True)[0])  # bidders stay until the end
+
+        manager.settle_all()
+        self.assertNotIn(1000, manager.watchers)
+        self.assertEqual(past_bidders, [])
+        self.assertFalse(manager.list_player(1000, 100, 1_000_000, "Regular")[0])  # sold, see the next test
+
+    def test_refused_dev_bid_tells_nobody(self):
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        manager.list_player(1000, 100, 1_000_000, "Regular")
+        manager.create_bid(1000, 2_000_000, 10_000, 101)
+        manager.create_bid(1000, 3_000_000, 10_000, 103)
+        msg, watchers = services.create_dev_bid(manager, 1000, 4_000_000, 102, 10_000)
+        self.assertIsNone(watchers, msg)
+
+    def test_sold_player_cant_be_sold_again_until_the_files_show_it(self):
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        manager.archive_dir = tempfile.mkdtemp()
+        manager.list_player(1000, 100, 1_000_000, "Regular")
+        bid = manager.create_bid(1000, 2_000_000, 10_000, 101)[0]
+        manager.expire_due(now=bid.ending_time)
+        ok, msg = manager.list_player(1000, 100, 1_000_000, "Regular")
+        self.assertFalse(ok)
+        self.assertIn("was sold", msg)
+        self.assertFalse(manager.list_players_bulk([(1000, 100, 1_000_000, "Regular")])[0])
+        self.assertIsNone(manager.create_bid(1000, 3_000_000, 10_000, 102)[0])
+        self.assertEqual(manager.get_info(100)[0], 502_000_000)  # paid once
+
+        ok, _ = manager.reload_data(*make_league())  # sheet not updated yet, still the seller's
+        self.assertTrue(ok)
+        self.assertFalse(manager.list_player(1000, 100, 1_000_000, "Regular")[0])
+        new_players, new_teams = make_league()
+        new_players.loc[new_players["player_id"] == 1000, ["club_id", "club_name"]] = [101, "Club 1"]
+        self.assertTrue(manager.reload_data(new_players, new_teams)[0])
+        self.assertFalse(manager.list_player(1000, 100, 1_000_000, "Regular")[0])
+        self.assertTrue(manager.list_player(1000, 101, 1_000_000, "Regular")[0])
+
+
+class TestSealedBids(unittest.TestCase):
+
+    def setUp(self):
+        players_df, teams_df = make_league()
+        self.manager = AuctionManager(teams_df, players_df)
+        self.assertTrue(self.manager.set_auction_mode("Regular", "second")[0])
+        self.manager.list_player(1000, 100, 1_000_000, "Regular")
+        self.manager.list_player(1004, 100, 1_000_000, "Regular")
+
+    def resolve(self):
+        return self.manager.expire_due(now=datetime.now() + timedelta(days=1))
+
+    def test_removing_the_bids_drops_the_offers_and_what_they_hold(self):
+        manager = self.manager
+        manager.create_bid(1000, 3_000_000, 10_000, 101)
+        manager.create_bid(1004, 2_000_000, 10_000, 101)
+        manager.remove_bid(1000, "Regular")
+        self.assertEqual(manager.sealed[1000].offers, {})
+        self.assertEqual(manager.sealed_held, {101: [2_000_000, 10_000]})  # only the offer on 1004 is left
+        self.assertEqual(self.resolve()[0]["player_id"], 1004)  # the old deadline doesn't end the new auction
+        self.assertTrue(manager.players_df.set_index("player_id").at[1000, "is_listed"])
+
+    def test_second_price_resolved_at_the_deadline_without_churn(self):
+        manager = self.manager
+        transactions = len(manager.ledger.transactions)
+        manager.create_bid(1000, 3_000_000, 10_000, 101)
+        manager.create_bid(1000, 5_000_000, 10_000, 102)
+        _, msg, _ = manager.create_bid(1000, 4_000_000, 10_000, 101)  # replaces 101's first offer
+        self.assertTrue(msg.startswith("Sealed bid"), msg)
+        self.assertEqual(len(manager.ledger.transactions), transactions)  # no money moved yet
+        self.assertEqual(budget_of(manager, 102), 500_000_000)
+        self.assertEqual(manager.sealed_held, {101: [4_000_000, 10_000], 102: [5_000_000, 10_000]})
+        self.assertNotIn("bid", manager.events.since(0)[-1].data)  # the amount stays hidden
+        self.assertIsNone(manager.place_proxy_bid(1000, 9_000_000, 10_000, 103)[0])
+
+        records = self.resolve()
+        self.assertEqual([(r["bidding_team"], r["bid"]) for r in records], [(102, 4_000_000)])
+        self.assertEqual(budget_of(manager, 102), 496_000_000)
+        self.assertEqual(budget_of(manager, 101), 500_000_000)
+        self.assertEqual(budget_of(manager, 100), 504_000_000)
+        self.assertEqual(len(manager.ledger.transactions), transactions + 1)
+        self.assertEqual((list(manager.sealed), manager.sealed_held), ([1004], {}))
+        self.assertNotIn(1000, manager.get_listed_players()["player_id"].tolist())
+        ok, problems = manager.ledger.check_invariants(manager.teams_df)
+        self.assertTrue(ok, problems)
+
+    def test_offers_hold_money_and_the_next_best_wins_if_the_best_cant(self):
+        manager = self.manager
+        manager.set_auction_mode("Regular", "first")
+        manager.list_player(1008, 100, 1_000_000, "Regular")  # listed before: stays second price
+        self.assertEqual(manager.sealed[1008].rule, "first")
+        self.assertEqual(manager.sealed[1000].rule, "second")
+        manager.create_bid(1008, 400_000_000, 10_000, 102)
+        _, msg, _ = manager.create_bid(1004, 200_000_000, 10_000, 102)
+        self.assertIn("held by your other sealed bids", msg)
+        manager.create_bid(1008, 3_000_000, 10_000, 101)
+        # open bids don't look at sealed offers, 102 spends the money elsewhere before the deadline
+        manager.list_player(1001, 101, 1_000_000, "Free Loan")
+        manager.create_free_loan_bid(1001, 450_000_000, 10_000, 102)
+
+        records = self.resolve()
+        self.assertEqual([(r["bidding_team"], r["bid"]) for r in records if r["player_id"] == 1008], [(101, 3_000_000)])
+        self.assertEqual(budget_of(manager, 102), 50_000_000)
+
+
+class TestExporters(unittest.TestCase):
+
+    def test_tables_stream_into_csv(self):
+        from Exporters import export, listing_rows, snapshot
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        for pid in (1000, 1004, 1008):
+            manager.list_player(pid, 100, 1_000_000, "Regular")
+        manager.create_bid(1004, 2_000_000, 10_000, 101)
+        folder = tempfile.mkdtemp()
+
+        self.assertEqual(len(list(listing_rows(snapshot(manager), chunk=1))), 2)  # 1004 isn't listed while bid on
+        ok, msg = export(manager, "listings", "csv", os.path.join(folder, "listings.csv"))
+        self.assertTrue(ok, msg)
+        listings = pd.read_csv(os.path.join(folder, "listings.csv"))
+        self.assertEqual(listings["player_id"].tolist(), [1000, 1008])
+        self.assertEqual(listings["starting_bid"].tolist(), [1_000_000, 1_000_000])
+
+        export(manager, "active_bids", "csv", os.path.join(folder, "bids.csv"))
+        bids = pd.read_csv(os.path.join(folder, "bids.csv"))
+        self.assertEqual(bids[["player", "bidding_club", "bid"]].values.tolist(), [["Player 4", "Club 1", 2_000_000]])
+
+        export(manager, "finances", "csv", os.path.join(folder, "finances.csv"))
+        finances = pd.read_csv(os.path.join(folder, "finances.csv")).set_index("club_id")
+        self.assertEqual(finances.loc[101, "reserved_budget"], -2_000_000)
+        self.assertEqual(finances.loc[101, "budget"], budget_of(manager, 101))
+
+        self.assertFalse(export(manager, "players", "csv", os.path.join(folder, "x.csv"))[0])
+
+    def league(self):
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        for pid in (1000, 1004, 1008):
+            manager.list_player(pid, 100, 1_000_000, "Regular")
+        manager.create_bid(1004, 2_000_000, 10_000, 101)
+        return manager
+
+    @unittest.skipUnless(importlib.util.find_spec("openpyxl"), "xlsx exports need openpyxl")
+    def test_xlsx(self):
+        from Exporters import export
+        path = os.path.join(tempfile.mkdtemp(), "bids.xlsx")
+        self.assertTrue(export(self.league(), "active_bids", "xlsx", path)[0])
+        bids = pd.read_excel(path)
+        self.assertEqual(bids[["player", "bidding_club", "bid"]].values.tolist(), [["Player 4", "Club 1", 2_000_000]])
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "parquet exports need pyarrow")
+    def test_parquet_in_row_groups(self):
+        from Exporters import write_parquet
+        path = os.path.join(tempfile.mkdtemp(), "listings.parquet")
+        count = write_parquet(path, ("player_id", "starting_bid"), ((i, i * 1_000) for i in range(25)), chunk=10)
+        self.assertEqual(count, 25)
+        listings = pd.read_parquet(path)
+        self.assertEqual(listings["starting_bid"].tolist(), [i * 1_000 for i in range(25)])
+        import pyarrow.parquet as pq
+        self.assertEqual(pq.ParquetFile(path).num_row_groups, 3)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "parquet exports need pyarrow")
+    def test_parquet_types_dont_depend_on_the_first_chunk(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from Exporters import write_parquet
+        path = os.path.join(tempfile.mkdtemp(), "listings.parquet")
+        rows = [(i, None) for i in range(5)] + [(i, 1_000) for i in range(5, 10)] + [(10, 1_500.5)]
+        self.assertEqual(write_parquet(path, ("player_id", "starting_bid"), iter(rows), chunk=5), 11)
+        self.assertEqual(pq.read_schema(path).field("starting_bid").type, pa.float64())
+        listings = pd.read_parquet(path)
+        self.assertTrue(listings["starting_bid"][:5].isna().all())
+        self.assertEqual(listings["starting_bid"][5:].tolist(), [1_000] * 5 + [1_500.5])
+
+    def test_listings_are_written_again_if_the_league_moved(self):
+        import Exporters
+        manager = self.league()
+        write_csv, calls = Exporters.write_csv, []
+
+        def meanwhile(path, columns, rows):  # the loop lists a player while the thread writes
+            calls.append(path)
+            if len(calls) == 1:
+                manager.list_player(1001, 101, 1_000_000, "Regular")
+            return write_csv(path, columns, rows)
+
+        with mock.patch.dict(Exporters.WRITERS, csv=meanwhile):
+            ok, msg, path = asyncio.run(services.export_table(manager, "listings", "csv"))
+        self.assertTrue(ok, msg)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(pd.read_csv(path)["player_id"].tolist(), [1000, 1001, 1008])
+        os.remove(path)
+
+        def always(path, columns, rows):
+            manager._touch()
+            return write_csv(path, columns, rows)
+
+        with mock.patch.dict(Exporters.WRITERS, csv=always):
+            ok, msg, path = asyncio.run(services.export_table(manager, "listings", "csv"))
+            self.assertFalse(ok)
+            self.assertIsNone(path)
+            self.assertTrue(asyncio.run(services.export_table(manager, "finances", "csv"))[0])  # a snapshot, no retry
+
+
+class TestFakeDiscord(unittest.TestCase):
+
+    def test_bid_command_end_to_end(self):
+        import auction_bot.commands  # noqa: F401
+        from auction_bot.bot import background_tasks
+        from auction_bot.fakes import FakeAPI, FakeClient
+        from auction_bot.middleware import COMMANDS
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        registry = LeagueRegistry(lambda: None, data_root=tempfile.mkdtemp())
+        registry.loaded[1] = manager
+        client = FakeClient(registry, FakeAPI(latency=0.001, rate=None))
+        commands = {c.name: c for c in COMMANDS}
+
+        async def run():
+            await client.invoke(commands["list_player"], 9000, 1, player_id=1000, starting_bid=1_000_000,
+                                type="Regular")
+            await client.invoke(commands["bid"], 9001, 1, player_id=1000, bid_amount=2_000_000, wage=10_000)
+            third = await client.invoke(commands["bid"], 9002, 1, player_id=1000, bid_amount=3_000_000, wage=10_000)
+            await asyncio.gather(*list(background_tasks))
+            return third
+
+        third = asyncio.run(run())
+        self.assertTrue(third.sent[0].startswith("Created bid for Player 0 by Club 2."), third.sent)
+        self.assertFalse(third.expired)
+        self.assertEqual(client.users[9001].dms, [third.sent[0].split("\n")[0]])  # the outbid manager heard
+        self.assertEqual(client.api.requests["dm"], 1)  # not the new leader himself
+
+    def test_proxy_bid_command_tells_the_watchers(self):
+        import auction_bot.commands  # noqa: F401
+        from auction_bot.bot import background_tasks
+        from auction_bot.fakes import FakeAPI, FakeClient
+        from auction_bot.middleware import COMMANDS
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        registry = LeagueRegistry(lambda: None, data_root=tempfile.mkdtemp())
+        registry.loaded[1] = manager
+        client = FakeClient(registry, FakeAPI(latency=0.001, rate=None))
+        commands = {c.name: c for c in COMMANDS}
+
+        async def run():
+            await client.invoke(commands["list_player"], 9000, 1, player_id=1000, starting_bid=1_000_000,
+                                type="Regular")
+            await client.invoke(commands["watch"], 9003, 1, player_id=1000)
+            await client.invoke(commands["proxy_bid"], 9001, 1, player_id=1000, max_amount=5_000_000, wage=10_000)
+            await asyncio.gather(*list(background_tasks))
+
+        asyncio.run(run())
+        self.assertEqual(client.users[9003].dms, ["Created bid for Player 0 by Club 1."])  # not the max
+
+    def test_bulk_bid_command_tells_the_watchers(self):
+        import auction_bot.commands  # noqa: F401
+        from auction_bot.bot import background_tasks
+        from auction_bot.fakes import FakeAPI, FakeClient
+        from auction_bot.middleware import COMMANDS
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        manager.list_players_bulk([(1000, 100, 1_000_000, "Regular"), (1004, 100, 1_000_000, "Regular")])
+        registry = LeagueRegistry(lambda: None, data_root=tempfile.mkdtemp())
+        registry.loaded[1] = manager
+        client = FakeClient(registry, FakeAPI(latency=0.001, rate=None))
+        commands = {c.name: c for c in COMMANDS}
+
+        async def run():
+            await client.invoke(commands["watch"], 9003, 1, player_id=1004)
+            await client.invoke(commands["bulk_bid"], 9001, 1, bids="1000:1500000:10000, 1004:2000000:10000")
+            await asyncio.gather(*list(background_tasks))
+
+        asyncio.run(run())
+        self.assertEqual(client.users[9003].dms, ["Created bid for Player 4 by Club 1."])
+
+    def test_listed_players_cache_doesnt_outlive_a_reset(self):
+        import auction_bot.commands  # noqa: F401
+        from auction_bot.fakes import FakeAPI, FakeClient
+        from auction_bot.middleware import COMMANDS
+        leagues = []
+        for player_id in (1000, 1004):
+            players_df, teams_df = make_league()
+            leagues.append(AuctionManager(teams_df, players_df))
+            leagues[-1].list_player(player_id, 100, 1_000_000, "Regular")
+        self.assertEqual(leagues[0].version, leagues[1].version)
+        registry = LeagueRegistry(lambda: None, data_root=tempfile.mkdtemp())
+        registry.loaded[1] = leagues[0]
+        client = FakeClient(registry, FakeAPI(latency=0.001, rate=None))
+        commands = {c.name: c for c in COMMANDS}
+
+        async def run():
+            await client.invoke(commands["listed_players"], 9000, 1)
+            registry.loaded[1] = leagues[1]  # what /setup_auction reset=True does
+            return await client.invoke(commands["listed_players"], 9000, 1)
+
+        listing = str(asyncio.run(run()).sent[0].to_dict())
+        self.assertIn("Player 4", listing)
+        self.assertNotIn("Player 0", listing)
+
+    def test_slow_private_command_stays_private(self):
+        from auction_bot import middleware
+        from auction_bot.fakes import FakeAPI, FakeClient
+
+        @middleware.auction_command(name="slow_private", description="Answers the caller only, slowly.", ephemeral=True)
+        async def slow_private(interaction):
+            await asyncio.sleep(0.05)  # over the budget below, the watchdog defers first
+            await middleware.reply(interaction, "only for you", ephemeral=True)
+
+        middleware.COMMANDS.remove(slow_private)
+        client = FakeClient(LeagueRegistry(lambda: None, data_root=tempfile.mkdtemp()), FakeAPI(latency=0.001, rate=None))
+        with mock.patch.object(middleware, "LATENCY_BUDGET", 0.01):
+            interaction = asyncio.run(client.invoke(slow_private, 9100, 1))
+        self.assertIsNotNone(interaction.extras["timing"]["deferred_after"])
+        self.assertEqual((interaction.sent, interaction.private), (["only for you"], [True]))
+
+    def test_admin_commands_check_the_role(self):
+        import auction_bot.commands  # noqa: F401
+        from auction_bot.middleware import COMMANDS
+        commands = {c.name: c for c in COMMANDS}
+        for name in ("setup_auction", "reload_data", "auction_mode", "remove_bid", "history", "undo", "cleanup",
+                     "command_stats"):
+            self.assertTrue(commands[name].checks, name)
+        self.assertFalse(commands["bid"].checks)
+
+    def test_commands_dont_set_up_a_league(self):
+        import auction_bot.commands  # noqa: F401
+        from auction_bot.fakes import FakeClient
+        from auction_bot.middleware import COMMANDS
+        loader = mock.Mock(side_effect=make_league)
+        registry = LeagueRegistry(loader, data_root=tempfile.mkdtemp())
+        client = FakeClient(registry)
+        listed = next(c for c in COMMANDS if c.name == "listed_players")
+        interaction = asyncio.run(client.invoke(listed, 9000, 1))
+        self.assertIn("not set up", interaction.sent[0])
+        loader.assert_not_called()
+        self.assertEqual(registry.loaded, {})
+
+    def test_benchmark_reports_latency_percentiles(self):
+        from benchmark_commands import run_benchmark
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = asyncio.run(run_benchmark(users=4, commands=5, latency=0.001, jitter=0.0))
+        self.assertEqual(sum(r["calls"] for r in results["commands"].values()), 20)
+        for r in results["commands"].values():
+            self.assertLessEqual(r["answer_p50"], r["answer_p99"])
+            self.assertEqual(r["expired"], 0)
+        self.assertIn("p99", results["loop_lag"])
+
+    def test_auction_benchmark_flags_regressions(self):
+        from benchmark_auction import NOISE_US, compare, run_benchmark
+        results = run_benchmark(sizes=[(200, 10, 20)], calls=5, rounds=1)
+        self.assertEqual(len(results["results"]), 7)
+        self.assertEqual(compare(results, results), [])
+
+        def medians(**us):  # fixed numbers, real timings are too noisy to assert on
+            return {"results": {name: {"median_us": v} for name, v in us.items()}}
+        now = medians(a=100.0, b=1.5 * NOISE_US, c=24.0, d=5.0)
+        baseline = medians(a=50.0, b=0.5 * NOISE_US, c=20.0, e=1.0)  # d is new, e is gone
+        self.assertEqual([r[0] for r in compare(now, baseline)], ["a"])  # b is under the noise floor, c within 25%
+        self.assertEqual([r[0] for r in compare(now, baseline, threshold=0.1)], ["a", "c"])
+        self.assertEqual(compare(now, baseline, threshold=2.0), [])
+
+
+class TestPackage(unittest.TestCase):
+
+    def test_bot_imports_without_the_data_stack(self):
+        code = ("import sys, auction_bot.commands, auction_bot.bot\n"
+                "from auction_bot.middleware import COMMANDS\n"
+                "print(len(COMMANDS), [m for m in ('pandas', 'numpy', 'Data_loader') if m in sys.modules])")
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(out.returncode, 0, out.stderr)
+        count, heavy = out.stdout.strip().splitlines()[-1].split(" ", 1)
+        self.assertGreater(int(count), 0)
+        self.assertEqual(heavy, "[]")
+
+    def test_command_logic_runs_without_discord(self):
+        players_df, teams_df = make_league()
+        manager = AuctionManager(teams_df, players_df)
+        self.assertEqual(services.parse_bulk_items("1000:1_000_000, x", 2), ([(1000, 1_000_000)], ["x"]))
+        services.list_player(manager, 1000, 100, 1_000_000, "Regular")
+        msg, _ = services.create_bid(manager, 1000, 2_000_000, 101, 10_000)
+        self.assertEqual(msg, "Created bid for Player 0 by Club 1.")
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,311 @@
+"""
+Generative tests for AuctionManager: seeded random sequences of list, unlist, bid, loan bid,
+remove and cleanup calls over synthetic leagues (up to 10k players), checking the auction's
+invariants after every step:
+
+- money is conserved: every ledger field nets to zero and teams_df mirrors the ledger,
+- a player has at most one running bid, and a running auction keeps its price,
+- the listed flags, per club counters and indexes agree with the bids actually running.
+
+The per step checks only look at what the step touched, the full recomputations (ledger
+postings, every counter and index) run every FULL_CHECK_EVERY steps and at the end, so a
+run costs about what the operations themselves cost. The differential test replays one
+sequence on two leagues, one through the single item calls and expire_due's deadline heap,
+the other through the vectorized bulk calls and cleanup_expired's full pass, and compares
+them step by step.
+
+run: python simulate_fuzz.py
+     FUZZ_OPS=1000000 FUZZ_PLAYERS=10000 FUZZ_WORKERS=16 python simulate_fuzz.py  (one seed per process)
+"""
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+import unittest
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from AuctionManager import AuctionManager
+from Ledger import FIELDS
+from simulate_features import make_league
+
+FUZZ_OPS = int(os.environ.get("FUZZ_OPS", 3_000))
+FUZZ_PLAYERS = int(os.environ.get("FUZZ_PLAYERS", 2_000))
+FUZZ_SEED = int(os.environ.get("FUZZ_SEED", 0))
+FUZZ_WORKERS = int(os.environ.get("FUZZ_WORKERS", 1))  # processes, each runs its own seed
+FULL_CHECK_EVERY = 1_000
+PLAYERS_PER_CLUB = 20
+ROTW_EVERY = 50  # every 50th player plays outside the league (rotw), biddable without a listing
+OPS = {"list": 20, "unlist": 4, "bid": 40, "loan_bid": 12, "remove": 4, "cleanup": 4}  # op -> weight
+
+
+def make_fuzz_league(n_players, seed=0):
+    """A synthetic league with some rotw players and unequal budgets ~(players_df, teams_df)"""
+    n_clubs = max(4, n_players // PLAYERS_PER_CLUB)
+    players_df, teams_df = make_league(n_players=n_players, n_clubs=n_clubs)
+    rng = random.Random(seed)
+    teams_df["budget"] = [rng.choice((50_000_000, 200_000_000, 500_000_000)) for _ in range(n_clubs)]
+    rotw = players_df.index % ROTW_EVERY == ROTW_EVERY - 1
+    players_df.loc[rotw, "club_id"] = 0  # no account, their fees go to the ledger's external account
+    players_df.loc[rotw, "club_name"] = "rotw"
+    return players_df, teams_df
+
+
+class Fuzzer:
+    """Draws random operations against one league, biased towards players already in an auction."""
+
+    def __init__(self, players_df, teams_df, seed):
+        self.rng = random.Random(seed)
+        self.player_ids = players_df["player_id"].tolist()
+        self.owner = dict(zip(players_df["player_id"], players_df["club_id"]))
+        self.club_ids = teams_df["club_id"].tolist()
+        self.hot = []  # players listed at some point, most bids go there so auctions collide
+
+    def player(self):
+        if self.hot and self.rng.random() < 0.8:
+            return self.rng.choice(self.hot)
+        return self.rng.choice(self.player_ids)
+
+    def club(self, player_id=None):
+        if player_id is not None and self.rng.random() < 0.7:
+            return self.owner[player_id]  # mostly the owner, sometimes a club that can't list him
+        return self.rng.choice(self.club_ids + [-1])  # -1: not a club
+
+    def amount(self):
+        return self.rng.choice((0, 1, 5, 10, 20, 60, 150)) * 1_000_000 + self.rng.randint(0, 9) * 100_000
+
+    def next_op(self):
+        """One random operation ~(name, kwargs)"""
+        name = self.rng.choices(list(OPS), list(OPS.values()))[0]
+        if name in ("list", "unlist"):
+            player_id = self.player()
+            club_id = self.club(player_id)
+            if name == "unlist":
+                return name, {"player_id": player_id, "team_id": club_id}
+            typeo = self.rng.choices(("Regular", "Free Loan", "Dev Loan", "Paid Loan", "Loan"), (8, 3, 2, 1, 1))[0]
+            return name, {"player_id": player_id, "team_id": club_id, "bid": self.amount(), "typeo": typeo}
+        if name in ("bid", "loan_bid"):
+            player_id = self.player()
+            kwargs = {"player_id": player_id, "bid_amount": self.amount(), "wage": self.rng.randint(0, 300) * 1_000,
+                      "bidding_team": self.club()}
+            if name == "loan_bid":
+                kwargs["kind"] = self.rng.choice(("free", "dev"))
+            return name, kwargs
+        if name == "remove":
+            return name, {"player_id": self.player(), "type": "Regular"}
+        # cleanup: how far past now the deadlines are checked, the bids' timers are 60s
+        return name, {"ahead": self.rng.choice((0, 30, 61, 3600))}
+
+
+def apply(manager, name, kwargs, now):
+    """Runs one fuzz operation through the single item calls ~(bool ok, player_id or None)"""
+    if name == "list":
+        ok, _ = manager.list_player(**kwargs)
+        return ok, kwargs["player_id"]
+    if name == "unlist":
+        ok, _ = manager.unlist_player(**kwargs)
+        return ok, kwargs["player_id"]
+    if name == "bid":
+        bid = manager.create_bid(**kwargs)[0]
+        return bool(bid), kwargs["player_id"]
+    if name == "loan_bid":
+        kwargs = dict(kwargs)
+        place = manager.create_free_loan_bid if kwargs.pop("kind") == "free" else manager.dev_loan_bid
+        return bool(place(**kwargs)[0]), kwargs["player_id"]
+    if name == "remove":
+        running = manager.get_leading_bid(kwargs["player_id"]) is not None
+        manager.remove_bid(**kwargs)
+        return running, kwargs["player_id"]
+    records = manager.expire_due(now=now + timedelta(seconds=kwargs["ahead"]))
+    return bool(records), None
+
+
+def running_bids(manager, player_id):
+    return [b for b in manager.bids if b.player_id == player_id and b.active]
+
+
+class Invariants:
+    """Checks of one league, cheap ones for what a step touched and full ones every so often."""
+
+    def __init__(self, test, manager):
+        self.test = test
+        self.manager = manager
+        # positions in the columns' numpy arrays, a mask or .at per step costs more than the step itself
+        self.rows = {player_id: i for i, player_id in enumerate(manager.players_df["player_id"])}
+        self.club_rows = {club_id: i for i, club_id in enumerate(manager.teams_df["club_id"])}
+
+    def step(self, player_id, clubs=None, context=""):
+        """
+        :param clubs: the clubs whose money the step can have moved, None = all of them ~iterable
+        """
+        m, t = self.manager, self.test
+        for field, slot in zip(FIELDS, (0, 2)):
+            total = sum(b[slot] + b[slot + 1] for b in m.ledger.balances.values())
+            t.assertEqual(total, 0, f"{field} was created or lost {context}")
+        budgets = m.teams_df["budget"].to_numpy()
+        for club_id in self.club_rows if clubs is None else clubs:
+            if club_id in self.club_rows:
+                t.assertEqual(budgets[self.club_rows[club_id]], m.ledger.available(club_id)[0],
+                              f"teams_df budget of {club_id} doesn't mirror the ledger {context}")
+        if player_id is not None:
+            self.player(player_id, context)
+
+    def player(self, player_id, context=""):
+        m, t = self.manager, self.test
+        i = self.rows[player_id]
+        row = {c: m.players_df[c].to_numpy()[i] for c in ("is_listed", "starting_bid", "past_bidders")}
+        running = running_bids(m, player_id)
+        t.assertLessEqual(len(running), 1, f"player {player_id} has {len(running)} running bids {context}")
+        past_bidders = row["past_bidders"]
+        t.assertEqual(len(past_bidders), len(set(past_bidders)), f"player {player_id} past_bidders repeat {context}")
+        if running:
+            leader = running[0]
+            t.assertIs(m.get_leading_bid(player_id), leader)
+            t.assertFalse(row["is_listed"] == True, f"player {player_id} is listed during his auction {context}")
+            t.assertFalse(row["starting_bid"] is None or row["starting_bid"] != row["starting_bid"],
+                          f"player {player_id} lost his price during his auction {context}")
+            t.assertIn(leader.bidding_team, past_bidders)
+            t.assertEqual(m.ledger.transactions[leader.tx_id]["state"], "open")
+        else:
+            t.assertEqual(past_bidders, [], f"player {player_id} looks bid on without a running bid {context}")
+        if row["is_listed"] == True:
+            t.assertFalse(row["starting_bid"] is None or row["starting_bid"] != row["starting_bid"],
+                          f"listed player {player_id} has no starting bid {context}")
+
+    def full(self):
+        m, t = self.manager, self.test
+        ok, problems = m.ledger.check_invariants(m.teams_df)  # slow path: every balance from the postings
+        t.assertTrue(ok, problems)
+        open_txs = {tx_id for tx_id, tx in m.ledger.transactions.items() if tx["state"] == "open"}
+        t.assertEqual(open_txs, {b.tx_id for b in m.bids if b.active}, "reserved money without a running bid")
+        t.assertTrue(all(b.active for b in m.bids), "finished bids left in the bid list")
+        t.assertLessEqual(max(Counter(b.player_id for b in m.bids).values(), default=0), 1)
+
+        listed = m.players_df.loc[m.players_df["is_listed"] == True, "club_id"].value_counts()
+        placed = Counter(b.bidding_team for b in m.bids)
+        received = Counter(b.outgoing_team for b in m.bids)
+        for club_id, summary in m.team_summary.items():
+            t.assertEqual(summary["players_listed"], listed.get(club_id, 0), f"club {club_id} listed count")
+            t.assertEqual(summary["bids_placed"], placed.get(club_id, 0), f"club {club_id} bids placed")
+            t.assertEqual(summary["bids_received"], received.get(club_id, 0), f"club {club_id} bids received")
+            t.assertEqual((summary["budget"], summary["wage"]), m.ledger.available(club_id))
+            t.assertEqual(set(m._roster(club_id)["open"].values()), {b for b in m.bids if b.bidding_team == club_id},
+                          f"club {club_id} roster index")
+        in_heap = {id(entry[2]) for entry in m.deadlines}
+        t.assertTrue(all(id(b) in in_heap for b in m.bids), "a running bid has no deadline")
+        bid_on = {pid for pid, pb in zip(m.players_df["player_id"], m.players_df["past_bidders"]) if pb}
+        t.assertEqual(bid_on, {b.player_id for b in m.bids}, "past_bidders and running bids disagree")
+        for player_id in m.watchers:
+            t.assertIn(player_id, bid_on | set(m.players_df.loc[m.players_df["is_listed"] == True, "player_id"]))
+        for b in m.bids:
+            self.player(b.player_id)
+
+
+def league_state(manager):
+    """What the differential test compares: money, listings and the running bids"""
+    players = manager.players_df
+    listed = players.loc[players["is_listed"] == True, ["player_id", "starting_bid", "Type"]]
+    return (sorted((str(k), tuple(v)) for k, v in manager.ledger.balances.items()),
+            sorted(map(tuple, listed.itertuples(index=False))),
+            sorted((b.player_id, b.bidding_team, b.bid, b.wage, b.typeo) for b in manager.bids))
+
+
+def apply_bulk(manager, name, kwargs, now):
+    """The same operation through the vectorized bulk calls and the full cleanup pass"""
+    if name == "list":
+        ok, _ = manager.list_players_bulk([(kwargs["player_id"], kwargs["team_id"], kwargs["bid"], kwargs["typeo"])])
+        return ok, kwargs["player_id"]
+    if name == "bid":
+        ok, _ = manager.create_bids_bulk(kwargs["bidding_team"],
+                                         [(kwargs["player_id"], kwargs["bid_amount"], kwargs["wage"])])
+        return ok, kwargs["player_id"]
+    if name == "cleanup":
+        deadline = now + timedelta(seconds=kwargs["ahead"])
+        due = [b for b in manager.bids if b.ending_time <= deadline]
+        for b in due:
+            b.active = False  # what the clock would do, cleanup_expired then finds them by scanning
+        manager.cleanup_expired()
+        return bool(due), None
+    return apply(manager, name, kwargs, now)
+
+
+def run_ops(test, n_players, n_ops, seed):
+    """One seeded run with the invariants checked after every step ~Counter of (op, accepted)"""
+    players_df, teams_df = make_fuzz_league(n_players, seed)
+    manager = AuctionManager(teams_df, players_df)
+    manager.archive_dir = tempfile.mkdtemp()
+    fuzzer = Fuzzer(players_df, teams_df, seed)
+    invariants = Invariants(test, manager)
+    counts = Counter()
+    for i in range(n_ops):
+        name, kwargs = fuzzer.next_op()
+        ok, player_id = apply(manager, name, kwargs, datetime.now())
+        counts[name, ok] += 1
+        if ok and name == "list":
+            fuzzer.hot.append(player_id)
+        # remove refunds whoever led and cleanup settles anyone, the rest only touch these clubs
+        clubs = None if name in ("remove", "cleanup") else \
+            (kwargs.get("team_id"), kwargs.get("bidding_team"), fuzzer.owner.get(player_id))
+        invariants.step(player_id, clubs, f"after step {i}: {name} {kwargs}")
+        if (i + 1) % FULL_CHECK_EVERY == 0:
+            invariants.full()
+    invariants.full()
+    return counts
+
+
+def run_shard(n_players, n_ops, seed):
+    # worker process: a failed invariant comes back as the AssertionError
+    with contextlib.redirect_stdout(io.StringIO()):  # the manager prints a line per bid
+        return run_ops(unittest.TestCase(), n_players, n_ops, seed)
+
+
+class TestFuzz(unittest.TestCase):
+
+    def test_random_operations_keep_the_invariants(self):
+        start = time.perf_counter()
+        if FUZZ_WORKERS > 1:  # one seed per worker, FUZZ_SEED, FUZZ_SEED + 1, ...
+            seeds = range(FUZZ_SEED, FUZZ_SEED + FUZZ_WORKERS)
+            with ProcessPoolExecutor(max_workers=FUZZ_WORKERS) as pool:
+                parts = pool.map(run_shard, [FUZZ_PLAYERS] * FUZZ_WORKERS, [-(-FUZZ_OPS // FUZZ_WORKERS)] * FUZZ_WORKERS,
+                                 seeds)
+                counts = sum(parts, Counter())
+        else:
+            counts = run_shard(FUZZ_PLAYERS, FUZZ_OPS, FUZZ_SEED)
+        seconds = time.perf_counter() - start
+        for name in ("list", "bid", "loan_bid", "cleanup"):
+            self.assertGreater(counts[name, True], 0, f"no {name} ever went through, the fuzzer is off")
+        ops = sum(counts.values())
+        print(f"\n{ops:,} ops on {FUZZ_PLAYERS:,} players (seed {FUZZ_SEED}, {FUZZ_WORKERS} workers) in {seconds:.1f}s "
+              f"({ops / seconds:,.0f} ops/s), accepted: "
+              + ", ".join(f"{name} {counts[name, True]}/{counts[name, True] + counts[name, False]}" for name in OPS))
+
+    def test_big_league(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_ops(self, 10_000, 500, FUZZ_SEED + 1)
+
+    def test_single_and_bulk_calls_agree(self):
+        players_df, teams_df = make_fuzz_league(400, FUZZ_SEED)
+        single = AuctionManager(teams_df.copy(), players_df.copy(deep=True))
+        players_df["past_bidders"] = [[] for _ in range(len(players_df))]  # the copy shares the lists
+        bulk = AuctionManager(teams_df.copy(), players_df.copy(deep=True))
+        single.archive_dir = bulk.archive_dir = tempfile.mkdtemp()
+        fuzzer = Fuzzer(players_df, teams_df, FUZZ_SEED)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(min(FUZZ_OPS, 1_500)):
+                name, kwargs = fuzzer.next_op()
+                now = datetime.now()
+                ok, player_id = apply(single, name, dict(kwargs), now)
+                bulk_ok, _ = apply_bulk(bulk, name, dict(kwargs), now)
+                self.assertEqual(ok, bulk_ok, f"step {i}: {name} {kwargs}")
+                self.assertEqual(league_state(single), league_state(bulk), f"step {i}: {name} {kwargs}")
+                if ok and name == "list":
+                    fuzzer.hot.append(player_id)
+        for manager in (single, bulk):
+            Invariants(self, manager).full()
+
+
+if __name__ == '__main__':
+    unittest.main()